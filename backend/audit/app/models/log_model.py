@@ -1,7 +1,7 @@
 from datetime import datetime
 # Import SQLAlchemy ORM components
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, DateTime, func
+from sqlalchemy import Integer, String, DateTime, Index, func
 # Import the shared Base class
 from ..utils.db_connection import Base
 
@@ -32,4 +32,16 @@ class Log(Base):
     doctor_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     patient_hashed_cf: Mapped[str | None] = mapped_column(String(255), nullable=True)
     report_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    data_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
\ No newline at end of file
+    data_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
+# Secondary indexes (created by db/db_init.sql and db/migrations/002_lookup_indexes.sql)
+# matching the (created_at DESC, id DESC) ordering of the paginated queries
+Index("idx_logs_created", Log.created_at.desc(), Log.id.desc())
+Index("idx_logs_doctor_created", Log.doctor_id, Log.created_at.desc(), Log.id.desc(),
+      postgresql_where=Log.doctor_id.isnot(None))
+Index("idx_logs_patient_created", Log.patient_hashed_cf, Log.created_at.desc(), Log.id.desc(),
+      postgresql_where=Log.patient_hashed_cf.isnot(None))
+Index("idx_logs_report", Log.report_id, postgresql_where=Log.report_id.isnot(None))
+Index("idx_logs_data", Log.data_id, postgresql_where=Log.data_id.isnot(None))
+Index("idx_logs_service_event_created", Log.service, Log.event, Log.created_at.desc(), Log.id.desc())
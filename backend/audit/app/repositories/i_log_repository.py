@@ -1,6 +1,7 @@
 # Import Abstract Base Class module
 from abc import ABC, abstractmethod
-from typing import Sequence
+from datetime import datetime
+from typing import AsyncIterator, Sequence, Tuple
 # Import the Log model
 from ..models.log_model import Log
 
@@ -16,6 +17,13 @@ class ILogRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def save_many(self, logs: Sequence[Log]) -> Sequence[Log]:
+        """
+        Abstract method to save several log entries in a single transaction.
+        """
+        pass
+
     @abstractmethod
     async def find_all(self) -> Sequence[Log]:
         """
@@ -31,9 +39,32 @@ class ILogRepository(ABC):
         doctor_id: int | None = None,
         patient_hashed_cf: str | None = None,
         report_id: int | None = None,
-        data_id: int | None = None
+        data_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        after: Tuple[datetime, int] | None = None,
+        limit: int = 100
     ) -> Sequence[Log]:
         """
-        Abstract method to retrieve logs matching specific criteria.
+        Abstract method to retrieve a page of logs matching specific criteria,
+        most recent first, starting after the (created_at, id) key 'after'.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def stream_with_filters(
+        self,
+        service: str | None = None,
+        event: str | None = None,
+        doctor_id: int | None = None,
+        patient_hashed_cf: str | None = None,
+        report_id: int | None = None,
+        data_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Log]]:
+        """
+        Abstract method to iterate over all the logs matching specific criteria, in chunks.
+        """
+        pass
@@ -1,11 +1,15 @@
-from typing import Sequence
+from datetime import datetime
+from typing import AsyncIterator, Sequence, Tuple
 # Import SQLAlchemy AsyncSession and query constructs
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Select, select, insert, and_, tuple_
 # Import the interface and model
 from .i_log_repository import ILogRepository
 from ..models.log_model import Log
 
+# Columns provided by the caller (id and created_at are generated by the database)
+LOG_INSERT_COLUMNS = ("service", "event", "description", "doctor_id", "patient_hashed_cf", "report_id", "data_id")
+
 
 class LogRepository(ILogRepository):
     """
@@ -25,6 +29,31 @@ class LogRepository(ILogRepository):
         await self.session.refresh(log)
         return log
 
+    async def save_many(self, logs: Sequence[Log]) -> Sequence[Log]:
+        """
+        Persists several Log objects with multi-row INSERT ... RETURNING statements
+        in one transaction, then assigns the generated id and created_at to each object.
+        Unlike save(), no per-row flush or refresh SELECT is issued.
+        """
+        if not logs:
+            return logs
+
+        rows = [
+            {column: getattr(log, column) for column in LOG_INSERT_COLUMNS}
+            for log in logs
+        ]
+        # Bulk INSERT: SQLAlchemy renders multi-row VALUES statements ("insertmanyvalues"),
+        # and 'sort_by_parameter_order' guarantees that returned rows match the input order
+        query = insert(Log).returning(Log.id, Log.created_at, sort_by_parameter_order=True)
+        result = await self.session.execute(query, rows)
+        generated = result.all()
+        await self.session.commit()
+
+        for log, (log_id, created_at) in zip(logs, generated):
+            log.id = log_id
+            log.created_at = created_at
+        return logs
+
     async def find_all(self) -> Sequence[Log]:
         """
         Retrieves all records from the logs table.
@@ -33,17 +62,20 @@ class LogRepository(ILogRepository):
         # Return all scalars (Log objects)
         return result.scalars().all()
 
-    async def find_with_filters(
-            self,
+    @staticmethod
+    def _filtered_query(
             service: str | None = None,
             event: str | None = None,
             doctor_id: int | None = None,
             patient_hashed_cf: str | None = None,
             report_id: int | None = None,
-            data_id: int | None = None
-    ) -> Sequence[Log]:
+            data_id: int | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None
+    ) -> Select:
         """
-        Dynamically builds a query to find logs based on provided non-null filters.
+        Dynamically builds a query on the provided non-null filters, ordered from the most
+        recent log: (created_at, id) is unique and gives a stable keyset for pagination.
         """
         conditions = []
 
@@ -60,6 +92,11 @@ class LogRepository(ILogRepository):
             conditions.append(Log.report_id == report_id)
         if data_id is not None:
             conditions.append(Log.data_id == data_id)
+        # Time range: from inclusive, to exclusive
+        if date_from is not None:
+            conditions.append(Log.created_at >= date_from)
+        if date_to is not None:
+            conditions.append(Log.created_at < date_to)
 
         # Start building the query
         query = select(Log)
@@ -68,6 +105,55 @@ class LogRepository(ILogRepository):
         if conditions:
             query = query.where(and_(*conditions))
 
+        return query.order_by(Log.created_at.desc(), Log.id.desc())
+
+    async def find_with_filters(
+            self,
+            service: str | None = None,
+            event: str | None = None,
+            doctor_id: int | None = None,
+            patient_hashed_cf: str | None = None,
+            report_id: int | None = None,
+            data_id: int | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+            after: Tuple[datetime, int] | None = None,
+            limit: int = 100
+    ) -> Sequence[Log]:
+        """
+        Returns at most 'limit' logs matching the filters, most recent first.
+        'after' is the (created_at, id) key of the last log of the previous page: only older
+        logs are returned, so each page is an index range scan instead of an OFFSET.
+        """
+        query = self._filtered_query(
+            service, event, doctor_id, patient_hashed_cf, report_id, data_id, date_from, date_to
+        )
+        if after is not None:
+            query = query.where(tuple_(Log.created_at, Log.id) < tuple_(*after))
+
         # Execute the query and return results
-        result = await self.session.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        result = await self.session.execute(query.limit(limit))
+        return result.scalars().all()
+
+    async def stream_with_filters(
+            self,
+            service: str | None = None,
+            event: str | None = None,
+            doctor_id: int | None = None,
+            patient_hashed_cf: str | None = None,
+            report_id: int | None = None,
+            data_id: int | None = None,
+            date_from: datetime | None = None,
+            date_to: datetime | None = None,
+            chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Log]]:
+        """
+        Yields the logs matching the filters in chunks of 'chunk_size', most recent first.
+        Rows are read through a server-side cursor, so the full result is never materialized.
+        """
+        query = self._filtered_query(
+            service, event, doctor_id, patient_hashed_cf, report_id, data_id, date_from, date_to
+        )
+        result = await self.session.stream_scalars(query.execution_options(yield_per=chunk_size))
+        async for chunk in result.partitions():
+            yield chunk
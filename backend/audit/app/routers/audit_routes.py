@@ -1,8 +1,10 @@
 # Import FastAPI components for routing, dependency injection, and HTTP exceptions
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 # Import Pydantic schemas for log creation and retrieval
-from ..schemas.log_schema import CreateLogResponse, CreateLogRequest, GetLogsResponse, GetLogsRequest
+from ..schemas.log_schema import CreateLogResponse, CreateLogRequest, GetLogsResponse, GetLogsRequest, \
+    CreateLogsBatchRequest, CreateLogsBatchResponse, ExportLogsRequest
 
 # Import dependency function to get the Audit service instance
 from ..utils.dependencies import get_audit_service
@@ -26,12 +28,28 @@ async def log(log_request: CreateLogRequest, audit_service: AuditService = Depen
         # Return a 400 Bad Request error if logging fails
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/logs/batch", response_model=CreateLogsBatchResponse)
+async def log_batch(
+    logs_request: CreateLogsBatchRequest, audit_service: AuditService = Depends(get_audit_service)) -> CreateLogsBatchResponse:
+    """
+    Endpoint to create several audit log entries at once.
+    Used by the services to deliver their queued events in batches.
+    Invalid items are reported in 'rejected' (with their index) and the others are created.
+    """
+    try:
+        # Delegate batch creation to the audit service
+        return await audit_service.log_batch(logs_request)
+    except Exception as e:
+        # Return a 400 Bad Request error if logging fails
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/logs", response_model=GetLogsResponse)
 async def get_logs(
     get_logs_request: GetLogsRequest = Depends(), audit_service: AuditService = Depends(get_audit_service)) -> GetLogsResponse:
     """
-    Endpoint to retrieve existing audit logs.
-    Supports filtering via query parameters defined in GetLogsRequest.
+    Endpoint to retrieve existing audit logs, most recent first.
+    Supports filtering via query parameters defined in GetLogsRequest and keyset
+    pagination: pass the returned 'next_cursor' as 'cursor' to get the next page.
     """
     try:
         # Retrieve logs using the service with the provided filters
@@ -39,4 +57,18 @@ async def get_logs(
         return logs
     except Exception as e:
         # Return a 400 Bad Request error if retrieval fails
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/logs/export")
+async def export_logs(
+    export_logs_request: ExportLogsRequest = Depends(), audit_service: AuditService = Depends(get_audit_service)) -> StreamingResponse:
+    """
+    Endpoint to export all the audit logs matching the filters, as NDJSON or CSV.
+    The response is streamed while the logs are read from the database in chunks.
+    """
+    media_type = "text/csv" if export_logs_request.format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        audit_service.export_logs(export_logs_request),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit_logs.{export_logs_request.format}"'}
+    )
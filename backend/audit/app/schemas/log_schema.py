@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Literal
 # Import Pydantic components for validation
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
@@ -24,7 +24,32 @@ class CreateLogResponse(BaseModel):
     log_id: int = Field(...)
     created_at: datetime = Field(...)
 
-class GetLogsRequest(BaseModel):
+class CreateLogsBatchRequest(BaseModel):
+    """
+    Schema for the request to create several log entries at once.
+    Every item is validated on its own (as a CreateLogRequest), so that one invalid
+    event does not reject the valid events of the same batch.
+    """
+    logs: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+class RejectedLog(BaseModel):
+    """
+    Schema describing a batch item that failed validation and was not created.
+    """
+    index: int = Field(...)
+    detail: str = Field(...)
+
+class CreateLogsBatchResponse(BaseModel):
+    """
+    Schema for the response after a batch of logs is processed.
+    """
+    message: str = Field("Logs created successfully")
+    # IDs of the created logs, in the order of the request
+    log_ids: List[int] = Field(default_factory=list)
+    # Items that failed validation (index in the request), not created
+    rejected: List[RejectedLog] = Field(default_factory=list)
+
+class LogFilters(BaseModel):
     """
     Schema defining the query filters for retrieving logs.
     """
@@ -34,6 +59,24 @@ class GetLogsRequest(BaseModel):
     patient_hashed_cf: str | None = None
     report_id: int | None = Field(None, ge=1)
     data_id: int | None = Field(None, ge=1)
+    # Creation time range: from inclusive, to exclusive
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+
+class GetLogsRequest(LogFilters):
+    """
+    Schema defining the query filters and the page for retrieving logs.
+    Logs are returned most recent first; pass the 'next_cursor' of a response
+    as 'cursor' to get the following page.
+    """
+    cursor: str | None = None
+    limit: int = Field(100, ge=1, le=1000)
+
+class ExportLogsRequest(LogFilters):
+    """
+    Schema defining the query filters and the file format for exporting logs.
+    """
+    format: Literal["ndjson", "csv"] = "ndjson"
 
 class LogItem(BaseModel):
     """
@@ -57,4 +100,6 @@ class GetLogsResponse(BaseModel):
     Schema for the response containing a list of retrieved logs.
     """
     message: str = Field("Log(s) retrieved successfully")
-    logs: List[LogItem] = Field(default_factory=list)
\ No newline at end of file
+    logs: List[LogItem] = Field(default_factory=list)
+    # Cursor of the next page, None when there are no more logs
+    next_cursor: str | None = None
\ No newline at end of file
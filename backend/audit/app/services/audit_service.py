@@ -1,15 +1,27 @@
+import base64
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+from pydantic import ValidationError
 # Import the interface for the log repository
 from ..repositories.i_log_repository import ILogRepository
 # Import Pydantic schemas for request and response handling
 from ..schemas.log_schema import (
     CreateLogRequest,
     CreateLogResponse,
+    CreateLogsBatchRequest,
+    CreateLogsBatchResponse,
+    RejectedLog,
     GetLogsResponse,
-    LogItem, GetLogsRequest
+    LogItem, GetLogsRequest, ExportLogsRequest
 )
 # Import the Log domain model
 from ..models.log_model import Log
 
+# Columns of the CSV export, in order
+EXPORT_COLUMNS = list(LogItem.model_fields)
+
 class AuditService:
     """
     Service class responsible for business logic related to Audit Logging.
@@ -44,20 +56,81 @@ class AuditService:
             created_at=saved_log.created_at
         )
 
+    async def log_batch(self, create_logs_request: CreateLogsBatchRequest) -> CreateLogsBatchResponse:
+        """
+        Creates several log entries at once (used by the batched audit clients).
+        Items failing validation are reported as rejected; the valid ones are created.
+        """
+        items, rejected = [], []
+        for index, raw_item in enumerate(create_logs_request.logs):
+            try:
+                items.append(CreateLogRequest.model_validate(raw_item))
+            except ValidationError as e:
+                errors = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                rejected.append(RejectedLog(index=index, detail=errors))
+
+        logs = [
+            Log(
+                service=item.service,
+                event=item.event,
+                description=item.description,
+                doctor_id=item.doctor_id,
+                patient_hashed_cf=item.patient_hashed_cf,
+                report_id=item.report_id,
+                data_id=item.data_id,
+            )
+            for item in items
+        ]
+
+        # Persist all the valid logs in one transaction
+        saved_logs = await self.log_repository.save_many(logs)
+
+        response = CreateLogsBatchResponse(log_ids=[log.id for log in saved_logs], rejected=rejected)
+        if rejected:
+            response.message = f"{len(saved_logs)} log(s) created, {len(rejected)} rejected"
+        return response
+
+    @staticmethod
+    def _encode_cursor(log: Log) -> str:
+        """
+        Encodes the (created_at, id) key of a log as an opaque pagination cursor.
+        """
+        raw = f"{log.created_at.isoformat()}|{log.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Decodes a pagination cursor into the (created_at, id) key it was built from.
+        """
+        try:
+            created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), int(log_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+
     async def get_logs(
         self, get_logs_request: GetLogsRequest) -> GetLogsResponse:
         """
-        Retrieves logs based on the filters provided in the request.
+        Retrieves a page of logs based on the filters provided in the request.
         """
-        # Fetch logs from the repository using the provided filter criteria
+        after = self._decode_cursor(get_logs_request.cursor) if get_logs_request.cursor else None
+
+        # Fetch one log more than the page size to know whether another page follows
         logs = await self.log_repository.find_with_filters(
             service=get_logs_request.service,
             event=get_logs_request.event,
             doctor_id=get_logs_request.doctor_id,
             patient_hashed_cf=get_logs_request.patient_hashed_cf,
             report_id=get_logs_request.report_id,
-            data_id=get_logs_request.data_id
+            data_id=get_logs_request.data_id,
+            date_from=get_logs_request.from_date,
+            date_to=get_logs_request.to_date,
+            after=after,
+            limit=get_logs_request.limit + 1
         )
+        has_more = len(logs) > get_logs_request.limit
+        logs = logs[:get_logs_request.limit]
 
         # Convert the list of SQLAlchemy models to Pydantic schemas
         log_items = [LogItem.model_validate(log) for log in logs]
@@ -69,5 +142,39 @@ class AuditService:
         # Return the response object containing the list of logs
         return GetLogsResponse(
             message=message,
-            logs=log_items
-        )
\ No newline at end of file
+            logs=log_items,
+            next_cursor=self._encode_cursor(logs[-1]) if has_more else None
+        )
+
+    async def export_logs(self, export_logs_request: ExportLogsRequest) -> AsyncIterator[str]:
+        """
+        Streams all the logs matching the filters as NDJSON lines or CSV rows.
+        Logs are read and serialized chunk by chunk, keeping memory usage constant.
+        """
+        chunks = self.log_repository.stream_with_filters(
+            service=export_logs_request.service,
+            event=export_logs_request.event,
+            doctor_id=export_logs_request.doctor_id,
+            patient_hashed_cf=export_logs_request.patient_hashed_cf,
+            report_id=export_logs_request.report_id,
+            data_id=export_logs_request.data_id,
+            date_from=export_logs_request.from_date,
+            date_to=export_logs_request.to_date
+        )
+
+        if export_logs_request.format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for chunk in chunks:
+                for log in chunk:
+                    writer.writerow([getattr(log, column) for column in EXPORT_COLUMNS])
+                yield buffer.getvalue()
+                # Reuse the buffer for the next chunk
+                buffer.seek(0)
+                buffer.truncate()
+            # Emit the header even when no log matches
+            yield buffer.getvalue()
+        else:
+            async for chunk in chunks:
+                yield "".join(LogItem.model_validate(log).model_dump_json() + "\n" for log in chunk)
@@ -0,0 +1,106 @@
+"""
+Benchmark of the audit log write paths of LogRepository.
+
+Compares the single-row path (one save() per log: INSERT, commit and refresh SELECT,
+as done by POST /audit/log) with the bulk path (save_many(): multi-row
+INSERT ... RETURNING in one transaction, as done by POST /audit/logs/batch),
+reporting rows/second for each batch size.
+
+Usage (from backend/audit, with the POSTGRES_* variables pointing to the database):
+    python -m benchmarks.log_insert_benchmark [--rows N] [--batch-sizes 10,100,1000]
+
+Benchmark rows are written with service='benchmark' and deleted at the end.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from app.models.log_model import Log
+from app.repositories.log_repository import LogRepository
+from app.utils.db_connection import async_session, engine
+
+BENCHMARK_SERVICE = "benchmark"
+
+
+def make_logs(count: int, offset: int = 0) -> list[Log]:
+    """
+    Builds synthetic log rows resembling the events of the other services.
+    """
+    return [
+        Log(
+            service=BENCHMARK_SERVICE,
+            event="analysis_success",
+            description=f"Benchmark log {offset + i}",
+            doctor_id=(offset + i) % 500 + 1,
+            patient_hashed_cf=f"{(offset + i) % 5000:064x}",
+            report_id=offset + i + 1,
+            data_id=offset + i + 1,
+        )
+        for i in range(count)
+    ]
+
+
+async def single_row(rows: int) -> float:
+    """
+    Inserts 'rows' logs one at a time and returns rows/second.
+    """
+    async with async_session() as session:
+        repository = LogRepository(session=session)
+        start = time.perf_counter()
+        for log in make_logs(rows):
+            await repository.save(log)
+        return rows / (time.perf_counter() - start)
+
+
+async def bulk(rows: int, batch_size: int) -> float:
+    """
+    Inserts 'rows' logs in batches of 'batch_size' and returns rows/second.
+    """
+    async with async_session() as session:
+        repository = LogRepository(session=session)
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            await repository.save_many(make_logs(min(batch_size, rows - offset), offset))
+        return rows / (time.perf_counter() - start)
+
+
+async def cleanup():
+    """
+    Removes the rows written by the benchmark.
+    """
+    async with async_session() as session:
+        await session.execute(delete(Log).where(Log.service == BENCHMARK_SERVICE))
+        await session.commit()
+
+
+async def run(rows: int, batch_sizes: list[int]):
+    # Do not print every generated SQL statement
+    engine.echo = False
+    try:
+        # Warm up the connection pool and the prepared statement cache
+        await bulk(min(rows, 100), 100)
+
+        print(f"{'path':<24}{'rows':>8}{'rows/s':>12}{'speedup':>10}")
+        baseline = await single_row(rows)
+        print(f"{'single-row save()':<24}{rows:>8}{baseline:>12.0f}{1.0:>9.1f}x")
+        for batch_size in batch_sizes:
+            rate = await bulk(rows, batch_size)
+            print(f"{f'save_many() x{batch_size}':<24}{rows:>8}{rate:>12.0f}{rate / baseline:>9.1f}x")
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Logs written per path")
+    parser.add_argument("--batch-sizes", default="10,100,1000", help="Comma-separated save_many() batch sizes")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, [int(size) for size in args.batch_sizes.split(",")]))
+
+
+if __name__ == "__main__":
+    main()
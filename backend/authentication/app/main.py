@@ -1,10 +1,22 @@
+from contextlib import asynccontextmanager
 # Import FastAPI to create the application instance
 from fastapi import FastAPI
 # Import the authentication router from the local routers module
 from .routers.authentication_routes import router as authentication_router
+# Import the audit client to drain the queued logs on shutdown
+from .utils.dependencies import audit_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: sends the queued audit logs before shutting down.
+    """
+    yield
+    await audit_client.close()
 
 # Initialize the FastAPI app with the title "Authentication"
-app = FastAPI(title="Authentication")
+app = FastAPI(title="Authentication", lifespan=lifespan)
 
 # Include the authentication router to register the defined endpoints
 app.include_router(authentication_router)
\ No newline at end of file
@@ -1,15 +1,24 @@
 # Import FastAPI components for routing, dependency injection, and error handling
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 # Import schemas (Pydantic models) for request and response validation
 from ..schemas.doctor_schema import (
     RegisterDoctorRequest, RegisterDoctorResponse,
     LoginDoctorRequest, LoginDoctorResponse,
-    ValidateTokenRequest, ValidateTokenResponse
+    ValidateTokenRequest, ValidateTokenResponse,
+    JwksResponse
 )
 
+from ..schemas.metrics_schema import MetricsResponse
+
 # Import the dependency function to get the AuthenticationService instance
-from ..utils.dependencies import get_auth_service
+from ..utils.dependencies import get_auth_service, get_jwt_signer, get_password_hasher, audit_client
+
+# Import the PasswordHasher class
+from ..utils.hasher import PasswordHasher
+
+# Import the JwtSigner class
+from ..utils.jwt_signer import JwtSigner
 
 # Import the AuthenticationService class
 from ..services.authentication_service import AuthenticationService
@@ -63,4 +72,27 @@ async def validate(
         return await auth_service.validate_token(token_request)
     except Exception as e:
         # Return a 401 Unauthorized if the token is invalid or expired
-        raise HTTPException(status_code=401, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=401, detail=str(e))
+
+
+@router.get("/jwks", response_model=JwksResponse)
+async def jwks(response: Response, jwt_signer: JwtSigner = Depends(get_jwt_signer)) -> JwksResponse:
+    """
+    Endpoint to publish the public keys used to sign tokens.
+    Lets other services (e.g. the Gateway) verify tokens locally.
+    """
+    # Allow clients to cache the key set for a few minutes
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return JwksResponse(**jwt_signer.jwks())
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def metrics(password_hasher: PasswordHasher = Depends(get_password_hasher)) -> MetricsResponse:
+    """
+    Endpoint to retrieve the service metrics (password hashing pool occupancy and queue time,
+    audit delivery queue).
+    """
+    return MetricsResponse(metrics={
+        "password_hasher": password_hasher.stats(),
+        "audit": audit_client.stats()
+    })
\ No newline at end of file
@@ -1,4 +1,5 @@
 # Import Pydantic components for data modeling and validation
+from typing import Any, Dict, List
 from pydantic import BaseModel, EmailStr, Field
 
 class RegisterDoctorRequest(BaseModel):
@@ -56,4 +57,11 @@ class ValidateTokenResponse(BaseModel):
     # Default success message
     message: str = "JWT Token validated successfully"
     # The ID of the doctor associated with the valid token
-    doctor_id: int
\ No newline at end of file
+    doctor_id: int
+
+class JwksResponse(BaseModel):
+    """
+    Schema for the JSON Web Key Set (RFC 7517) with the public keys used to verify tokens.
+    No message field, to keep the standard format expected by JWT libraries.
+    """
+    keys: List[Dict[str, Any]]
@@ -0,0 +1,11 @@
+from typing import Any, Dict
+from pydantic import BaseModel
+
+class MetricsResponse(BaseModel):
+    """
+    Schema for the response returned by the metrics endpoint.
+    """
+    # Default success message
+    message: str = "Metrics retrieved successfully"
+    # Metrics grouped by component
+    metrics: Dict[str, Any]
@@ -65,8 +65,8 @@ class AuthenticationService:
             })
             raise Exception("Email already registered")
 
-        # Hash the password before storing it
-        hashed_pwd = self.passwordHasher.hash(register_doctor_request.password)
+        # Hash the password before storing it (off the event loop, bcrypt is CPU-bound)
+        hashed_pwd = await self.passwordHasher.hash_async(register_doctor_request.password)
 
         # Create a new Doctor model instance
         doctor = Doctor(
@@ -96,7 +96,8 @@ class AuthenticationService:
         # Retrieve the doctor by email
         doctor = await self.doctorRepository.find_by_email(str(login_request.email))
 
-        if not doctor or not self.passwordHasher.verify(login_request.password, doctor.hashed_password):
+        # Verify the password on the hashing pool, so that logins do not block token validations
+        if not doctor or not await self.passwordHasher.verify_async(login_request.password, doctor.hashed_password):
             await self.notify({
                 "service": "authentication",
                 "event": "login_fail",
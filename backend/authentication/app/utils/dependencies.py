@@ -9,19 +9,45 @@ from ..repositories.doctor_repository import DoctorRepository
 from ..repositories.i_doctor_repository import IDoctorRepository
 from ..utils.hasher import PasswordHasher
 from ..utils.jwt_signer import JwtSigner
+from ..utils.key_store import KeyStore
 from ..services.authentication_service import AuthenticationService
 from ..utils.logging.audit_client import AuditClient
 from ..utils.http_client import HttpClient
 
 # Initialize shared utility instances
-password_hasher = PasswordHasher()
-# Initialize JWT signer with the secret key from environment variables
-jwt_signer = JwtSigner(secret=os.getenv("SECRET_KEY", "secret"))
+# bcrypt runs on a bounded pool: HASH_WORKERS threads, at most HASH_MAX_PENDING calls admitted at once
+password_hasher = PasswordHasher(
+    max_workers=int(os.getenv("HASH_WORKERS", "2")),
+    max_pending=int(os.getenv("HASH_MAX_PENDING", "32"))
+)
+# Signing algorithm: 'EdDSA' or 'RS256' (asymmetric, verifiable through /jwks) or 'HS256' (shared secret)
+jwt_algorithm = os.getenv("JWT_ALGORITHM", "EdDSA")
+# Lifetime of the issued tokens
+jwt_expires_minutes = 60
+# Asymmetric signing keys are persisted in JWT_KEYS_DIR and rotated every JWT_KEY_ROTATION_DAYS;
+# a retired key is removed once the tokens it signed have expired
+key_store = None
+if jwt_algorithm != "HS256":
+    key_store = KeyStore(
+        keys_dir=os.getenv("JWT_KEYS_DIR", "keys"),
+        algorithm=jwt_algorithm,
+        rotation_days=float(os.getenv("JWT_KEY_ROTATION_DAYS", "30")),
+        token_lifetime_seconds=jwt_expires_minutes * 60
+    )
+# Initialize JWT signer with the secret key from environment variables (HS256 fallback) and the key store
+jwt_signer = JwtSigner(secret=os.getenv("SECRET_KEY", "secret"), expires_minutes=jwt_expires_minutes, key_store=key_store)
 
-# Configure the Audit service URL and client
+# Configure the Audit service URL and client (logs are queued and sent in background batches)
 audit_url = os.getenv("AUDIT_URL", "http://audit_service:8000/audit")
 http_client = HttpClient()
-audit_client = AuditClient(audit_url=audit_url, http_client=http_client)
+audit_client = AuditClient(
+    audit_url=audit_url,
+    http_client=http_client,
+    max_queue=int(os.getenv("AUDIT_MAX_QUEUE", "10000")),
+    batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "100")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5")),
+    overflow_policy=os.getenv("AUDIT_OVERFLOW_POLICY", "drop_oldest")
+)
 
 
 async def get_auth_service(session: AsyncSession = Depends(get_session)) -> AuthenticationService:
@@ -43,4 +69,18 @@ async def get_auth_service(session: AsyncSession = Depends(get_session)) -> Auth
     # Attach the audit client to listen for authentication events (Observer pattern)
     auth_service.attach(audit_client)
 
-    return auth_service
\ No newline at end of file
+    return auth_service
+
+
+async def get_jwt_signer() -> JwtSigner:
+    """
+    Dependency to provide the shared JwtSigner (used to publish the verification keys).
+    """
+    return jwt_signer
+
+
+async def get_password_hasher() -> PasswordHasher:
+    """
+    Dependency to provide the shared PasswordHasher (used to expose its metrics).
+    """
+    return password_hasher
\ No newline at end of file
@@ -1,3 +1,7 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
 # Import CryptContext from passlib to handle password hashing
 from passlib.context import CryptContext
 
@@ -8,7 +12,26 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 class PasswordHasher:
     """
     Utility class for hashing and verifying passwords using bcrypt.
+    bcrypt is deliberately slow (hundreds of milliseconds of CPU): the async methods run it
+    on a dedicated, size-limited thread pool (the bcrypt C extension releases the GIL), so
+    a burst of logins cannot block the event loop serving token validations.
     """
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        # Caps the calls running or queued on the pool: further callers wait on the
+        # event loop (cheap) instead of piling up work in the executor
+        self._slots = asyncio.Semaphore(max(self.max_workers, max_pending))
+        self.max_pending = max(self.max_workers, max_pending)
+        # Metrics
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._queue_total = 0.0
+        self._queue_max = 0.0
+        self._exec_total = 0.0
+        self._exec_max = 0.0
+
     def hash(self, password: str) -> str:
         """
         Hashes a plain text password.
@@ -20,4 +43,63 @@ class PasswordHasher:
         Verifies a plain text password against a hashed string.
         Returns True if they match, False otherwise.
         """
-        return pwd_context.verify(plain, hashed)
\ No newline at end of file
+        return pwd_context.verify(plain, hashed)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs fn(*args) on the hashing pool, recording queue and execution times.
+        """
+        submitted = time.perf_counter()
+        self._waiting += 1
+        try:
+            async with self._slots:
+                self._in_flight += 1
+                try:
+                    def timed_call():
+                        started = time.perf_counter()
+                        result = fn(*args)
+                        return result, started, time.perf_counter() - started
+
+                    result, started, elapsed = await asyncio.get_running_loop().run_in_executor(self._pool, timed_call)
+                finally:
+                    self._in_flight -= 1
+        finally:
+            self._waiting -= 1
+
+        # Queue time covers both the semaphore wait and the executor queue
+        queued = started - submitted
+        self._queue_total += queued
+        self._queue_max = max(self._queue_max, queued)
+        self._exec_total += elapsed
+        self._exec_max = max(self._exec_max, elapsed)
+        self._completed += 1
+        return result
+
+    async def hash_async(self, password: str) -> str:
+        """
+        Hashes a plain text password off the event loop.
+        """
+        return await self._run(self.hash, password)
+
+    async def verify_async(self, plain: str, hashed: str) -> bool:
+        """
+        Verifies a plain text password against a hashed string off the event loop.
+        """
+        return await self._run(self.verify, plain, hashed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns occupancy, queue-time and execution-time metrics of the hashing pool.
+        """
+        completed = self._completed or 1
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting - self._in_flight,
+            "completed": self._completed,
+            "queue_avg_ms": round(self._queue_total / completed * 1000, 3),
+            "queue_max_ms": round(self._queue_max * 1000, 3),
+            "execution_avg_ms": round(self._exec_total / completed * 1000, 3),
+            "execution_max_ms": round(self._exec_max * 1000, 3),
+        }
@@ -1,16 +1,20 @@
 from datetime import datetime, timezone, timedelta
-from typing import Dict
+from typing import Any, Dict, List
 import jwt
 from jwt import ExpiredSignatureError, InvalidTokenError
+from .key_store import KeyStore
 
 class JwtSigner:
     """
     Utility class for creating and verifying JSON Web Tokens (JWT).
-    Uses HS256 algorithm for signing.
+    Signs with an asymmetric key (EdDSA or RS256) of the key store, identified by the 'kid'
+    header, so that other services can verify tokens with the published public keys.
+    Without a key store it falls back to HS256 with the shared secret.
     """
-    def __init__(self, secret: str, expires_minutes: int = 60):
+    def __init__(self, secret: str, expires_minutes: int = 60, key_store: KeyStore | None = None):
         self.secret = secret
         self.expires_minutes = expires_minutes
+        self.key_store = key_store
 
     def create_token(self, doctor_id: str, name: str, surname: str) -> str:
         """
@@ -24,7 +28,11 @@ class JwtSigner:
             "surname": surname,
             "exp": expire
         }
-        return jwt.encode(payload, self.secret, algorithm="HS256")
+        if self.key_store is None:
+            return jwt.encode(payload, self.secret, algorithm="HS256")
+
+        kid, private_key = self.key_store.signing_key()
+        return jwt.encode(payload, private_key, algorithm=self.key_store.algorithm, headers={"kid": kid})
 
     def verify_token(self, token: str) -> Dict:
         """
@@ -32,11 +40,27 @@ class JwtSigner:
         Raises exceptions if the token is expired or invalid.
         """
         try:
-            payload = jwt.decode(token, self.secret, algorithms=["HS256"])
-            return payload
+            if self.key_store is None:
+                return jwt.decode(token, self.secret, algorithms=["HS256"])
+
+            # Select the public key from the 'kid' header (only the configured algorithm is accepted)
+            kid = jwt.get_unverified_header(token).get("kid")
+            public_key = self.key_store.public_key(kid) if kid else None
+            if public_key is None:
+                raise InvalidTokenError("Unknown signing key")
+            return jwt.decode(token, public_key, algorithms=[self.key_store.algorithm])
 
         except ExpiredSignatureError:
             raise Exception("Token has expired")
 
         except InvalidTokenError:
-            raise Exception("Invalid token")
\ No newline at end of file
+            raise Exception("Invalid token")
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Returns the JSON Web Key Set with the public verification keys.
+        Empty with HS256, whose secret cannot be published.
+        """
+        if self.key_store is None:
+            return {"keys": []}
+        return self.key_store.jwks()
@@ -0,0 +1,223 @@
+import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+# Import cryptography primitives to generate, load and serialize asymmetric keys
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+# Import PyJWT helpers to export public keys in JWK format
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+# File locking is platform specific (fcntl on POSIX, msvcrt on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class KeyStore:
+    """
+    Storage of the asymmetric keys used to sign JWT tokens.
+    Keys are PEM files named '<kid>.pem' in 'keys_dir', shared by every worker process:
+    the newest one signs new tokens, the previous ones are kept until every token they
+    may have signed has expired.
+    The first key and the rotations are created under a file lock, and the directory is
+    re-read when it changes, so that every process signs with and publishes the same keys.
+    """
+
+    def __init__(self, keys_dir: str, algorithm: str = "EdDSA", rotation_days: float = 30,
+                 token_lifetime_seconds: float = 3600):
+        if algorithm not in ("EdDSA", "RS256"):
+            raise ValueError(f"Unsupported signing algorithm '{algorithm}'")
+        self.keys_dir = keys_dir
+        self.algorithm = algorithm
+        self.rotation_seconds = rotation_days * 24 * 3600
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._lock = threading.Lock()
+        # List of (kid, private key, creation timestamp), oldest first
+        self._keys: List[Tuple[str, Any, float]] = []
+        # Modification time of keys_dir when it was last read
+        self._dir_mtime = None
+        os.makedirs(self.keys_dir, exist_ok=True)
+        with self._lock:
+            self._reload()
+            if not self._keys:
+                with self._file_lock():
+                    # Another process may have created the first key meanwhile
+                    self._reload()
+                    if not self._keys:
+                        self._rotate()
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Holds an exclusive lock on 'keys_dir/.lock', shared with the other processes.
+        """
+        fd = os.open(os.path.join(self.keys_dir, ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+    def _generate_private_key(self):
+        """
+        Generates a new private key for the configured algorithm.
+        """
+        if self.algorithm == "EdDSA":
+            return ed25519.Ed25519PrivateKey.generate()
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @staticmethod
+    def _kid(private_key) -> str:
+        """
+        Derives the key ID from the SHA-256 of the public key.
+        """
+        public_der = private_key.public_key().public_bytes(
+            serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        return hashlib.sha256(public_der).hexdigest()[:16]
+
+    def _reload(self):
+        """
+        Reads the keys of the configured algorithm from disk (keys already loaded are not parsed again).
+        """
+        self._dir_mtime = os.stat(self.keys_dir).st_mtime_ns
+        loaded = {kid: private_key for kid, private_key, _ in self._keys}
+        keys = []
+        for file_name in os.listdir(self.keys_dir):
+            if not file_name.endswith(".pem"):
+                continue
+            kid = file_name[:-4]
+            path = os.path.join(self.keys_dir, file_name)
+            try:
+                created_at = os.path.getmtime(path)
+                private_key = loaded.get(kid)
+                if private_key is None:
+                    with open(path, "rb") as f:
+                        private_key = serialization.load_pem_private_key(f.read(), password=None)
+            except (FileNotFoundError, ValueError):
+                # Removed by another process meanwhile, or not a valid key
+                continue
+            # Ignore keys of other algorithms (e.g. after switching from RS256 to EdDSA)
+            if isinstance(private_key, ed25519.Ed25519PrivateKey) != (self.algorithm == "EdDSA"):
+                continue
+            keys.append((kid, private_key, created_at))
+
+        keys.sort(key=lambda entry: entry[2])
+        self._keys = keys
+
+    def _refresh(self):
+        """
+        Re-reads the keys if another process has added or removed one.
+        """
+        try:
+            changed = os.stat(self.keys_dir).st_mtime_ns != self._dir_mtime
+        except FileNotFoundError:
+            return
+        if changed:
+            self._reload()
+
+    def _rotate(self) -> str:
+        """
+        Generates a new signing key, persists it and makes it the active one.
+        Keys that can no longer have signed an unexpired token are removed: another process
+        signs with its active key until the key is 'rotation_seconds' old, then its tokens
+        stay valid for 'token_lifetime_seconds'.
+        Must be called with both locks held. Returns the kid of the new key.
+        """
+        private_key = self._generate_private_key()
+        kid = self._kid(private_key)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        # Private key files are readable by the owner only; the file is written under a temporary
+        # name and renamed, so that other processes never read a partial key
+        path = os.path.join(self.keys_dir, f"{kid}.pem")
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(pem)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        keys = self._keys + [(kid, private_key, now)]
+        if self.rotation_seconds > 0:
+            retention = self.rotation_seconds + self.token_lifetime_seconds
+            for old_kid, _, created_at in self._keys:
+                if now - created_at > retention:
+                    try:
+                        os.remove(os.path.join(self.keys_dir, f"{old_kid}.pem"))
+                    except FileNotFoundError:
+                        pass
+                    keys.remove(next(entry for entry in keys if entry[0] == old_kid))
+        self._keys = keys
+        self._dir_mtime = os.stat(self.keys_dir).st_mtime_ns
+        return kid
+
+    def rotate(self) -> str:
+        """
+        Generates a new signing key and makes it the active one for every process.
+        Returns the kid of the new key.
+        """
+        with self._lock, self._file_lock():
+            self._reload()
+            return self._rotate()
+
+    def signing_key(self) -> Tuple[str, Any]:
+        """
+        Returns (kid, private key) of the active key, rotating it first if it is too old.
+        """
+        with self._lock:
+            self._refresh()
+            kid, private_key, created_at = self._keys[-1]
+            if self.rotation_seconds > 0 and time.time() - created_at >= self.rotation_seconds:
+                with self._file_lock():
+                    # Another process may have rotated the key meanwhile
+                    self._reload()
+                    kid, private_key, created_at = self._keys[-1]
+                    if time.time() - created_at >= self.rotation_seconds:
+                        kid = self._rotate()
+                        private_key = self._keys[-1][1]
+            return kid, private_key
+
+    def public_key(self, kid: str):
+        """
+        Returns the public key with the given kid, or None if it is unknown.
+        An unknown kid may belong to a key just created by another process: the keys are re-read.
+        """
+        with self._lock:
+            for attempt in range(2):
+                for key_id, private_key, _ in self._keys:
+                    if key_id == kid:
+                        return private_key.public_key()
+                if attempt == 0:
+                    self._refresh()
+        return None
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Returns the public keys as a JSON Web Key Set (RFC 7517), including the keys
+        created by the other processes.
+        """
+        to_jwk = OKPAlgorithm.to_jwk if self.algorithm == "EdDSA" else RSAAlgorithm.to_jwk
+        with self._lock:
+            self._refresh()
+            entries = list(self._keys)
+        keys = []
+        for kid, private_key, _ in reversed(entries):
+            jwk = to_jwk(private_key.public_key(), as_dict=True)
+            jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
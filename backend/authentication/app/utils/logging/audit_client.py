@@ -1,38 +1,190 @@
+import asyncio
+import random
+import time
+from typing import Dict, Any, List
+
 import httpx
-from typing import Dict, Any
 # Import the Observer interface
 from .I_observer import IObserver
 # Import the custom HttpClient wrapper
 from ..http_client import HttpClient
 
+# Policies applied when the event queue is full
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+# Maximum length of an event description accepted by the Audit Service (longer ones are truncated)
+DESCRIPTION_MAX_LENGTH = 100
+
 
 class AuditClient(IObserver):
     """
     Concrete implementation of the IObserver interface.
     Acts as a client that forwards log events to the external Audit Service.
+    Events are queued in memory and sent in batches by a background task, so that
+    audit writes do not add an HTTP round trip to the authentication flow.
     """
 
-    def __init__(self, audit_url: str, http_client: HttpClient):
+    def __init__(self, audit_url: str, http_client: HttpClient, max_queue: int = 10000,
+                 batch_size: int = 100, flush_interval: float = 0.5, overflow_policy: str = "drop_oldest",
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 5.0):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported audit overflow policy '{overflow_policy}'")
         # Store the URL of the Audit Service and the HTTP client instance
         self.audit_url = audit_url
         self.http = http_client
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        # Retries of a batch after a connection error or a 5xx answer of the Audit Service
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        # Metrics
+        self._enqueued = 0
+        self._sent = 0
+        self._dropped = 0
+        self._failed = 0
+        self._rejected = 0
+        self._retries = 0
+        self._flushes = 0
+        self._flush_total = 0.0
+        self._flush_max = 0.0
+
+    def _ensure_worker(self):
+        """
+        Starts the flushing loop on the running event loop (lazily, on first event).
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
 
     async def update(self, payload: Dict[str, Any]):
         """
         Called when an event occurs in the Authentication service.
-        Sends the event data to the Audit Service via HTTP POST.
+        Queues the event data for the next batch sent to the Audit Service.
         """
         # Filter the payload to remove keys with None values to ensure clean JSON
         clean_payload = {k: v for k, v in payload.items() if v is not None}
+        # A description over the limit would get the event rejected by the Audit Service
+        description = clean_payload.get("description")
+        if isinstance(description, str) and len(description) > DESCRIPTION_MAX_LENGTH:
+            clean_payload["description"] = description[:DESCRIPTION_MAX_LENGTH - 3] + "..."
 
+        self._ensure_worker()
+        if self._queue.full():
+            if self.overflow_policy == "drop_newest":
+                self._dropped += 1
+                return
+            if self.overflow_policy == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._dropped += 1
+        # With the 'block' policy this waits for room in the queue
+        await self._queue.put(clean_payload)
+        self._enqueued += 1
+
+    async def _run(self):
+        """
+        Flushing loop: sends a batch when 'batch_size' events are queued or
+        'flush_interval' seconds after the first event of the batch.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        """
+        Sends a batch of events to the Audit Service's /logs/batch endpoint.
+        Connection errors and 5xx answers are retried with exponential backoff and full jitter
+        (new events wait in the queue meanwhile). Events rejected by the validation of the
+        Audit Service are counted and reported; the other events of the batch are stored.
+        """
+        start = time.perf_counter()
         try:
-            # Send the log data to the Audit Service's /log endpoint
-            await self.http.request(
-                "POST",
-                f"{self.audit_url}/log",
-                json=clean_payload
-            )
-        except Exception as e:
-            # Log an error message to the console if the request fails
-            # (Does not raise the exception to prevent blocking the main auth flow)
-            print(f"Failed to send log to Audit Service: {e}")
\ No newline at end of file
+            error = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self._retries += 1
+                    await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))))
+                try:
+                    # The status code decides whether to retry: use the underlying httpx client
+                    resp = await self.http.client.post(f"{self.audit_url}/logs/batch", json={"logs": batch})
+                except httpx.TransportError as e:
+                    error = f"HTTP request failed: {e}"
+                    continue
+                if resp.status_code >= 500:
+                    error = f"HTTP {resp.status_code}: {resp.text}"
+                    continue
+                if resp.is_error:
+                    # The batch itself is refused (e.g. malformed request): retrying would not help
+                    error = f"HTTP {resp.status_code}: {resp.text}"
+                else:
+                    error = None
+                    rejected = resp.json().get("rejected", [])
+                    self._sent += len(batch) - len(rejected)
+                    self._rejected += len(rejected)
+                    for item in rejected:
+                        print(f"Log rejected by Audit Service ({batch[item['index']].get('event')}): {item['detail']}")
+                break
+
+            if error is not None:
+                # Log an error message to the console if the request fails
+                # (Does not raise the exception to prevent blocking the main auth flow)
+                self._failed += len(batch)
+                print(f"Failed to send {len(batch)} log(s) to Audit Service: {error}")
+        finally:
+            elapsed = time.perf_counter() - start
+            self._flushes += 1
+            self._flush_total += elapsed
+            self._flush_max = max(self._flush_max, elapsed)
+
+    async def close(self, timeout: float = 5.0):
+        """
+        Drains the queued events (waiting at most 'timeout' seconds) and stops the flushing loop.
+        Called on application shutdown.
+        """
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Audit queue not drained on shutdown: {self._queue.qsize()} log(s) lost")
+        self._worker.cancel()
+        self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns queue-depth, delivery and flush-latency metrics.
+        """
+        flushes = self._flushes or 1
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self._enqueued,
+            "sent": self._sent,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "retries": self._retries,
+            "flushes": self._flushes,
+            "flush_avg_ms": round(self._flush_total / flushes * 1000, 3),
+            "flush_max_ms": round(self._flush_max * 1000, 3),
+        }
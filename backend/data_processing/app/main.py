@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
 # Import the FastAPI class to create the application instance
 from fastapi import FastAPI
 # Import the data router from the local routers module
 from .routers.data_routes import router as data_router
+# Import the process pool used by the CPU-bound handlers
+from .utils.process_pool import shutdown_process_pool
+# Import the audit client to drain the queued logs on shutdown
+from .utils.dependencies import audit_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: on shutdown, sends the queued audit logs and stops
+    the preprocessing worker processes.
+    """
+    yield
+    await audit_client.close()
+    shutdown_process_pool()
 
 # Initialize the FastAPI application with the title "Data Processing"
-app = FastAPI(title="Data Processing")
+app = FastAPI(title="Data Processing", lifespan=lifespan)
 
 # Include the data router to register the defined endpoints for data processing
-app.include_router(data_router)
\ No newline at end of file
+app.include_router(data_router)
@@ -1,6 +1,6 @@
 # Import SQLAlchemy components for ORM mapping
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, Text, func
+from sqlalchemy import String, Integer, DateTime, Text, LargeBinary, func
 from datetime import datetime
 # Import the shared Base class
 from ..utils.db_connection import Base
@@ -19,8 +19,11 @@ class ProcessedData(Base):
     # The type/strategy used for processing (e.g., 'numeric', 'img_rx', 'text')
     type: Mapped[str] = mapped_column(String(20), nullable=False)
 
-    # The actual processed data stored as a text string (often JSON or Base64)
-    data: Mapped[str] = mapped_column(Text, nullable=False)
+    # The actual processed data stored as a text string (e.g. JSON or normalized text)
+    data: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Binary processed data (e.g. image tensors in .npy format), used instead of 'data'
+    binary_data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
     # Timestamp of creation, defaults to current server time
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
\ No newline at end of file
@@ -1,14 +1,24 @@
 # Import FastAPI components for routing, exception handling, and dependency injection
-from fastapi import APIRouter, HTTPException, Depends, Path
+from fastapi import APIRouter, HTTPException, Depends, Path, Header, Response
 
 # Import Pydantic schemas for data validation (request and response models)
 from app.schemas.data_schema import DataRequest, DataResponse, GetDataResponse
+from app.schemas.metrics_schema import MetricsResponse
 
 # Import the DataProcessingService class to handle business logic
 from app.services.data_service import DataProcessingService
 
 # Import the dependency function to retrieve the service instance
-from app.utils.dependencies import get_data_service
+from app.utils.dependencies import get_data_service, audit_client
+
+# Import the media type of binary tensors
+from app.utils.tensor_codec import NPY_MEDIA_TYPE
+
+# Import the per-handler timing metrics
+from app.utils.handler_metrics import handler_metrics
+
+# Import the process pool metrics
+from app.utils.process_pool import process_pool_stats
 
 # Initialize the API router with a specific prefix and tags for documentation
 router = APIRouter(prefix="/data_processing", tags=["Endpoints"])
@@ -27,14 +37,36 @@ async def process(data_request: DataRequest, data_service: DataProcessingService
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/retrieve/{data_id}", response_model=GetDataResponse)
-async def retrieve(data_id: int = Path(...), data_service: DataProcessingService = Depends(get_data_service)) -> GetDataResponse:
+async def retrieve(data_id: int = Path(...), accept: str | None = Header(None), data_service: DataProcessingService = Depends(get_data_service)) -> GetDataResponse | Response:
     """
     Endpoint to retrieve processed data by its ID.
     The data_id is extracted from the URL path.
+    Clients sending 'Accept: application/octet-stream' receive the stored bytes directly
+    (e.g. .npy tensors), with the data type in the 'X-Data-Type' header.
     """
     try:
+        if accept and "application/octet-stream" in accept:
+            data = await data_service.retrieve_raw(data_id)
+            if data.binary_data is not None:
+                return Response(content=data.binary_data, media_type=NPY_MEDIA_TYPE, headers={"X-Data-Type": data.type})
+            return Response(content=data.data.encode("utf-8"), media_type="text/plain", headers={"X-Data-Type": data.type})
+
         # Call the retrieve method of the data service using the provided ID
         return await data_service.retrieve(data_id)
     except Exception as e:
         # Catch any errors (e.g., data not found) and return a 400 Bad Request response
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def metrics() -> MetricsResponse:
+    """
+    Endpoint exposing runtime metrics of the Data Processing service.
+    Reports per-handler timing, split between inline and process-pool execution,
+    the process pool (worker processes and restarts) and the audit delivery queue.
+    """
+    return MetricsResponse(metrics={
+        "handlers": handler_metrics.snapshot(),
+        "process_pool": process_pool_stats(),
+        "audit": audit_client.stats()
+    })
@@ -19,6 +19,8 @@ class ProcessedDataItem(BaseModel):
     id: int
     type: str
     data: str
+    # How 'data' is encoded: plain 'text', or 'npy+base64' for binary tensors
+    encoding: str = "text"
     created_at: datetime
 
     # Configuration to allow creation from ORM attributes
@@ -0,0 +1,12 @@
+from typing import Dict, Any
+# Import Pydantic components for data validation
+from pydantic import BaseModel
+
+
+class MetricsResponse(BaseModel):
+    """
+    Response returned by the metrics endpoint.
+    Groups runtime statistics by component (e.g. 'handlers').
+    """
+    message: str = "Metrics retrieved successfully"
+    metrics: Dict[str, Any]
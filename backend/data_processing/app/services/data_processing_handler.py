@@ -1,6 +1,12 @@
-from typing import Any
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
 # Import the interface to ensure this class adheres to the contract
 from ..services.I_data_processing_handler import IDataPreprocessingHandler
+# Import the process pool and the per-handler timing metrics
+from ..utils.process_pool import get_process_pool, reset_process_pool, INLINE_THRESHOLD_BYTES
+from ..utils.handler_metrics import handler_metrics
 
 class DataProcessingHandler(IDataPreprocessingHandler):
     """
@@ -26,4 +32,34 @@ class DataProcessingHandler(IDataPreprocessingHandler):
         """
         if self._next_handler:
             return await self._next_handler.handle(data, strategy)
-        return data
\ No newline at end of file
+        return data
+
+    async def run_cpu_bound(self, fn: Callable[..., Any], data: str, *args: Any) -> Any:
+        """
+        Runs the CPU-bound preprocessing function fn(data, *args).
+        Large payloads are offloaded to the process pool so they do not stall the event loop;
+        small payloads keep an inline fast path. The duration is recorded per handler.
+        If a worker process died, the broken pool is replaced and the call is retried once
+        in the new pool (not inline: a payload crashing its worker must not crash the service).
+        """
+        pool = get_process_pool()
+        start = time.perf_counter()
+        if pool is None or len(data) < INLINE_THRESHOLD_BYTES:
+            mode = "inline"
+            result = fn(data, *args)
+        else:
+            mode = "pool"
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(pool, fn, data, *args)
+            except BrokenProcessPool:
+                reset_process_pool(pool)
+                pool = get_process_pool()
+                try:
+                    result = await loop.run_in_executor(pool, fn, data, *args)
+                except BrokenProcessPool:
+                    # The payload itself kills the workers: leave a working pool for the next requests
+                    reset_process_pool(pool)
+                    raise Exception("A worker process crashed while processing the data")
+        handler_metrics.record(type(self).__name__, mode, time.perf_counter() - start)
+        return result
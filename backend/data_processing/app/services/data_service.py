@@ -1,3 +1,4 @@
+import base64
 from typing import List, Dict, Any
 # Import specific concrete handlers for the processing chain
 from ..services.handlers.image_handler import ImagePreprocessingHandler
@@ -71,11 +72,11 @@ class DataProcessingService:
         # Pass data through the chain (the appropriate handler will process it based on 'strategy')
         processed = await chain.handle(data_request.raw_data, data_request.strategy)
 
-        # Create a data model instance with the result
-        processed_data = ProcessedData(
-            type=data_request.strategy,
-            data=processed
-        )
+        # Create a data model instance with the result (binary results, e.g. tensors, go in their own column)
+        if isinstance(processed, bytes):
+            processed_data = ProcessedData(type=data_request.strategy, binary_data=processed)
+        else:
+            processed_data = ProcessedData(type=data_request.strategy, data=processed)
 
         # Save the processed data to the database via repository
         processed_data_id = await self.data_repository.save(processed_data)
@@ -90,9 +91,10 @@ class DataProcessingService:
 
         return DataResponse(processed_data_id=processed_data_id)
 
-    async def retrieve(self, id: int) -> GetDataResponse:
+    async def retrieve_raw(self, id: int) -> ProcessedData:
         """
-        Retrieves processed data from the database by ID.
+        Retrieves the processed data record from the database by ID.
+        Used to send binary data as-is, without JSON/base64 encoding.
         """
         # Fetch data using repository
         data = await self.data_repository.find_by_id(id)
@@ -105,5 +107,25 @@ class DataProcessingService:
             "data_id": data.id
         })
 
+        return data
+
+    async def retrieve(self, id: int) -> GetDataResponse:
+        """
+        Retrieves processed data from the database by ID.
+        """
+        data = await self.retrieve_raw(id)
+
+        # Binary data is base64-encoded to fit in the JSON response
+        if data.binary_data is not None:
+            item = ProcessedDataItem(
+                id=data.id,
+                type=data.type,
+                data=base64.b64encode(data.binary_data).decode("ascii"),
+                encoding="npy+base64",
+                created_at=data.created_at
+            )
+        else:
+            item = ProcessedDataItem.model_validate(data)
+
         # Return the data mapped to the response schema
-        return GetDataResponse(data=ProcessedDataItem.model_validate(data))
\ No newline at end of file
+        return GetDataResponse(data=item)
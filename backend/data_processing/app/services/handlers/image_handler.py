@@ -1,5 +1,5 @@
+import os
 import base64
-import pickle
 from io import BytesIO
 # Import PIL for image manipulation and NumPy for array operations
 from PIL import Image, ImageEnhance
@@ -7,47 +7,97 @@ import numpy as np
 # Import exposure from skimage (though not currently used in the active logic)
 from skimage import exposure
 from ...services.data_processing_handler import DataProcessingHandler
+from ...utils.tensor_codec import encode_tensor
 
+# Storage format of preprocessed images: 'uint8' keeps the resized pixels (normalization
+# is applied at inference time), 'float32' stores the ImageNet-normalized tensor
+IMAGE_STORAGE_DTYPE = os.getenv("IMAGE_STORAGE_DTYPE", "uint8")
 
-class ImagePreprocessingHandler(DataProcessingHandler):
+# Fast decode path: JPEG draft mode (DCT-domain downscaling) plus reducing resize
+FAST_IMAGE_DECODE = os.getenv("FAST_IMAGE_DECODE", "1") == "1"
+# Target size expected by the CNN models
+TARGET_SIZE = (224, 224)
+# The cheap box reduction stops at REDUCING_GAP times the target size, leaving the
+# final bicubic resample enough margin to preserve quality
+REDUCING_GAP = 2.0
+
+# Standard ImageNet normalization values (float32 to avoid float64 intermediate arrays)
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def decode_image(image_bytes: bytes, fast: bool = True) -> Image.Image:
     """
-    Handler responsible for preprocessing image data.
-    Typically used for strategies like 'img_rx' (X-ray) or 'img_skin'.
+    Decodes an encoded image into a 224x224 RGB image.
+    The fast path asks libjpeg to decode JPEGs directly at 1/2, 1/4 or 1/8 scale (never
+    below the target size) and box-reduces large images before the final resample, so
+    multi-megapixel radiographs are never fully decoded.
     """
+    # Open the image using PIL (the pixels are decoded lazily)
+    img = Image.open(BytesIO(image_bytes))
 
-    async def handle(self, data: str, strategy: str) -> str:
-        # Check if the strategy is related to images. If not, pass to the next handler.
-        if strategy not in ("img_rx", "img_skin"):
-            return await super().handle(data, strategy)
+    if not fast:
+        # Full-resolution decode, then resize to 224x224
+        return img.convert("RGB").resize(TARGET_SIZE)
+
+    if img.format == "JPEG":
+        # Configure the decoder to produce the smallest scale still >= target size
+        img.draft("RGB", TARGET_SIZE)
+    img = img.convert("RGB")
+    # Resize the image to 224x224 pixels, reducing by integer factors first
+    return img.resize(TARGET_SIZE, reducing_gap=REDUCING_GAP)
 
-        # Decode the Base64 input string into bytes
-        image_bytes = base64.b64decode(data)
-        # Open the image using PIL and convert it to RGB mode
-        img = Image.open(BytesIO(image_bytes)).convert("RGB")
-        # Resize the image to 224x224 pixels (standard input size for many CNN models)
-        img = img.resize((224, 224))
 
-        # Convert image to a NumPy array and normalize pixel values to range [0, 1]
-        img_array = np.array(img).astype(np.float32) / 255.0
+def preprocess_image(data: str, storage_dtype: str, fast_decode: bool = True) -> bytes:
+    """
+    Decodes a base64 image, resizes it to 224x224 and serializes it as .npy bytes.
+    Module-level function so that it can run in a worker process.
+    """
+    # Decode the Base64 input string into bytes
+    image_bytes = base64.b64decode(data)
+    # Decode and resize the image (standard input size for many CNN models)
+    img = decode_image(image_bytes, fast=fast_decode)
+
+    # Convert image to a (Height, Width, Channels) uint8 NumPy array
+    img_array = np.asarray(img)
 
-        # Define mean and standard deviation for normalization (standard ImageNet values)
-        mean = np.array([0.485, 0.456, 0.406])
-        std = np.array([0.229, 0.224, 0.225])
+    if storage_dtype == "uint8":
+        # Store the raw pixels: 4x smaller than float32, normalized by the XAI service
+        tensor = np.transpose(img_array, (2, 0, 1))[np.newaxis]
+        return encode_tensor(tensor)
 
-        # Apply standardization: (input - mean) / std
-        img_array = (img_array - mean) / std
+    # Normalize pixel values to range [0, 1], then apply standardization: (input - mean) / std
+    img_array = img_array.astype(np.float32) / 255.0
+    img_array = (img_array - IMAGENET_MEAN) / IMAGENET_STD
 
-        # Transpose the array dimensions from (Height, Width, Channels) to (Channels, Height, Width)
-        # This is the format required by PyTorch models.
-        tensor = np.transpose(img_array, (2, 0, 1))
+    # Transpose the array dimensions from (Height, Width, Channels) to (Channels, Height, Width)
+    # This is the format required by PyTorch models.
+    tensor = np.transpose(img_array, (2, 0, 1))
 
-        # Add a batch dimension at index 0 (Result shape: 1, C, H, W)
-        tensor = np.expand_dims(tensor, 0)
-        tensor = tensor.astype(np.float32)
+    # Add a batch dimension at index 0 (Result shape: 1, C, H, W)
+    tensor = np.expand_dims(tensor, 0)
 
-        # Serialize the processed tensor using pickle
-        serialized = pickle.dumps(tensor)
-        # Encode the serialized data back to Base64 string for transport
-        tensor_b64 = base64.b64encode(serialized).decode('utf-8')
+    # Serialize the processed tensor as binary .npy bytes (dtype and shape header + raw data)
+    return encode_tensor(tensor)
+
+
+class ImagePreprocessingHandler(DataProcessingHandler):
+    """
+    Handler responsible for preprocessing image data.
+    Typically used for strategies like 'img_rx' (X-ray) or 'img_skin'.
+    """
+
+    def __init__(self, storage_dtype: str = IMAGE_STORAGE_DTYPE, fast_decode: bool = FAST_IMAGE_DECODE):
+        super().__init__()
+        if storage_dtype not in ("uint8", "float32"):
+            raise ValueError(f"Unsupported image storage dtype '{storage_dtype}'")
+        self.storage_dtype = storage_dtype
+        self.fast_decode = fast_decode
+
+    async def handle(self, data: str, strategy: str) -> bytes:
+        # Check if the strategy is related to images. If not, pass to the next handler.
+        if strategy not in ("img_rx", "img_skin"):
+            return await super().handle(data, strategy)
 
-        return tensor_b64
\ No newline at end of file
+        # Decoding and resizing are CPU-bound: large images run in the process pool
+        return await self.run_cpu_bound(preprocess_image, data, self.storage_dtype, self.fast_decode)
\ No newline at end of file
@@ -2,6 +2,21 @@ import json
 import numpy as np
 from ...services.data_processing_handler import DataProcessingHandler
 
+
+def preprocess_numeric(data: str) -> str:
+    """
+    Parses the JSON feature list and normalizes it to float32 values.
+    """
+    # Parse the JSON string input into a Python list
+    values = json.loads(data)
+
+    # Convert the list to a NumPy array with float32 precision
+    np_arr = np.array(values, dtype=np.float32)
+
+    # Convert back to a list and then to a JSON string
+    return json.dumps(np_arr.tolist())
+
+
 class NumericPreprocessingHandler(DataProcessingHandler):
     """
     Handler responsible for preprocessing structured numeric data.
@@ -20,11 +35,4 @@ class NumericPreprocessingHandler(DataProcessingHandler):
         if strategy != "numeric":
             return await super().handle(data, strategy)
 
-        # Parse the JSON string input into a Python list
-        values = json.loads(data)
-
-        # Convert the list to a NumPy array with float32 precision
-        np_arr = np.array(values, dtype=np.float32)
-
-        # Convert back to a list and then to a JSON string
-        return json.dumps(np_arr.tolist())
\ No newline at end of file
+        return await self.run_cpu_bound(preprocess_numeric, data)
\ No newline at end of file
@@ -16,8 +16,15 @@ audit_url = os.getenv("AUDIT_URL", "http://audit_service:8000/audit")
 
 # Initialize the HTTP client used for inter-service communication
 http_client = HttpClient()
-# Initialize the AuditClient (Observer) to send logs to the Audit Service
-audit_client = AuditClient(audit_url=audit_url, http_client=http_client)
+# Initialize the AuditClient (Observer) to send logs to the Audit Service in background batches
+audit_client = AuditClient(
+    audit_url=audit_url,
+    http_client=http_client,
+    max_queue=int(os.getenv("AUDIT_MAX_QUEUE", "10000")),
+    batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "100")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5")),
+    overflow_policy=os.getenv("AUDIT_OVERFLOW_POLICY", "drop_oldest")
+)
 
 async def get_data_service(session: AsyncSession = Depends(get_session)) -> DataProcessingService:
     """
@@ -0,0 +1,42 @@
+from typing import Any, Dict
+
+
+class HandlerMetrics:
+    """
+    Collects per-handler timing of the preprocessing chain,
+    split by execution mode ('inline' on the event loop or 'pool' in a worker process).
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def record(self, handler: str, mode: str, seconds: float):
+        """
+        Records one execution of a handler.
+        """
+        stats = self._stats.setdefault(handler, {}).setdefault(
+            mode, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns count, average and maximum duration (ms) per handler and mode.
+        """
+        return {
+            handler: {
+                mode: {
+                    "count": int(s["count"]),
+                    "avg_ms": round(s["total_seconds"] / s["count"] * 1000, 3),
+                    "max_ms": round(s["max_seconds"] * 1000, 3),
+                }
+                for mode, s in modes.items()
+            }
+            for handler, modes in self._stats.items()
+        }
+
+
+# Metrics shared by all handler chains of the worker
+handler_metrics = HandlerMetrics()
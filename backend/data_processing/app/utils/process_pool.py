@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+
+# Number of worker processes for CPU-bound preprocessing (0 runs everything inline)
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "2"))
+# Payloads smaller than this (in bytes/characters) are processed inline on the event loop,
+# where the cost of shipping them to a worker process would exceed the work itself
+INLINE_THRESHOLD_BYTES = int(os.getenv("INLINE_THRESHOLD_BYTES", "65536"))
+
+_pool: ProcessPoolExecutor | None = None
+# Pools replaced after one of their worker processes died
+_restarts = 0
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """
+    Returns the shared process pool, creating it on first use.
+    Returns None when the pool is disabled.
+    """
+    global _pool
+    if PROCESS_POOL_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+    return _pool
+
+
+def reset_process_pool(broken: ProcessPoolExecutor):
+    """
+    Discards a broken pool (one of its worker processes died, e.g. killed when out of memory),
+    so that the next call of get_process_pool creates a new one. Concurrent requests failing on
+    the same pool replace it only once.
+    """
+    global _pool, _restarts
+    if _pool is broken:
+        _pool = None
+        _restarts += 1
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def process_pool_stats() -> Dict[str, Any]:
+    """
+    Returns the size of the pool, the pids of its worker processes (and of their parent,
+    the service process) and the number of pools replaced after a worker died.
+    """
+    return {
+        "workers": PROCESS_POOL_WORKERS,
+        "parent_pid": os.getpid(),
+        # Worker processes are started on demand, on the first submissions
+        "worker_pids": sorted(_pool._processes) if _pool is not None and _pool._processes else [],
+        "restarts": _restarts,
+    }
+
+
+def shutdown_process_pool():
+    """
+    Stops the worker processes (called on application shutdown).
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
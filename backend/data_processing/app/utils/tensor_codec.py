@@ -0,0 +1,15 @@
+import io
+import numpy as np
+
+# Media type used when processed tensors are transferred as raw bytes
+NPY_MEDIA_TYPE = "application/x-npy"
+
+
+def encode_tensor(array: np.ndarray) -> bytes:
+    """
+    Serializes a NumPy array into the binary .npy format.
+    The header records dtype and shape, followed by the raw array bytes (no pickle).
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return buffer.getvalue()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the image decode paths of ImagePreprocessingHandler.
+
+Compares the full-resolution decode + resize with the fast path (JPEG draft mode
+and reducing resize) on decode time, decoded pixels (a proxy for decode memory)
+and output fidelity (PSNR / max absolute difference of the 224x224 result).
+
+Usage (from backend/data_processing):
+    python -m benchmarks.image_decode_benchmark [image files...] [--repeat N]
+
+Without files, synthetic chest X-ray sized JPEGs (2000-4000 px) are generated.
+"""
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from app.services.handlers.image_handler import decode_image, TARGET_SIZE
+
+
+def synthetic_jpeg(width: int, height: int, seed: int = 0) -> bytes:
+    """
+    Builds a grayscale-like radiograph: smooth gradients plus fine noise, saved as JPEG.
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = 128 + 60 * np.sin(x / 97.0) * np.cos(y / 131.0)
+    noise = rng.normal(0, 12, size=(height, width))
+    gray = np.clip(base + noise, 0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(gray).convert("RGB").save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def decoded_pixels(image_bytes: bytes, fast: bool) -> int:
+    """
+    Number of pixels the decoder materializes before the final resample.
+    """
+    img = Image.open(BytesIO(image_bytes))
+    if fast and img.format == "JPEG":
+        img.draft("RGB", TARGET_SIZE)
+    return img.size[0] * img.size[1]
+
+
+def time_decode(image_bytes: bytes, fast: bool, repeat: int) -> tuple[float, np.ndarray]:
+    """
+    Returns the median decode time (ms) and the decoded 224x224 image.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = np.asarray(decode_image(image_bytes, fast=fast))
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), result
+
+
+def psnr(reference: np.ndarray, other: np.ndarray) -> float:
+    """
+    Peak signal-to-noise ratio between two uint8 images (inf if identical).
+    """
+    mse = np.mean((reference.astype(np.float64) - other.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Image files to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Decodes per path and image")
+    args = parser.parse_args()
+
+    if args.files:
+        samples = [(path, open(path, "rb").read()) for path in args.files]
+    else:
+        samples = [(f"synthetic {w}x{h}", synthetic_jpeg(w, h)) for w, h in ((2000, 2000), (3000, 2500), (4000, 3000))]
+
+    header = f"{'image':<24}{'full ms':>10}{'fast ms':>10}{'speedup':>9}{'full px':>12}{'fast px':>12}{'PSNR dB':>9}{'max diff':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, image_bytes in samples:
+        full_ms, full_img = time_decode(image_bytes, fast=False, repeat=args.repeat)
+        fast_ms, fast_img = time_decode(image_bytes, fast=True, repeat=args.repeat)
+        max_diff = int(np.max(np.abs(full_img.astype(np.int16) - fast_img.astype(np.int16))))
+        print(
+            f"{name:<24}{full_ms:>10.1f}{fast_ms:>10.1f}{full_ms / fast_ms:>8.1f}x"
+            f"{decoded_pixels(image_bytes, False):>12}{decoded_pixels(image_bytes, True):>12}"
+            f"{psnr(full_img, fast_img):>9.1f}{max_diff:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
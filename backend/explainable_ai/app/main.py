@@ -1,10 +1,37 @@
+from contextlib import asynccontextmanager
 # Import the FastAPI class to create the application instance
 from fastapi import FastAPI
 # Import the XAI router from the local routers module
 from .routers.xai_routes import router as xai_router
+# Import the model registry and the configuration listing the models to warm up
+from .utils.model_registry import model_registry
+from .utils.ai_models_config import Config
+# Import the explanation worker and the audit client to complete the queued work on shutdown
+from .utils.dependencies import audit_client, explanation_worker
+# Import the LLM provider to close its response cache on shutdown
+from .utils.llm.providers import close_llm
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan.
+    On startup: warms up the configured models once per worker and starts the periodic
+    sweep of the stale pending explanations (left by a stopped process).
+    On shutdown: completes the deferred explanations, sends the queued audit logs
+    and closes the LLM response cache.
+    """
+    model_registry.preload(Config.PRELOAD_MODELS)
+    explanation_worker.start_sweeper(Config.EXPLANATION_STALE_SECONDS, Config.EXPLANATION_SWEEP_SECONDS)
+    yield
+    try:
+        await explanation_worker.close()
+    finally:
+        await audit_client.close()
+        close_llm()
 
 # Initialize the FastAPI application with the title "Explainable AI"
-app = FastAPI(title="Explainable AI")
+app = FastAPI(title="Explainable AI", lifespan=lifespan)
 
 # Include the XAI router to register the defined endpoints for explainable AI services
-app.include_router(xai_router)
\ No newline at end of file
+app.include_router(xai_router)
@@ -1,6 +1,6 @@
 # Import SQLAlchemy components for ORM mapping and data types
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, Float, Text, func
+from sqlalchemy import String, Integer, DateTime, Float, Text, Index, func
 from datetime import datetime
 # Import the shared Base class for database models
 from ..utils.db_connection import Base
@@ -22,8 +22,8 @@ class Report(Base):
     # Hashed fiscal code of the patient to ensure privacy
     patient_hashed_cf: Mapped[str] = mapped_column(String(255), nullable=False)
 
-    # Reference ID to the processed data used for this analysis
-    processed_data_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Reference ID to the processed data used for this analysis (None for cohort scoring)
+    processed_data_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     # Timestamp of report creation, defaults to server time
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -37,5 +37,17 @@ class Report(Base):
     # Confidence score of the AI model (0.0 to 1.0)
     confidence: Mapped[float] = mapped_column(Float, nullable=False)
 
-    # Textual or visual explanation of the result (e.g., SHAP values, heatmap base64, text reasoning)
-    explanation: Mapped[str] = mapped_column(Text, nullable=False)
\ No newline at end of file
+    # Textual explanation of the result (e.g., SHAP values, text reasoning, heatmap description)
+    explanation: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Key of the binary explanation (e.g. heatmap) in the artifact store, if any
+    explanation_artifact: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # Status of the explanation: 'ready', or 'pending'/'failed' when computed in background
+    explanation_status: Mapped[str] = mapped_column(String(20), server_default="ready", nullable=False)
+
+
+# Secondary indexes (created by db/db_init.sql and db/migrations/002_lookup_indexes.sql)
+Index("idx_reports_doctor_created", Report.doctor_id, Report.created_at.desc())
+Index("idx_reports_patient_doctor", Report.patient_hashed_cf, Report.doctor_id, Report.created_at.desc())
+Index("idx_reports_pending", Report.created_at, postgresql_where=Report.explanation_status == "pending")
@@ -16,9 +16,30 @@ class IReportRepository(ABC):
         pass
 
     @abstractmethod
-    async def find_by_doctor_id(self, doctor_id: int) -> Sequence[Report]:
+    async def find_by_id(self, report_id: int) -> Report | None:
         """
-        Abstract method to find reports created by a specific doctor.
+        Abstract method to find a report, including its explanation, by ID.
+        """
+        pass
+
+    @abstractmethod
+    async def find_by_doctor_id(
+        self, doctor_id: int, limit: int | None = None, offset: int = 0, with_explanation: bool = False
+    ) -> Sequence[Report]:
+        """
+        Abstract method to find reports created by a specific doctor, most recent first.
+        The explanation is loaded only if 'with_explanation' is set.
+        """
+        pass
+
+    @abstractmethod
+    async def find_by_doctor_and_patient(
+        self, doctor_id: int, patient_hashed_cf: str, limit: int | None = None, offset: int = 0,
+        with_explanation: bool = False
+    ) -> Sequence[Report]:
+        """
+        Abstract method to find the reports of a patient created by a specific doctor, most recent first.
+        The explanation is loaded only if 'with_explanation' is set.
         """
         pass
 
@@ -27,4 +48,35 @@ class IReportRepository(ABC):
         """
         Abstract method to save a new report.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def save_many(self, rows: Sequence[tuple]) -> list[int]:
+        """
+        Abstract method to save many reports at once, given as (doctor_id, patient_hashed_cf,
+        processed_data_id, strategy, diagnosis, confidence, explanation) tuples.
+        Returns their IDs, in order.
+        """
+        pass
+
+    @abstractmethod
+    async def update_explanation(self, report_id: int, **fields) -> None:
+        """
+        Abstract method to update the explanation columns of a report
+        (explanation, explanation_artifact, explanation_status).
+        """
+        pass
+
+    @abstractmethod
+    async def fail_stale_explanations(self, older_than: float) -> int:
+        """
+        Abstract method to mark as failed the explanations pending for more than 'older_than' seconds.
+        """
+        pass
+
+    @abstractmethod
+    async def find_explanation_status(self, report_id: int) -> tuple[int, str] | None:
+        """
+        Abstract method to find the doctor ID and explanation status of a report.
+        """
+        pass
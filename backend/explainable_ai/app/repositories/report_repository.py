@@ -1,8 +1,10 @@
+from datetime import timedelta
 from typing import Sequence
 # Import SQLAlchemy AsyncSession
 from sqlalchemy.ext.asyncio import AsyncSession
-# Import select construct
-from sqlalchemy import select
+# Import select construct and the deferred column loading option
+from sqlalchemy import select, update, text, func
+from sqlalchemy.orm import defer
 # Import the model and interface
 from ..models.report_model import Report
 from ..repositories.I_report_repository import IReportRepository
@@ -24,6 +26,33 @@ class ReportRepository(IReportRepository):
         await self.session.refresh(report)
         return report
 
+    async def save_many(self, rows: Sequence[tuple]) -> list[int]:
+        """
+        Saves many reports at once (e.g. a scored cohort) and returns their IDs, in order.
+        Rows are (doctor_id, patient_hashed_cf, processed_data_id, strategy, diagnosis, confidence,
+        explanation) tuples. The IDs are reserved from the sequence in one query and the rows are
+        sent with a single COPY instead of one INSERT per report.
+        """
+        result = await self.session.execute(
+            text("SELECT nextval(pg_get_serial_sequence('reports', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(rows)}
+        )
+        ids = list(result.scalars().all())
+
+        # COPY is only exposed by the asyncpg driver connection
+        connection = await self.session.connection()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        await driver_connection.copy_records_to_table(
+            Report.__tablename__,
+            records=[(report_id, *row) for report_id, row in zip(ids, rows)],
+            columns=[
+                "id", "doctor_id", "patient_hashed_cf", "processed_data_id",
+                "strategy", "diagnosis", "confidence", "explanation"
+            ]
+        )
+        await self.session.commit()
+        return ids
+
     async def find_by_patient_hashed_cf(self, patient_hashed_cf: str) -> Sequence[Report]:
         """
         Retrieves all reports associated with a specific patient's hashed fiscal code.
@@ -35,12 +64,91 @@ class ReportRepository(IReportRepository):
         # Return all matching records
         return result.scalars().all()
 
-    async def find_by_doctor_id(self, doctor_id: int) -> Sequence[Report]:
+    async def find_by_id(self, report_id: int) -> Report | None:
+        """
+        Retrieves a report, including its explanation, by ID.
+        """
+        result = await self.session.execute(select(Report).where(Report.id == report_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _listing_query(with_explanation: bool):
+        """
+        Base SELECT of the report listings.
+        Without explanation, the column is not selected at all: heavy heatmaps are never
+        transferred (accessing it raises instead of triggering a lazy load per report).
+        """
+        query = select(Report)
+        if not with_explanation:
+            query = query.options(defer(Report.explanation, raiseload=True))
+        return query
+
+    async def find_by_doctor_id(
+        self, doctor_id: int, limit: int | None = None, offset: int = 0, with_explanation: bool = False
+    ) -> Sequence[Report]:
         """
-        Retrieves all reports created by a specific doctor.
+        Retrieves the reports created by a specific doctor, most recent first.
+        """
+        # Execute SELECT query filtering by doctor_id (served by the (doctor_id, created_at) index)
+        query = (
+            self._listing_query(with_explanation)
+            .where(Report.doctor_id == doctor_id)
+            .order_by(Report.created_at.desc(), Report.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def find_by_doctor_and_patient(
+        self, doctor_id: int, patient_hashed_cf: str, limit: int | None = None, offset: int = 0,
+        with_explanation: bool = False
+    ) -> Sequence[Report]:
+        """
+        Retrieves the reports of a patient created by a specific doctor, most recent first.
+        Both predicates are evaluated by the database: reports of other doctors are never loaded.
+        """
+        # Served by the (patient_hashed_cf, doctor_id, created_at) index
+        query = (
+            self._listing_query(with_explanation)
+            .where(Report.patient_hashed_cf == patient_hashed_cf, Report.doctor_id == doctor_id)
+            .order_by(Report.created_at.desc(), Report.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def update_explanation(self, report_id: int, **fields) -> None:
+        """
+        Updates the explanation columns of a report (used when a deferred explanation is ready).
+        """
+        await self.session.execute(update(Report).where(Report.id == report_id).values(**fields))
+        await self.session.commit()
+
+    async def fail_stale_explanations(self, older_than: float) -> int:
+        """
+        Marks as failed the explanations still pending 'older_than' seconds after their report
+        was created (the database clock is used). Returns the number of reports updated.
+        """
+        result = await self.session.execute(
+            update(Report)
+            .where(Report.explanation_status == "pending",
+                   Report.created_at < func.now() - timedelta(seconds=older_than))
+            .values(explanation="Explanation not available", explanation_status="failed")
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def find_explanation_status(self, report_id: int) -> tuple[int, str] | None:
+        """
+        Retrieves the doctor ID and explanation status of a report.
+        The read transaction is ended right away, so that long-polling clients
+        do not hold a pooled connection while they wait.
         """
-        # Execute SELECT query filtering by doctor_id
         result = await self.session.execute(
-            select(Report).where(Report.doctor_id == doctor_id)
+            select(Report.doctor_id, Report.explanation_status).where(Report.id == report_id)
         )
-        return result.scalars().all()
\ No newline at end of file
+        row = result.one_or_none()
+        await self.session.commit()
+        return tuple(row) if row is not None else None
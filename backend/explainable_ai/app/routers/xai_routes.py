@@ -1,15 +1,27 @@
 # Import FastAPI components for routing, exception handling, and dependency injection
-from fastapi import APIRouter, HTTPException, Depends, Path, Query
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Header, Response, Request
+from fastapi.responses import StreamingResponse
 # Import Pydantic schemas for request and response validation
-from app.schemas.analysis_schema import AnalysisRequest, AnalysisResponse, GetReportsResponse
+from app.schemas.analysis_schema import AnalysisRequest, AnalysisResponse, GetReportsResponse, GetReportResponse, \
+    WhatIfRequest, WhatIfResponse
+from app.schemas.metrics_schema import MetricsResponse
 # Import the XAI service class to handle business logic
 from app.services.xai_service import XAiService
 # Import the dependency function to retrieve the service instance
-from app.utils.dependencies import get_xai_service
+from app.utils.dependencies import get_xai_service, audit_client, explanation_worker
+# Import the process-wide model registry to expose its statistics
+from app.utils.model_registry import model_registry
+from app.utils.batching import batcher_stats
+from app.utils.inference_executor import executor_stats, ExecutorSaturatedError
+from app.utils.llm.providers import llm_stats
+from app.utils.cohort_parser import UnsupportedCohortFormat, CohortTooLargeError
 
 # Initialize the API router with a specific prefix and tags for documentation
 router = APIRouter(prefix="/explainable_ai", tags=["Endpoints"])
 
+# Caching policy of the explanation artifacts (immutable, one year)
+ARTIFACT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 @router.post("/analyse", response_model=AnalysisResponse)
 async def analyse(analysis_request: AnalysisRequest, xai_service: XAiService = Depends(get_xai_service)) -> AnalysisResponse:
     """
@@ -19,19 +31,134 @@ async def analyse(analysis_request: AnalysisRequest, xai_service: XAiService = D
     try:
         # Call the analyse method of the XAI service
         return await xai_service.analyse(analysis_request)
+    except ExecutorSaturatedError as e:
+        # Inference backlog is full: fail fast and tell the client when to retry
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         # Catch any errors during analysis and return a 400 Bad Request response
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/reports/{doctor_id}", response_model=GetReportsResponse)
-async def get_reports(doctor_id: int = Path(...), patient_hashed_cf: str | None = Query(None), xai_service: XAiService = Depends(get_xai_service)) -> GetReportsResponse:
+async def get_reports(
+    doctor_id: int = Path(...), patient_hashed_cf: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=1000), offset: int = Query(0, ge=0),
+    xai_service: XAiService = Depends(get_xai_service)) -> GetReportsResponse:
     """
     Endpoint to retrieve analysis reports for a specific doctor.
     Supports optional filtering by patient's hashed fiscal code (CF).
+    Reports are summaries: the explanation is returned by /reports/{doctor_id}/{report_id}.
     """
     try:
         # Call the get_reports method of the XAI service
-        return await xai_service.get_reports(doctor_id=doctor_id, patient_hashed_cf=patient_hashed_cf)
+        return await xai_service.get_reports(
+            doctor_id=doctor_id, patient_hashed_cf=patient_hashed_cf, limit=limit, offset=offset
+        )
     except Exception as e:
         # Catch any errors and return a 400 Bad Request response
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{doctor_id}/{report_id}", response_model=GetReportResponse)
+async def get_report(doctor_id: int = Path(...), report_id: int = Path(...), xai_service: XAiService = Depends(get_xai_service)) -> GetReportResponse:
+    """
+    Endpoint to retrieve a single report of a doctor, including its explanation (e.g. heatmap).
+    """
+    try:
+        return await xai_service.get_report(doctor_id=doctor_id, report_id=report_id)
+    except Exception as e:
+        # Catch any errors (e.g., report not found) and return a 400 Bad Request response
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{doctor_id}/{report_id}/explanation", response_model=GetReportResponse)
+async def wait_explanation(
+    doctor_id: int = Path(...), report_id: int = Path(...), wait: float = Query(0, ge=0, le=25),
+    xai_service: XAiService = Depends(get_xai_service)) -> GetReportResponse:
+    """
+    Endpoint to retrieve a report once its deferred explanation is ready (long polling).
+    Answers as soon as the explanation status is no longer 'pending', or after 'wait' seconds.
+    """
+    try:
+        return await xai_service.wait_explanation(doctor_id=doctor_id, report_id=report_id, wait=wait)
+    except Exception as e:
+        # Catch any errors (e.g., report not found) and return a 400 Bad Request response
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{doctor_id}/{report_id}/artifact")
+async def get_report_artifact(
+    doctor_id: int = Path(...), report_id: int = Path(...), if_none_match: str | None = Header(None),
+    xai_service: XAiService = Depends(get_xai_service)) -> Response:
+    """
+    Endpoint to retrieve the binary explanation of a report (e.g. its heatmap image).
+    Artifacts are immutable and content-addressed: the ETag is the content hash, so
+    clients and the gateway can cache them and revalidate with If-None-Match (304).
+    """
+    try:
+        etag, media_type, content = await xai_service.get_report_artifact(
+            doctor_id=doctor_id, report_id=report_id, if_none_match=if_none_match
+        )
+    except Exception as e:
+        # Catch any errors (e.g., report or artifact not found) and return a 404 Not Found response
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # Private: the artifacts contain patient data and must not be stored by shared caches
+    headers = {"ETag": etag, "Cache-Control": ARTIFACT_CACHE_CONTROL}
+    if content is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+@router.post("/whatif", response_model=WhatIfResponse)
+async def what_if(what_if_request: WhatIfRequest, xai_service: XAiService = Depends(get_xai_service)) -> WhatIfResponse:
+    """
+    Endpoint to explore how the heart disease risk of a feature vector changes when some
+    features vary (what-if / counterfactual exploration). Nothing is saved.
+    """
+    try:
+        return await xai_service.what_if(what_if_request)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        # Catch any errors (e.g., unknown feature) and return a 400 Bad Request response
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/cohort/{doctor_id}")
+async def score_cohort(
+    request: Request, doctor_id: int = Path(...), top_k: int = Query(5, ge=1, le=18),
+    persist: bool = Query(True), xai_service: XAiService = Depends(get_xai_service)) -> StreamingResponse:
+    """
+    Endpoint to score a cohort of patients with the heart disease model.
+    The body is a matrix of HEART_FEATURES rows (application/json, text/csv or
+    application/vnd.apache.arrow.stream); the response streams one NDJSON line per patient
+    with its risk and top-k drivers, and the reports are bulk-saved unless 'persist' is false.
+    """
+    try:
+        stream = await xai_service.score_cohort(
+            doctor_id=doctor_id, body=await request.body(), content_type=request.headers.get("content-type"),
+            top_k=top_k, persist=persist
+        )
+    except UnsupportedCohortFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except CohortTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        # Malformed matrix (missing columns, wrong row length...): 400 Bad Request
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def metrics() -> MetricsResponse:
+    """
+    Endpoint exposing runtime metrics of the XAI service.
+    Reports per-model load time and memory footprint, micro-batching statistics,
+    queue-wait / execution times of the inference executors, the deferred explanations,
+    the LLM provider (calls, retries, tokens, latency) and the audit delivery queue.
+    """
+    return MetricsResponse(metrics={
+        "models": model_registry.stats(),
+        "batching": batcher_stats(),
+        "executors": executor_stats(),
+        "explanations": explanation_worker.stats(),
+        "llm": llm_stats(),
+        "audit": audit_client.stats()
+    })
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict
 # Import Pydantic components for data validation
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
@@ -13,6 +13,8 @@ class AnalysisRequest(BaseModel):
     strategy: str
     # ID of the data that has already been processed by the Data Processing service
     processed_data_id: int
+    # Return the report before its (expensive) explanation is computed; None uses the service default
+    defer_explanation: bool | None = None
 
 class ReportItem(BaseModel):
     """
@@ -22,12 +24,37 @@ class ReportItem(BaseModel):
     id: int
     doctor_id: int
     patient_hashed_cf: str
-    processed_data_id: int
+    # None for reports of a scored cohort (features sent directly, not processed data)
+    processed_data_id: int | None = None
     created_at: datetime
     strategy: str
     diagnosis: str
     confidence: float
     explanation: str
+    # Key of the binary explanation (e.g. heatmap), served by /reports/{doctor_id}/{report_id}/artifact
+    explanation_artifact: str | None = None
+    # 'ready', or 'pending'/'failed' for explanations computed in background
+    explanation_status: str = "ready"
+
+    # Configuration to allow creating instances from ORM objects
+    model_config = ConfigDict(from_attributes=True)
+
+class ReportSummary(BaseModel):
+    """
+    Schema representing a report without its explanation.
+    Used for report listings: the explanation (e.g. a base64 heatmap) is fetched per report.
+    """
+    id: int
+    doctor_id: int
+    patient_hashed_cf: str
+    # None for reports of a scored cohort (features sent directly, not processed data)
+    processed_data_id: int | None = None
+    created_at: datetime
+    strategy: str
+    diagnosis: str
+    confidence: float
+    explanation_artifact: str | None = None
+    explanation_status: str = "ready"
 
     # Configuration to allow creating instances from ORM objects
     model_config = ConfigDict(from_attributes=True)
@@ -44,4 +71,33 @@ class GetReportsResponse(BaseModel):
     Response returned when retrieving a list of reports.
     """
     message: str = "Report(s) retrieved successfully"
-    reports: List[ReportItem]
\ No newline at end of file
+    reports: List[ReportSummary]
+
+class GetReportResponse(BaseModel):
+    """
+    Response returned when retrieving a single report, including its explanation.
+    """
+    message: str = "Report retrieved successfully"
+    report: ReportItem
+
+class WhatIfRequest(BaseModel):
+    """
+    Schema for a what-if exploration of the heart disease model.
+    """
+    # Base feature vector (HEART_FEATURES order)
+    features: List[float]
+    # Values to try per feature (e.g. {"chol": [180, 200, 220]}); all combinations are evaluated
+    grid: Dict[str, List[float]] = Field(min_length=1, max_length=3)
+
+class WhatIfResponse(BaseModel):
+    """
+    Response of a what-if exploration: the risk of the base vector and the risk surface.
+    Nothing is saved in the database.
+    """
+    message: str = "What-if risk surface computed successfully"
+    base_risk: float
+    # Varied features and their values, one axis of the surface each
+    features: List[str]
+    axes: List[List[float]]
+    # Risk of each variant: nested lists indexed like the axes (risk[i][j] for two features)
+    risk: list
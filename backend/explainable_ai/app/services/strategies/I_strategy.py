@@ -5,10 +5,16 @@ class AnalysisStrategy(ABC):
     Interface defining the contract for all analysis strategies.
     Implements the Strategy Design Pattern to interchange AI models dynamically.
     """
+    # Whether the strategy consumes the processed data as raw bytes (e.g. .npy tensors)
+    # instead of the JSON representation returned by the Data Processing service
+    binary_input: bool = False
+
     @abstractmethod
     async def analyse(self, payload: dict) -> dict:
         """
         Abstract method to perform analysis.
         Must be implemented by concrete strategies (Text, Image, Numeric, Signal).
+        Returns the diagnosis, confidence and explanation; expensive explanations may instead be
+        returned as 'explanation_job', an async callable producing {"explanation", "artifact"}.
         """
         pass
\ No newline at end of file
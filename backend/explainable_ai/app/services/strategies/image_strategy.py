@@ -1,8 +1,7 @@
 import torch
 import os
 import io
-import base64
-import pickle
+import warnings
 import numpy as np
 from torchvision import models
 import torch.nn.functional as F
@@ -12,59 +11,162 @@ from pytorch_grad_cam import GradCAM
 from pytorch_grad_cam.utils.model_targets import ClassifierOutputTarget
 from pytorch_grad_cam.utils.image import show_cam_on_image
 from ...services.strategies.I_strategy import AnalysisStrategy
+from ...utils.model_registry import model_registry
+from ...utils.batching import get_batcher
+from ...utils.inference_executor import get_executor, ExecutorSaturatedError
+from ...utils.tensor_codec import decode_tensor
+from ...utils.class_activation_map import forward_with_features, class_activation_map
 from PIL import Image
 
+# Device shared by the image models (CUDA GPU or CPU)
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# ImageNet normalization statistics
+IMAGENET_MEAN = torch.tensor([0.485, 0.456, 0.406]).view(1, 3, 1, 1)
+IMAGENET_STD = torch.tensor([0.229, 0.224, 0.225]).view(1, 3, 1, 1)
+# (x / 255 - mean) / std folded into a single float32 multiply-add on uint8 pixels
+NORM_SCALE = (1.0 / (255.0 * IMAGENET_STD)).to(device)
+NORM_SHIFT = (-IMAGENET_MEAN / IMAGENET_STD).to(device)
+
+# Media types of the supported heatmap encodings
+HEATMAP_MEDIA_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def _load_chexnet():
+    """
+    Loads the CheXNet (DenseNet121) model for X-Rays.
+    """
+    try:
+        model = models.densenet121(pretrained=False)
+        model.classifier = torch.nn.Linear(model.classifier.in_features, len(Config.XRAY_LABELS))
+        if not os.path.exists(Config.CHEXNET_PATH):
+            return None
+        state = torch.load(Config.CHEXNET_PATH, map_location=device)
+        # Handle keys if they were saved with DataParallel ('module.' prefix)
+        new_state = {k.replace("module.", ""): v for k, v in state.items()}
+        model.load_state_dict(new_state)
+        return model.to(device).eval()
+    except Exception as e:
+        raise Exception(f"Error loading CheXNet: {e}")
+
+
+def _load_skinnet():
+    """
+    Loads the SkinNet (EfficientNet-B0) model for dermatology.
+    """
+    try:
+        model = models.efficientnet_b0(pretrained=False)
+        model.classifier[1] = torch.nn.Linear(model.classifier[1].in_features, len(Config.SKIN_LABELS))
+        if not os.path.exists(Config.EFFICIENTNET_PATH):
+            return None
+        model.load_state_dict(torch.load(Config.EFFICIENTNET_PATH, map_location=device))
+        return model.to(device).eval()
+    except Exception as e:
+        raise Exception(f"Error loading SkinNet: {e}")
+
+
+# Register the loaders: each model is loaded once per worker, on first use
+model_registry.register("chexnet", _load_chexnet)
+model_registry.register("skinnet", _load_skinnet)
+
+
+def _chexnet_forward(tensors):
+    """
+    Batched CheXNet forward pass: returns the per-image sigmoid probabilities.
+    """
+    with torch.no_grad():
+        return torch.sigmoid(model_registry.get("chexnet")(torch.cat(tensors)))
+
+
+def _skinnet_forward(tensors):
+    """
+    Batched SkinNet forward pass: returns the per-image softmax probabilities.
+    """
+    with torch.no_grad():
+        return F.softmax(model_registry.get("skinnet")(torch.cat(tensors)), dim=1)
+
+
+def _chexnet_forward_cam(tensors):
+    """
+    Batched CheXNet forward pass for the CAM explainer: returns, per image, the sigmoid
+    probabilities and the rectified final feature maps captured during the same pass.
+    """
+    chexnet = model_registry.get("chexnet")
+    with torch.no_grad():
+        logits, features = forward_with_features(chexnet, chexnet.features, torch.cat(tensors), F.relu)
+        return list(zip(torch.sigmoid(logits), features))
+
+
+def _skinnet_forward_cam(tensors):
+    """
+    Batched SkinNet forward pass for the CAM explainer: returns, per image, the softmax
+    probabilities and the final feature maps captured during the same pass.
+    """
+    skinnet = model_registry.get("skinnet")
+    with torch.no_grad():
+        logits, features = forward_with_features(skinnet, skinnet.features, torch.cat(tensors))
+        return list(zip(F.softmax(logits, dim=1), features))
+
 
 class ImageAnalysisStrategy(AnalysisStrategy):
     """
     Strategy for Image Analysis.
     Supports X-Rays (CheXNet) and Skin Lesions (EfficientNet).
-    Generates GradCAM heatmaps for explainability.
+    Generates GradCAM or CAM heatmaps for explainability (see Config.IMAGE_EXPLAINERS).
     """
+    # Image tensors are received as raw .npy bytes
+    binary_input = True
 
     def __init__(self):
-        # Determine device (CUDA GPU or CPU)
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.chexnet = None
-        self.skinnet = None
-        self.target_layers_chexnet = None
-        self.target_layers_skinnet = None
-        self._load_models()
+        self.device = device
 
-    def _load_models(self):
+    @property
+    def chexnet(self):
         """
-        Loads the CheXNet (DenseNet121) and SkinNet (EfficientNet-B0) models.
+        CheXNet model shared through the model registry.
         """
-        # Load CheXNet for X-Rays
-        try:
-            model = models.densenet121(pretrained=False)
-            model.classifier = torch.nn.Linear(model.classifier.in_features, len(Config.XRAY_LABELS))
-            if os.path.exists(Config.CHEXNET_PATH):
-                state = torch.load(Config.CHEXNET_PATH, map_location=self.device)
-                # Handle keys if they were saved with DataParallel ('module.' prefix)
-                new_state = {k.replace("module.", ""): v for k, v in state.items()}
-                model.load_state_dict(new_state)
-                model.to(self.device).eval()
-                self.chexnet = model
-                self.target_layers_chexnet = [self.chexnet.features[-1]]
-        except Exception as e:
-            raise Exception(f"Error loading CheXNet: {e}")
+        return model_registry.get("chexnet")
 
-        # Load SkinNet for dermatology
-        try:
-            model = models.efficientnet_b0(pretrained=False)
-            model.classifier[1] = torch.nn.Linear(model.classifier[1].in_features, len(Config.SKIN_LABELS))
-            if os.path.exists(Config.EFFICIENTNET_PATH):
-                model.load_state_dict(torch.load(Config.EFFICIENTNET_PATH, map_location=self.device))
-                model.to(self.device).eval()
-                self.skinnet = model
-                self.target_layers_skinnet = [self.skinnet.features[-1]]
-        except Exception as e:
-            raise Exception(f"Error loading SkinNet: {e}")
+    @property
+    def skinnet(self):
+        """
+        SkinNet model shared through the model registry.
+        """
+        return model_registry.get("skinnet")
+
+    def _rgb_image(self, tensor, pixels=None):
+        """
+        Returns the (H, W, C) float image in [0, 1] used for the heatmap overlay.
+        Uses the original uint8 pixels when available, otherwise denormalizes the tensor.
+        """
+        if pixels is not None:
+            return pixels[0].permute(1, 2, 0).cpu().numpy().astype(np.float32) / 255.0
 
-    def _generate_heatmap_b64(self, model, target_layers, tensor, target_class_idx):
+        img_denorm = tensor.cpu() * IMAGENET_STD + IMAGENET_MEAN
+        img_denorm = torch.clamp(img_denorm, 0, 1)
+        return img_denorm[0].permute(1, 2, 0).numpy()
+
+    def _encode_heatmap(self, grayscale_cam, tensor, pixels=None):
+        """
+        Overlays a [0, 1] activation map on the image and returns the encoded image
+        (JPEG or WebP, see Config.HEATMAP_FORMAT) with its media type.
+        """
+        # Image in [0, 1] for visualization
+        img_np = self._rgb_image(tensor, pixels)
+
+        # Create heatmap overlay
+        visualization = show_cam_on_image(img_np, grayscale_cam, use_rgb=True)
+        img_pil = Image.fromarray(visualization)
+
+        # Encode the binary image (stored in the artifact store, not in the report row)
+        buffered = io.BytesIO()
+        img_pil.save(buffered, format=Config.HEATMAP_FORMAT, quality=Config.HEATMAP_QUALITY)
+        return buffered.getvalue(), HEATMAP_MEDIA_TYPES[Config.HEATMAP_FORMAT]
+
+    def _generate_heatmap(self, model, target_layers, tensor, target_class_idx, pixels=None):
         """
-        Generates a GradCAM heatmap, overlays it on the image, and returns it as a base64 string.
+        Generates a GradCAM heatmap (extra forward and backward pass), overlays it on the image,
+        and returns the encoded image with its media type, or None.
         """
         if not Config.ENABLE_GRADCAM or not target_layers:
             return None
@@ -73,38 +175,79 @@ class ImageAnalysisStrategy(AnalysisStrategy):
             cam = GradCAM(model=model, target_layers=target_layers)
             targets = [ClassifierOutputTarget(target_class_idx)]
             grayscale_cam = cam(input_tensor=tensor, targets=targets)[0, :]
+            return self._encode_heatmap(grayscale_cam, tensor, pixels)
+        except Exception:
+            return None
 
-            # Denormalize image for visualization
-            img_tensor = tensor.squeeze(0).cpu()
-            mean = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1)
-            std = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1)
-            img_denorm = img_tensor * std + mean
-            img_denorm = torch.clamp(img_denorm, 0, 1)
-            img_np = img_denorm.permute(1, 2, 0).numpy()
-
-            # Create heatmap overlay
-            visualization = show_cam_on_image(img_np, grayscale_cam, use_rgb=True)
-            img_pil = Image.fromarray(visualization)
-
-            # Convert to Base64
-            buffered = io.BytesIO()
-            img_pil.save(buffered, format="JPEG")
-            return base64.b64encode(buffered.getvalue()).decode('utf-8')
+    def _generate_cam(self, head, features, tensor, target_class_idx, pixels=None):
+        """
+        Generates a CAM heatmap from the feature maps captured during the inference forward pass
+        and the weights of the linear head, overlays it on the image, and returns the encoded image
+        with its media type, or None.
+        """
+        if not Config.ENABLE_GRADCAM:
+            return None
+        try:
+            grayscale_cam = class_activation_map(features, head, target_class_idx, tuple(tensor.shape[-2:]))
+            return self._encode_heatmap(grayscale_cam, tensor, pixels)
         except Exception:
             return None
 
-    def _base64_to_tensor(self, tensor_b64):
+    def _npy_to_tensor(self, raw: bytes):
         """
-        Decodes a base64 string back into a PyTorch tensor.
+        Converts binary .npy bytes into a normalized PyTorch tensor, without copying the data on CPU.
+        Returns the tensor and, for uint8 payloads, the original pixels (otherwise None).
         """
         try:
-            raw = base64.b64decode(tensor_b64)
-            np_tensor = pickle.loads(raw)
+            np_tensor = decode_tensor(raw)
+            with warnings.catch_warnings():
+                # The tensor is a read-only view over the payload and is never modified in place
+                warnings.simplefilter("ignore", UserWarning)
+                tensor = torch.from_numpy(np_tensor)
 
-            return torch.from_numpy(np_tensor).float().to(self.device)
+            if tensor.dtype == torch.uint8:
+                # Raw pixels: apply the ImageNet normalization here, in float32
+                pixels = tensor.to(self.device)
+                return torch.addcmul(NORM_SHIFT, pixels.float(), NORM_SCALE), pixels
+
+            # Legacy payloads are already normalized
+            return tensor.float().to(self.device), None
 
         except Exception as e:
-            raise Exception(f"Failed to decode base64 tensor: {str(e)}")
+            raise Exception(f"Failed to decode tensor: {str(e)}")
+
+    def _result(self, diagnosis: str, confidence: float, explain, *args) -> dict:
+        """
+        Builds the analysis result. The heatmap is not computed here: 'explanation_job'
+        runs explain(*args) on the image executor when awaited, so the caller can run it
+        inline or defer it to a background worker and return the diagnosis right away.
+        """
+        method = "CAM" if explain == self._generate_cam else "Grad-CAM"
+
+        async def explanation_job() -> dict:
+            heatmap = await get_executor("image").run(explain, *args)
+            if heatmap is None:
+                return {"explanation": "Heatmap not available"}
+            # Binary artifact: the report only keeps a short description and the artifact reference
+            return {
+                "explanation": f"{method} heatmap of the regions supporting '{diagnosis}'",
+                "artifact": heatmap
+            }
+
+        return {"diagnosis": diagnosis, "confidence": round(confidence, 4), "explanation_job": explanation_job}
+
+    async def _predict(self, name: str, forward, forward_cam, img_type: str, tensor, executor):
+        """
+        Runs the (micro-batched) inference of an image.
+        With the CAM explainer, the final feature maps are captured during the same forward pass.
+        Returns the class probabilities and the feature maps (None with GradCAM).
+        """
+        if Config.IMAGE_EXPLAINERS.get(img_type) == "cam":
+            batcher = get_batcher(f"{name}_cam", forward_cam, Config.BATCH_MAX_SIZE, Config.BATCH_WINDOW_MS, executor)
+            return await batcher.submit(tensor)
+
+        batcher = get_batcher(name, forward, Config.BATCH_MAX_SIZE, Config.BATCH_WINDOW_MS, executor)
+        return await batcher.submit(tensor), None
 
     async def analyse(self, payload: dict) -> dict:
         """
@@ -113,46 +256,47 @@ class ImageAnalysisStrategy(AnalysisStrategy):
         """
         try:
             img_type = payload.get("data").get("type")
-            b64tensor = payload.get("data").get("data")
+            raw_tensor = payload.get("data").get("data")
 
-            if not b64tensor:
-                return {"error": "No base64 tensor provided"}
+            if not raw_tensor:
+                return {"error": "No tensor provided"}
 
-            tensor = self._base64_to_tensor(b64tensor)
+            tensor, pixels = self._npy_to_tensor(raw_tensor)
+            # Forward passes (and later GradCAM) run on the image inference executor, off the event loop
+            executor = get_executor("image")
 
-            # Process X-Ray images
-            if img_type == "img_rx" and self.chexnet:
-                with torch.no_grad():
-                    out = self.chexnet(tensor)
-                    probs = torch.sigmoid(out)[0]
+            # Process X-Ray images (only CheXNet is loaded for this type)
+            chexnet = self.chexnet if img_type == "img_rx" else None
+            if chexnet:
+                # Concurrent X-Rays share a single batched forward pass
+                probs, features = await self._predict("chexnet", _chexnet_forward, _chexnet_forward_cam, img_type, tensor, executor)
 
                 top_prob, top_idx = torch.topk(probs, 1)
                 top_pathology = Config.XRAY_LABELS[top_idx.item()]
-                heatmap = self._generate_heatmap_b64(self.chexnet, self.target_layers_chexnet, tensor, top_idx.item())
+                if features is not None:
+                    return self._result(top_pathology, top_prob.item(), self._generate_cam,
+                                        chexnet.classifier, features, tensor, top_idx.item(), pixels)
+                return self._result(top_pathology, top_prob.item(), self._generate_heatmap,
+                                    chexnet, [chexnet.features[-1]], tensor, top_idx.item(), pixels)
 
-                return {
-                    "diagnosis": top_pathology,
-                    "confidence": round(top_prob.item(), 4),
-                    "explanation": heatmap
-                }
-
-            # Process Skin images
-            elif img_type == "img_skin" and self.skinnet:
-                with torch.no_grad():
-                    out = self.skinnet(tensor)
-                    probs = F.softmax(out[0], dim=0)
+            # Process Skin images (only SkinNet is loaded for this type)
+            skinnet = self.skinnet if img_type == "img_skin" else None
+            if skinnet:
+                # Concurrent skin images share a single batched forward pass
+                probs, features = await self._predict("skinnet", _skinnet_forward, _skinnet_forward_cam, img_type, tensor, executor)
 
                 conf, idx = torch.topk(probs, 1)
                 diagnosis = Config.SKIN_LABELS[idx.item()]
-                heatmap = self._generate_heatmap_b64(self.skinnet, self.target_layers_skinnet, tensor, idx.item())
-
-                return {
-                    "diagnosis": diagnosis,
-                    "confidence": round(conf.item(), 4),
-                    "explanation": heatmap
-                }
+                if features is not None:
+                    return self._result(diagnosis, conf.item(), self._generate_cam,
+                                        skinnet.classifier[1], features, tensor, idx.item(), pixels)
+                return self._result(diagnosis, conf.item(), self._generate_heatmap,
+                                    skinnet, [skinnet.features[-1]], tensor, idx.item(), pixels)
 
             return {"error": f"No model found for type '{img_type}'"}
 
+        except ExecutorSaturatedError:
+            # Let the router answer 503 instead of storing an error report
+            raise
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
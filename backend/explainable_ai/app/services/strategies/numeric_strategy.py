@@ -1,37 +1,250 @@
 import json
 import joblib
-import pandas as pd
 import os
+import numpy as np
+import xgboost as xgb
 from ...services.strategies.I_strategy import AnalysisStrategy
 from ...utils.ai_models_config import Config
+from ...utils.model_registry import model_registry
+from ...utils.inference_executor import get_executor, ExecutorSaturatedError
+
+
+def _load_heart_model():
+    """
+    Loads the XGBoost heart disease model from disk.
+    """
+    if not os.path.exists(Config.XGBOOST_PATH):
+        return None
+    try:
+        return joblib.load(Config.XGBOOST_PATH)
+    except Exception:
+        return None
+
+
+def _load_heart_explainer():
+    """
+    Builds the SHAP TreeExplainer on top of the shared XGBoost model
+    (only used by the "shap" numeric explainer).
+    """
+    model = model_registry.get("xgboost_heart")
+    if model is None:
+        return None
+    try:
+        import shap
+        # Initialize SHAP TreeExplainer for the model
+        return shap.TreeExplainer(model)
+    except Exception:
+        return None
+
+
+# Register the loaders: each model is loaded once per worker, on first use
+model_registry.register("xgboost_heart", _load_heart_model)
+model_registry.register("shap_heart", _load_heart_explainer)
+
+
+def native_contributions(booster: xgb.Booster, rows: np.ndarray,
+                         approximate: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the risk probabilities and the per-feature contributions of a float32 matrix
+    (one row per patient) with XGBoost's built-in TreeSHAP (pred_contribs), in a single
+    prediction call. Contributions are in log-odds, like shap.TreeExplainer; with the bias
+    term (last column) they add up to the margin, whose sigmoid is the predicted probability.
+    With 'approximate', the per-path (Saabas) attribution is used instead of exact TreeSHAP:
+    same probabilities, roughly 15x faster, slightly different ranking of the weaker features.
+    """
+    dmatrix = xgb.DMatrix(rows, feature_names=booster.feature_names)
+    contribs = booster.predict(dmatrix, pred_contribs=True, approx_contribs=approximate)
+
+    if contribs.ndim == 3:
+        # Multi-class objective: (rows, classes, features + bias), the risk is the positive class
+        margins = contribs.sum(axis=2)
+        probs = np.exp(margins - margins.max(axis=1, keepdims=True))
+        return probs[:, 1] / probs.sum(axis=1), contribs[:, 1, :-1]
+
+    return 1.0 / (1.0 + np.exp(-contribs.sum(axis=1))), contribs[:, :-1]
+
+
+def ranked_explanation(row: np.ndarray, impacts: np.ndarray) -> list:
+    """
+    Maps the features to their impact values, sorted by impact magnitude.
+    """
+    explanation = []
+    for i in np.argsort(-np.abs(impacts), kind="stable"):
+        impact = float(impacts[i])
+        explanation.append({
+            "Feature": Config.HEART_FEATURES[i],
+            "Value": float(row[i]),
+            "Impact_score": round(impact, 4),
+            "Effect": "Increases Risk" if impact > 0 else "Decreases Risk"
+        })
+    return explanation
+
+
+def top_drivers(contribs: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns, per row, the indices of the k features with the largest impact magnitude, sorted.
+    """
+    k = max(1, min(k, contribs.shape[1]))
+    magnitude = np.abs(contribs)
+    candidates = np.argpartition(-magnitude, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(magnitude, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+# JSON fragments of the explanation entries (same keys as ranked_explanation)
+_FEATURE_JSON = [json.dumps(feature) for feature in Config.HEART_FEATURES]
+# (float32 values are printed with their own precision, impacts rounded to 4 decimals)
+_DRIVER_TEMPLATE = '{"Feature": %s, "Value": %.7g, "Impact_score": %.4f, "Effect": "%s"}'
+# Missing (NaN) values are serialized as null
+_MISSING_DRIVER_TEMPLATE = '{"Feature": %s, "Value": %s, "Impact_score": %.4f, "Effect": "%s"}'
+
+
+def drivers_json(matrix: np.ndarray, contribs: np.ndarray, drivers: np.ndarray) -> list:
+    """
+    Serializes, per row, the explanation entries of its driver features (a JSON list).
+    Values and impacts are gathered for all rows at once: the loop only formats Python floats.
+    """
+    values = np.take_along_axis(matrix, drivers, axis=1)
+    missing = np.isnan(values).any(axis=1).tolist()
+    impacts = np.take_along_axis(contribs, drivers, axis=1)
+    effects = np.where(impacts > 0, "Increases Risk", "Decreases Risk").tolist()
+
+    explanations = []
+    for row in zip(drivers.tolist(), values.tolist(), impacts.tolist(), effects, missing):
+        entries = zip(*row[:4])
+        if row[4]:
+            explanations.append("[" + ", ".join(
+                _MISSING_DRIVER_TEMPLATE % (_FEATURE_JSON[i], "null" if v != v else "%.7g" % v, impact, effect)
+                for i, v, impact, effect in entries
+            ) + "]")
+        else:
+            explanations.append("[" + ", ".join(
+                _DRIVER_TEMPLATE % (_FEATURE_JSON[i], v, impact, effect) for i, v, impact, effect in entries
+            ) + "]")
+    return explanations
+
+
+def cohort_ndjson(patients: list, report_ids: list, results: list) -> bytes:
+    """
+    Serializes scored patients as NDJSON lines: patient, report ID, diagnosis, risk and drivers.
+    """
+    return "".join(
+        f'{{"patient_hashed_cf": {json.dumps(patient)}, "report_id": {json.dumps(report_id)}, '
+        f'"diagnosis": "{diagnosis}", "risk": {risk!r}, "drivers": {drivers}}}\n'
+        for patient, report_id, (diagnosis, risk, drivers) in zip(patients, report_ids, results)
+    ).encode()
+
+
+def id_ranges(report_ids: list) -> str:
+    """
+    Formats report IDs as compact ranges (e.g. "101-200, 305"): a bulk insert returns consecutive IDs.
+    """
+    ranges = []
+    for report_id in sorted(report_ids):
+        if ranges and report_id == ranges[-1][1] + 1:
+            ranges[-1][1] = report_id
+        else:
+            ranges.append([report_id, report_id])
+    return ", ".join(f"{first}-{last}" if first != last else f"{first}" for first, last in ranges)
+
 
 class NumericAnalysisStrategy(AnalysisStrategy):
     """
     Strategy for Numeric Analysis (Tabular data).
-    Uses XGBoost for heart disease prediction and SHAP for feature importance explanation.
+    Uses XGBoost for heart disease prediction and TreeSHAP values for feature importance explanation,
+    computed by XGBoost itself ("native", default) or by the shap package ("shap").
     """
     def __init__(self):
-        self.model = None
-        self.explainer = None
-        self._load_model()
+        # Models are shared through the registry instead of being reloaded per request
+        self.model = model_registry.get("xgboost_heart")
+        # The shap package (and pandas) are only loaded for the "shap" explainer
+        self.explainer = model_registry.get("shap_heart") if Config.NUMERIC_EXPLAINER == "shap" else None
 
-    def _load_model(self):
+    def _explain_shap(self, row: np.ndarray) -> tuple[float, np.ndarray]:
         """
-        Loads the XGBoost model and the SHAP explainer from disk.
+        Risk probability and SHAP values computed through a one-row DataFrame and shap.TreeExplainer.
         """
-        if os.path.exists(Config.XGBOOST_PATH):
-            try:
-                self.model = joblib.load(Config.XGBOOST_PATH)
-                try:
-                    import shap
-                    # Initialize SHAP TreeExplainer for the model
-                    self.explainer = shap.TreeExplainer(self.model)
-                except Exception:
-                    self.explainer = None
-            except Exception:
-                self.model = None
+        if not self.explainer:
+            raise Exception("SHAP explanation not available")
+        import pandas as pd
+        input_df = pd.DataFrame([row], columns=Config.HEART_FEATURES)
+
+        # Predict probability of heart disease
+        risk_prob = float(self.model.predict_proba(input_df)[0][1])
+
+        # Calculate SHAP values to explain the prediction
+        shap_values = self.explainer.shap_values(input_df)
+
+        # Handle different SHAP output formats (binary classification)
+        if isinstance(shap_values, list):
+            return risk_prob, shap_values[1][0]
+        return risk_prob, shap_values[0]
+
+    def _predict(self, features: list) -> dict:
+        """
+        Blocking prediction and explanation (runs on the numeric inference executor).
+        """
+        row = np.asarray(features, dtype=np.float32)
+        if row.shape != (len(Config.HEART_FEATURES),):
+            raise Exception(f"Expected {len(Config.HEART_FEATURES)} features, got {row.size}")
+
+        if Config.NUMERIC_EXPLAINER == "shap":
+            risk_prob, impacts = self._explain_shap(row)
         else:
-            self.model = None
+            # The float32 row goes straight to the booster: no DataFrame, no shap import
+            probs, contribs = native_contributions(self.model.get_booster(), row[None, :])
+            risk_prob, impacts = float(probs[0]), contribs[0]
+
+        return {
+            "diagnosis": "High" if risk_prob > 0.5 else "Low",
+            "confidence": risk_prob,
+            "explanation": json.dumps(ranked_explanation(row, impacts))
+        }
+
+    def score_cohort(self, matrix: np.ndarray, top_k: int, approximate: bool = False) -> list:
+        """
+        Blocking vectorized scoring of a cohort (runs on the numeric inference executor):
+        one prediction call for the whole (patients, features) matrix gives every probability
+        and contribution. Returns, per patient, (diagnosis, risk, top-k drivers as JSON).
+        Contributions are exact TreeSHAP unless 'approximate' (per-path attribution).
+        """
+        probs, contribs = native_contributions(self.model.get_booster(), matrix, approximate=approximate)
+        explanations = drivers_json(matrix, contribs, top_drivers(contribs, top_k))
+        return [
+            ("High" if prob > 0.5 else "Low", prob, explanation)
+            for prob, explanation in zip(probs.tolist(), explanations)
+        ]
+
+    def risk_surface(self, features: list, grid: dict) -> tuple[float, np.ndarray]:
+        """
+        Blocking what-if evaluation (runs on the numeric inference executor).
+        'grid' maps feature names to the values to try: every combination of them is applied to
+        the base feature vector and all the variants are scored with one prediction call.
+        Returns the base risk and the risk of each variant, shaped like the grid.
+        """
+        row = np.asarray(features, dtype=np.float32)
+        if row.shape != (len(Config.HEART_FEATURES),):
+            raise ValueError(f"Expected {len(Config.HEART_FEATURES)} features, got {row.size}")
+        unknown = [feature for feature in grid if feature not in Config.HEART_FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown feature(s): {', '.join(unknown)}")
+
+        axes = [np.asarray(values, dtype=np.float32) for values in grid.values()]
+        shape = tuple(len(axis) for axis in axes)
+        variants = int(np.prod(shape))
+        if variants > Config.WHATIF_MAX_VARIANTS:
+            raise ValueError(f"{variants} variants exceed the limit of {Config.WHATIF_MAX_VARIANTS}")
+
+        # Row 0 is the base vector, followed by the variants in grid order
+        matrix = np.tile(row, (variants + 1, 1))
+        for feature, values in zip(grid, np.meshgrid(*axes, indexing="ij")):
+            matrix[1:, Config.HEART_FEATURES.index(feature)] = values.ravel()
+
+        # Probabilities only: no contributions, no DMatrix
+        probs = self.model.get_booster().inplace_predict(matrix)
+        if probs.ndim == 2:
+            probs = probs[:, 1]
+        return float(probs[0]), probs[1:].reshape(shape)
 
     async def analyse(self, payload: dict) -> dict:
         """
@@ -46,46 +259,12 @@ class NumericAnalysisStrategy(AnalysisStrategy):
             if not features:
                 return {"error": "No data provided"}
 
-            # Parse input JSON and create DataFrame with correct column names
+            # Parse input JSON and run the model off the event loop
             features = json.loads(features)
-            input_df = pd.DataFrame([features], columns=Config.HEART_FEATURES)
-
-            # Predict probability of heart disease
-            probs = self.model.predict_proba(input_df)[0]
-            risk_prob = probs[1]
-
-            explanation = []
-            if self.explainer:
-                try:
-                    # Calculate SHAP values to explain the prediction
-                    shap_values = self.explainer.shap_values(input_df)
-
-                    # Handle different SHAP output formats (binary classification)
-                    if isinstance(shap_values, list):
-                        vals = shap_values[1][0]
-                    else:
-                        vals = shap_values[0]
-
-                    # Map features to their SHAP impact values
-                    for feature, impact, value in zip(Config.HEART_FEATURES, vals, input_df.iloc[0]):
-                            explanation.append({
-                                "Feature": feature,
-                                "Value": float(value),
-                                "Impact_score": round(float(impact), 4),
-                                "Effect": "Increases Risk" if impact > 0 else "Decreases Risk"
-                            })
-                    # Sort factors by impact magnitude
-                    explanation.sort(key=lambda x: abs(x['impact_score']), reverse=True)
-                except Exception:
-                    pass
-            else:
-                raise Exception("SHAP explanation not available")
-
-            return {
-                "diagnosis": "High" if risk_prob > 0.5 else "Low",
-                "confidence": risk_prob,
-                "explanation": json.dumps(explanation)
-            }
+            return await get_executor("numeric").run(self._predict, features)
 
+        except ExecutorSaturatedError:
+            # Let the router answer 503 instead of storing an error report
+            raise
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
@@ -1,54 +1,63 @@
-import google.generativeai as genai
 from ...services.strategies.I_strategy import AnalysisStrategy
 from ...utils.ai_models_config import Config
+from ...utils.ecg_features import extract_ecg_features, rule_based_diagnosis
+from ...utils.inference_executor import get_executor, ExecutorSaturatedError
+from ...utils.llm.I_llm_provider import LLMUnavailableError
+from ...utils.llm.providers import get_llm
+from ...utils.llm.managed_provider import parse_json_response
+from ...utils.llm.response_cache import llm_cache_key
 import json
 import numpy as np
 
+# Version of the analysis prompt: bump it when the template changes, to invalidate cached answers
+PROMPT_VERSION = "signal-analysis-v2"
+
+
+def _signal_features(signal_list_str: str, fs: float) -> dict:
+    """
+    Parses the processed signal and extracts its ECG features.
+    Runs on the signal executor: parsing and filtering grow with the recording length.
+    """
+    signal_array = np.array(json.loads(signal_list_str), dtype=np.float32)
+    if signal_array.size == 0:
+        raise ValueError("Signal data not provided")
+    return extract_ecg_features(signal_array, fs)
+
+
 class SignalAnalysisStrategy(AnalysisStrategy):
     """
     Strategy for Signal Analysis (e.g., ECG).
-    Currently relies on Generative AI (Gemini) to analyze signal statistics and samples.
+    Extracts the ECG features locally (R peaks, RR intervals, HRV, QRS width, spectral power)
+    and has the Generative AI (Gemini) interpret their summary; without an LLM, the features
+    are interpreted by clinical rules.
     """
     def __init__(self):
-        self.model = None
-
-        # Configure Gemini model if API key is available
-        if Config.GOOGLE_API_KEY:
-            genai.configure(api_key=Config.GOOGLE_API_KEY)
-            self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
+        # Shared asynchronous LLM provider (None if no LLM is configured)
+        self.model = get_llm() if Config.SIGNAL_ANALYSIS == "llm" else None
 
     async def analyse(self, payload: dict) -> dict:
         """
-        Analyzes ECG signal data using GenAI.
-        Computes basic stats (min, max, mean) and sends a prompt to the LLM.
+        Analyzes ECG signal data.
+        Computes the feature summary off the event loop and sends it to the LLM (not the samples),
+        falling back to the rule-based interpretation when the LLM is missing or unavailable.
         """
-        if not self.model:
-            return {"error": "Gemini model not available"}
-
         try:
             signal_list_str = payload.get("data").get("data")
             if not signal_list_str:
                 return {"error": "Signal data not provided"}
 
-            # Parse signal data into a NumPy array
-            signal_data = json.loads(signal_list_str)
-            signal_array = np.array(signal_data, dtype=np.float32)
-
-            # Compute statistical features to help the LLM
-            stats = {
-                "min": float(np.min(signal_array)),
-                "max": float(np.max(signal_array)),
-                "mean": float(np.mean(signal_array))
-            }
-
-            sample = signal_array.tolist()
+            features = await get_executor("signal").run(_signal_features, signal_list_str, Config.ECG_SAMPLING_RATE)
+            if not self.model:
+                return rule_based_diagnosis(features)
 
             # Construct the prompt for the AI model
             prompt = f"""
-            Analyze this ECG signal.
-            Take into account only numerical samples, ignore any other text. Also, ensure the final response is in English.
-            Statistics: {json.dumps(stats)}
-            Data: {json.dumps(sample)}
+            Analyze this ECG recording, summarized by the features extracted from its samples:
+            heart rate and RR intervals, heart rate variability (SDNN, RMSSD, pNN50 and, on long
+            recordings, LF/HF power), median QRS width, and the spectral power distribution
+            (baseline wander, QRS band and noise above 40 Hz, as fractions of the total power).
+            Ensure the final response is in English.
+            Features: {json.dumps(features)}
 
             Identify anomalies, arrhythmias, or irregularities.
 
@@ -60,10 +69,15 @@ class SignalAnalysisStrategy(AnalysisStrategy):
             }}
             """
 
-            # Generate content and parse JSON response
-            response = self.model.generate_content(prompt)
-            cleaned_text = response.text.replace("```json", "").replace("```", "").strip()
-            result = json.loads(cleaned_text)
+            # Generate content (without blocking the event loop) and parse the JSON response
+            # (recordings with the same features are answered from the cache)
+            cache_key = llm_cache_key(self.model.model_name, PROMPT_VERSION, features)
+            try:
+                response = await self.model.generate(prompt, cache_key=cache_key, validate=parse_json_response)
+            except LLMUnavailableError as e:
+                print(f"Signal analysis falls back to rules: {e}")
+                return rule_based_diagnosis(features)
+            result = parse_json_response(response["text"])
 
             return {
                 "diagnosis": result.get("diagnosis", "N/A"),
@@ -71,5 +85,8 @@ class SignalAnalysisStrategy(AnalysisStrategy):
                 "explanation": result.get("explanation", "N/A")
             }
 
+        except ExecutorSaturatedError:
+            # Let the router answer 503 instead of storing an error report
+            raise
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
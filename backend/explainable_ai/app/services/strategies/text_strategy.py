@@ -5,39 +5,55 @@ import os
 # Import the strategy interface and configuration
 from ..strategies.I_strategy import AnalysisStrategy
 from ...utils.ai_models_config import Config
-import google.generativeai as genai
-import json
+from ...utils.model_registry import model_registry
+from ...utils.inference_executor import get_executor, ExecutorSaturatedError
+from ...utils.llm.providers import get_llm
+from ...utils.llm.managed_provider import parse_json_response
+from ...utils.llm.response_cache import llm_cache_key
+
+# Version of the explanation prompt: bump it when the template changes, to invalidate cached answers
+PROMPT_VERSION = "text-explanation-v1"
+
+
+def _load_clinicalbert():
+    """
+    Loads the local ClinicalBERT model as a text-classification pipeline.
+    """
+    if not os.path.exists(Config.CLINICALBERT_PATH):
+        return None
+    try:
+        tokenizer = AutoTokenizer.from_pretrained(Config.CLINICALBERT_PATH)
+        model = AutoModelForSequenceClassification.from_pretrained(Config.CLINICALBERT_PATH)
+        # Initialize pipeline on CPU (device=-1)
+        return pipeline("text-classification", model=model, tokenizer=tokenizer, device=-1)
+    except Exception as e:
+        raise Exception(e)
+
+
+# Register the loader: the pipeline is built once per worker, on first use
+model_registry.register("clinicalbert", _load_clinicalbert)
 
 
 class TextAnalysisStrategy(AnalysisStrategy):
     """
     Strategy for Text Analysis (NLP).
-    Uses a local BERT model for classification and Google Gemini for explanation.
+    Uses a local BERT model for classification and an LLM (Google Gemini) for explanation.
     """
 
     def __init__(self):
         self.pipeline = None
-        self.gemini = None
+        self.llm = None
         self._load_resources()
 
     def _load_resources(self):
         """
-        Loads the ClinicalBERT model and configures the Gemini API.
+        Retrieves the shared ClinicalBERT pipeline and the shared LLM provider.
         """
-        # Load local BERT model if path exists
-        if os.path.exists(Config.CLINICALBERT_PATH):
-            try:
-                tokenizer = AutoTokenizer.from_pretrained(Config.CLINICALBERT_PATH)
-                model = AutoModelForSequenceClassification.from_pretrained(Config.CLINICALBERT_PATH)
-                # Initialize pipeline on CPU (device=-1)
-                self.pipeline = pipeline("text-classification", model=model, tokenizer=tokenizer, device=-1)
-            except Exception as e:
-                raise Exception(e)
-
-        # Configure Google Gemini if API key is present
-        if Config.GOOGLE_API_KEY:
-            genai.configure(api_key=Config.GOOGLE_API_KEY)
-            self.gemini = genai.GenerativeModel('gemini-2.5-flash-lite')
+        # Shared BERT pipeline from the model registry
+        self.pipeline = model_registry.get("clinicalbert")
+
+        # Asynchronous LLM provider (None if no LLM is configured)
+        self.llm = get_llm()
 
     async def analyse(self, payload: dict) -> dict:
         """
@@ -52,8 +68,8 @@ class TextAnalysisStrategy(AnalysisStrategy):
             if not text:
                 return {"error": "No processed text provided"}
 
-            # Perform classification using BERT
-            output = self.pipeline(text)
+            # Perform classification using BERT, off the event loop
+            output = await get_executor("text").run(self.pipeline, text)
             top_result = output[0] if isinstance(output, list) else output
 
             macro_category = top_result['label']
@@ -69,8 +85,8 @@ class TextAnalysisStrategy(AnalysisStrategy):
             specific_diagnosis = ""
             explanation = ""
 
-            # Use Gemini to generate a specific diagnosis and natural language explanation
-            if self.gemini:
+            # Use the LLM to generate a specific diagnosis and natural language explanation
+            if self.llm:
                 try:
                     prompt = f"""
                     Act as an expert doctor.
@@ -88,10 +104,13 @@ class TextAnalysisStrategy(AnalysisStrategy):
                         "explanation": "..."
                     }}
                     """
-                    response = self.gemini.generate_content(prompt)
-                    # Clean the response to ensure valid JSON
-                    cleaned_text = response.text.replace("```json", "").replace("```", "").strip()
-                    ai_data = json.loads(cleaned_text)
+                    # Awaited without blocking the event loop, within the provider deadline;
+                    # the same note with the same classification is answered from the cache
+                    cache_key = llm_cache_key(
+                        self.llm.model_name, PROMPT_VERSION, text, macro_category, f"{confidence:.2%}"
+                    )
+                    response = await self.llm.generate(prompt, cache_key=cache_key, validate=parse_json_response)
+                    ai_data = parse_json_response(response["text"])
 
                     specific_diagnosis = ai_data.get("specific_diagnosis", "N/A")
                     explanation = ai_data.get("explanation", "N/A")
@@ -107,5 +126,8 @@ class TextAnalysisStrategy(AnalysisStrategy):
 
             return result
 
+        except ExecutorSaturatedError:
+            # Let the router answer 503 instead of storing an error report
+            raise
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
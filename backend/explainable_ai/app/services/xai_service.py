@@ -1,16 +1,24 @@
+import asyncio
+import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 # Import domain models, repositories, and specific strategies
 from ..models.report_model import Report
 from ..repositories.I_report_repository import IReportRepository
-from ..services.strategies.numeric_strategy import NumericAnalysisStrategy
+from ..services.strategies.numeric_strategy import NumericAnalysisStrategy, cohort_ndjson, id_ranges
 from ..services.strategies.image_strategy import ImageAnalysisStrategy
 from ..services.strategies.text_strategy import TextAnalysisStrategy
 from ..services.strategies.signal_strategy import SignalAnalysisStrategy
 # Import schemas for request/response handling
-from ..schemas.analysis_schema import AnalysisRequest, AnalysisResponse, ReportItem, GetReportsResponse
+from ..schemas.analysis_schema import AnalysisRequest, AnalysisResponse, ReportItem, ReportSummary, \
+    GetReportsResponse, GetReportResponse, WhatIfRequest, WhatIfResponse
 # Import utilities for HTTP requests and Observer pattern
 from ..utils.http_client import HttpClient
+from ..utils.artifact_store import IArtifactStore, artifact_media_type, artifact_etag
+from ..utils.explanation_worker import ExplanationWorker, EXPLANATION_READY, EXPLANATION_PENDING
+from ..utils.cohort_parser import parse_cohort, CohortTooLargeError
+from ..utils.inference_executor import get_executor, ExecutorSaturatedError
+from ..utils.ai_models_config import Config
 from ..utils.logging.I_observer import IObserver
 
 # Registry mapping strategy names to their concrete class implementations
@@ -28,9 +36,14 @@ class XAiService:
     It fetches processed data, selects the appropriate AI strategy,
     saves the results, and notifies observers (Audit).
     """
-    def __init__(self, reports_repository: IReportRepository, http_client: HttpClient):
+    def __init__(self, reports_repository: IReportRepository, http_client: HttpClient,
+                 artifact_store: IArtifactStore | None = None, explanation_worker: ExplanationWorker | None = None):
         # Inject repository and HTTP client dependencies
         self.reports_repository = reports_repository
+        # Store of the binary explanation artifacts (e.g. heatmaps), referenced by the reports
+        self.artifact_store = artifact_store
+        # Background worker computing deferred explanations (e.g. GradCAM heatmaps)
+        self.explanation_worker = explanation_worker
         # URL for the Data Processing service to fetch prepared data
         self.data_url = os.getenv("DATA_PROCESSING_URL")
         self.http = http_client
@@ -61,28 +74,33 @@ class XAiService:
     async def analyse(self, analysis_request: AnalysisRequest) -> AnalysisResponse:
         """
         Performs the full analysis workflow:
-        1. Retrieve processed data from Data Processing service.
-        2. Select the correct AI strategy.
+        1. Select the correct AI strategy.
+        2. Retrieve processed data from Data Processing service.
         3. Run inference.
-        4. Save the report.
+        4. Compute the explanation (or defer it to the background worker) and save the report.
         """
-        # Step 1: Fetch the pre-processed data using the ID provided in the request
-        processed_data = await self.http.request(
-            "GET",
-            f"{self.data_url}/retrieve/{analysis_request.processed_data_id}",
-        )
+        # Step 1: Select the strategy class based on the requested strategy type
+        strategy_class = strategies.get(analysis_request.strategy)
+
+        if not strategy_class:
+            raise Exception(f"Strategy '{analysis_request.strategy}' not found")
+
+        # Step 2: Fetch the pre-processed data using the ID provided in the request
+        retrieve_url = f"{self.data_url}/retrieve/{analysis_request.processed_data_id}"
+        if strategy_class.binary_input:
+            # Binary tensors are transferred as raw bytes, without JSON/base64 encoding
+            raw = await self.http.request_bytes(
+                "GET", retrieve_url, headers={"Accept": "application/octet-stream"}
+            )
+            processed_data = {"data": {"type": analysis_request.strategy, "data": raw}}
+        else:
+            processed_data = await self.http.request("GET", retrieve_url)
 
         if not processed_data:
             raise Exception(
                 f"Processed data {analysis_request.processed_data_id} not found"
             )
 
-        # Step 2: Select the strategy class based on the requested strategy type
-        strategy_class = strategies.get(analysis_request.strategy)
-
-        if not strategy_class:
-            raise Exception(f"Strategy '{analysis_request.strategy}' not found")
-
         # Instantiate the selected strategy
         strategy_instance = strategy_class()
 
@@ -100,9 +118,23 @@ class XAiService:
             explanation=result.get("explanation", "N/A")
         )
 
-        # Step 4: Save the report to the database
+        # Step 4: Compute the explanation now, or defer it to the background worker
+        explanation_job = result.get("explanation_job")
+        deferred = explanation_job is not None and self._defer_explanation(analysis_request)
+        if deferred:
+            report.explanation = "Explanation being generated"
+            report.explanation_status = EXPLANATION_PENDING
+        elif explanation_job is not None:
+            for column, value in (await self._explain(explanation_job)).items():
+                setattr(report, column, value)
+
+        # Save the report to the database
         report = await self.reports_repository.save(report)
 
+        if deferred:
+            # The job only uses the artifact store: it outlives this request and its session
+            self.explanation_worker.submit(report.id, lambda: self._explain(explanation_job))
+
         # Notify observers (Audit) about the completed analysis
         await self.notify({
             "service": "explainable_ai",
@@ -113,17 +145,43 @@ class XAiService:
 
         return AnalysisResponse(report=ReportItem.model_validate(report))
 
-    async def get_reports(self, doctor_id: int, patient_hashed_cf: str | None = None) -> GetReportsResponse:
+    def _defer_explanation(self, analysis_request: AnalysisRequest) -> bool:
+        """
+        Whether the explanation job is deferred: requested (or enabled by default) and
+        the background worker has room, otherwise the explanation is computed inline.
+        """
+        defer = analysis_request.defer_explanation
+        if defer is None:
+            defer = Config.DEFER_EXPLANATIONS
+        return defer and self.explanation_worker is not None and self.explanation_worker.has_capacity()
+
+    async def _explain(self, explanation_job) -> Dict[str, Any]:
+        """
+        Runs an explanation job and returns the report columns to set.
+        Binary explanations are stored outside the database, keeping only their key in the report.
         """
-        Retrieves analysis reports.
-        Can filter by doctor ID and optionally by patient hash.
+        explanation = await explanation_job()
+        columns = {"explanation": explanation["explanation"], "explanation_status": EXPLANATION_READY}
+        artifact = explanation.get("artifact")
+        if artifact is not None and self.artifact_store is not None:
+            data, media_type = artifact
+            columns["explanation_artifact"] = await self.artifact_store.put(data, media_type)
+        return columns
+
+    async def get_reports(
+        self, doctor_id: int, patient_hashed_cf: str | None = None, limit: int | None = None, offset: int = 0
+    ) -> GetReportsResponse:
+        """
+        Retrieves analysis reports, most recent first.
+        Can filter by doctor ID and optionally by patient hash, with optional limit/offset.
         """
         reports = []
 
         if patient_hashed_cf:
-            # Fetch reports for a specific patient under a specific doctor
-            all_reports = await self.reports_repository.find_by_patient_hashed_cf(patient_hashed_cf)
-            reports = [r for r in all_reports if r.doctor_id == doctor_id]
+            # Fetch reports for a specific patient under a specific doctor (filtered in SQL)
+            reports = await self.reports_repository.find_by_doctor_and_patient(
+                doctor_id, patient_hashed_cf, limit=limit, offset=offset
+            )
 
             # Audit log for accessing patient specific data
             await self.notify({
@@ -136,7 +194,7 @@ class XAiService:
 
         else:
             # Fetch all reports for the doctor
-            reports = await self.reports_repository.find_by_doctor_id(doctor_id)
+            reports = await self.reports_repository.find_by_doctor_id(doctor_id, limit=limit, offset=offset)
 
             # Audit log for accessing general reports
             await self.notify({
@@ -146,11 +204,187 @@ class XAiService:
                 "doctor_id": doctor_id
             })
 
-        # Convert ORM models to Pydantic schemas
-        reports = [ReportItem.model_validate(r) for r in reports]
+        # Convert ORM models to Pydantic schemas (summaries, without the explanation)
+        reports = [ReportSummary.model_validate(r) for r in reports]
 
         # Determine the response message
         default_message = GetReportsResponse.model_fields["message"].default
         message = "No reports retrieved" if not reports else default_message
 
-        return GetReportsResponse(message=message, reports=reports)
\ No newline at end of file
+        return GetReportsResponse(message=message, reports=reports)
+
+    async def get_report(self, doctor_id: int, report_id: int) -> GetReportResponse:
+        """
+        Retrieves a single report with its explanation.
+        Only the doctor who created the report can access it.
+        """
+        report = await self.reports_repository.find_by_id(report_id)
+        if report is None or report.doctor_id != doctor_id:
+            raise Exception(f"Report {report_id} not found")
+
+        # Audit log for accessing a report explanation
+        await self.notify({
+            "service": "explainable_ai",
+            "event": "report_view",
+            "description": "Report view required",
+            "doctor_id": doctor_id,
+            "patient_hashed_cf": report.patient_hashed_cf,
+            "report_id": report.id
+        })
+
+        return GetReportResponse(report=ReportItem.model_validate(report))
+
+    async def get_report_artifact(self, doctor_id: int, report_id: int, if_none_match: str | None = None):
+        """
+        Retrieves the binary explanation artifact of a report (e.g. its heatmap).
+        Only the doctor who created the report can access it.
+        Returns (etag, media_type, content); the content is None when 'if_none_match'
+        already matches the artifact, so the caller can answer 304 without reading it.
+        """
+        report = await self.reports_repository.find_by_id(report_id)
+        if report is None or report.doctor_id != doctor_id or not report.explanation_artifact:
+            raise Exception(f"Artifact of report {report_id} not found")
+
+        key = report.explanation_artifact
+        etag = artifact_etag(key)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return etag, artifact_media_type(key), None
+
+        data = await self.artifact_store.get(key)
+        if data is None:
+            raise Exception(f"Artifact of report {report_id} not found")
+
+        # Audit log for accessing a report explanation artifact
+        await self.notify({
+            "service": "explainable_ai",
+            "event": "report_artifact_view",
+            "description": "Report artifact view required",
+            "doctor_id": doctor_id,
+            "patient_hashed_cf": report.patient_hashed_cf,
+            "report_id": report.id
+        })
+
+        return etag, artifact_media_type(key), data
+
+
+    async def wait_explanation(self, doctor_id: int, report_id: int, wait: float = 0) -> GetReportResponse:
+        """
+        Retrieves a report once its explanation is no longer pending (long polling).
+        Waits at most 'wait' seconds: the returned report may still be pending, in which
+        case the client polls again. Only the doctor who created the report can access it.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            status = await self.reports_repository.find_explanation_status(report_id)
+            if status is None or status[0] != doctor_id:
+                raise Exception(f"Report {report_id} not found")
+
+            remaining = deadline - loop.time()
+            if status[1] != EXPLANATION_PENDING or remaining <= 0 or self.explanation_worker is None:
+                break
+            # Woken up as soon as the job completes in this process (otherwise re-checked periodically)
+            await self.explanation_worker.wait(report_id, remaining)
+
+        return await self.get_report(doctor_id, report_id)
+
+    async def what_if(self, what_if_request: WhatIfRequest) -> WhatIfResponse:
+        """
+        Computes the heart disease risk surface around a base feature vector, varying the
+        features of the grid. All variants are scored with one batched prediction and nothing
+        is saved, so interactive clients (e.g. a slider) can call it on every change.
+        """
+        strategy = NumericAnalysisStrategy()
+        if not strategy.model:
+            raise Exception("Heart model not available")
+
+        base_risk, surface = await get_executor("numeric").run(
+            strategy.risk_surface, what_if_request.features, what_if_request.grid
+        )
+        return WhatIfResponse(
+            base_risk=base_risk,
+            features=list(what_if_request.grid),
+            axes=list(what_if_request.grid.values()),
+            risk=surface.tolist()
+        )
+
+    async def score_cohort(self, doctor_id: int, body: bytes, content_type: str | None,
+                           top_k: int = 5, persist: bool = True) -> AsyncIterator[bytes]:
+        """
+        Scores a cohort of patients with the heart disease model.
+        The body is a (patients, HEART_FEATURES) matrix in JSON, CSV or Arrow: it is parsed before
+        returning, so malformed input fails the request. The returned stream yields NDJSON lines,
+        one per patient (risk and top-k drivers), computed chunk by chunk with one vectorized
+        prediction call each; with 'persist', each chunk is bulk-inserted as numeric reports.
+        Saved reports are explained with exact TreeSHAP, like single analyses; unsaved scores
+        use the contributions configured by COHORT_CONTRIBUTIONS.
+        """
+        strategy = NumericAnalysisStrategy()
+        if not strategy.model:
+            raise Exception("Heart model not available")
+
+        # Parsing is CPU-bound as well: it runs on the numeric executor
+        executor = get_executor("numeric")
+        patients, matrix = await executor.run(parse_cohort, body, content_type, Config.HEART_FEATURES)
+        if len(patients) > Config.COHORT_MAX_ROWS:
+            raise CohortTooLargeError(
+                f"Cohort of {len(patients)} patients exceeds the limit of {Config.COHORT_MAX_ROWS}"
+            )
+
+        approximate = not persist and Config.COHORT_CONTRIBUTIONS == "approx"
+
+        async def stream():
+            scored = 0
+            try:
+                for start in range(0, len(patients), Config.COHORT_CHUNK_SIZE):
+                    chunk = patients[start:start + Config.COHORT_CHUNK_SIZE]
+                    results = await self._score_chunk(
+                        executor, strategy, matrix[start:start + len(chunk)], top_k, approximate
+                    )
+
+                    report_ids = [None] * len(chunk)
+                    if persist:
+                        # The drivers are the explanation of the saved reports
+                        report_ids = await self.reports_repository.save_many([
+                            (doctor_id, patient, None, "numeric", diagnosis, risk, drivers)
+                            for patient, (diagnosis, risk, drivers) in zip(chunk, results)
+                        ])
+                        # Audit log of the saved chunk, sent before the client can disconnect
+                        # (the reports link each ID to its patient)
+                        await self.notify({
+                            "service": "explainable_ai",
+                            "event": "cohort_chunk_saved",
+                            "description": f"{len(report_ids)} cohort report(s) saved: {id_ranges(report_ids)}",
+                            "doctor_id": doctor_id
+                        })
+
+                    scored += len(chunk)
+                    yield cohort_ndjson(chunk, report_ids, results)
+            except Exception as e:
+                # The status line is already sent: report the failure as the last NDJSON line
+                yield (json.dumps({"error": str(e), "scored": scored}) + "\n").encode()
+            finally:
+                # Audit log of the whole cohort (one event, not one per patient),
+                # also sent when the client disconnects before the end of the stream
+                await self.notify({
+                    "service": "explainable_ai",
+                    "event": "cohort_scored",
+                    "description": f"Cohort of {scored} of {len(patients)} patient(s) scored"
+                                   + (" and saved" if persist else ""),
+                    "doctor_id": doctor_id
+                })
+
+        return stream()
+
+    @staticmethod
+    async def _score_chunk(executor, strategy: NumericAnalysisStrategy, matrix, top_k: int,
+                           approximate: bool) -> list:
+        """
+        Scores a chunk of the cohort on the numeric executor, waiting while it is saturated
+        (the stream is already started, so the chunk cannot be rejected with a 503).
+        """
+        while True:
+            try:
+                return await executor.run(strategy.score_cohort, matrix, top_k, approximate)
+            except ExecutorSaturatedError as e:
+                await asyncio.sleep(e.retry_after)
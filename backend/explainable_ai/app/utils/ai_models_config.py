@@ -6,8 +6,79 @@ class Config:
     """
     # Google API Key for Generative AI (Gemini) strategies
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+    # LLM used by the text and signal strategies: "gemini" (needs GOOGLE_API_KEY) or "local"
+    # (deterministic offline stand-in, for tests and benchmarks), and the Gemini model name
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+    LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash-lite")
+    # Generations in flight at once, deadline of a generation (seconds, retries included)
+    # and retries of transient failures (rate limits, overloaded backend, timeouts)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    # Simulated latency of the local stand-in (seconds)
+    LLM_LOCAL_LATENCY = float(os.getenv("LLM_LOCAL_LATENCY", "0"))
+    # Persistent cache of the LLM answers (SQLite file, empty to disable), entry lifetime and size limit.
+    # The answers (generated diagnoses and explanations) are stored in plaintext, owner-readable only
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("llm_cache", "responses.sqlite3"))
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # ECG analysis: sampling rate of the uploaded recordings (Hz; the processed signal carries only
+    # its normalized samples) and interpreter of the extracted features: "llm" (rule-based when the
+    # LLM is missing or unavailable) or "rules" (local rule-based interpretation only)
+    ECG_SAMPLING_RATE = float(os.getenv("ECG_SAMPLING_RATE", "500"))
+    SIGNAL_ANALYSIS = os.getenv("SIGNAL_ANALYSIS", "llm")
     # Flag to enable/disable GradCAM heatmap generation
     ENABLE_GRADCAM = True
+    # Heatmap explainer of each image strategy: "gradcam" (second forward pass plus a backward pass)
+    # or "cam" (class activation map from the feature maps captured during the inference forward pass)
+    IMAGE_EXPLAINERS = {
+        "img_rx": os.getenv("IMG_RX_EXPLAINER", "gradcam"),
+        "img_skin": os.getenv("IMG_SKIN_EXPLAINER", "gradcam"),
+    }
+    # Encoding of the GradCAM heatmaps ("JPEG" or "WEBP") and its quality (1-100)
+    HEATMAP_FORMAT = os.getenv("HEATMAP_FORMAT", "JPEG").upper()
+    HEATMAP_QUALITY = int(os.getenv("HEATMAP_QUALITY", "85"))
+    # Deferred explanations: when enabled (or requested per analysis), image reports are returned with
+    # their diagnosis right away and the GradCAM heatmap is computed by a background worker
+    DEFER_EXPLANATIONS = os.getenv("DEFER_EXPLANATIONS", "0") == "1"
+    # Maximum explanations waiting in background (each one keeps its image tensor in memory)
+    EXPLANATION_MAX_PENDING = int(os.getenv("EXPLANATION_MAX_PENDING", "64"))
+    # Age (seconds) after which a still pending explanation is marked as failed
+    # (its job was lost with the process that queued it), checked every EXPLANATION_SWEEP_SECONDS
+    EXPLANATION_STALE_SECONDS = float(os.getenv("EXPLANATION_STALE_SECONDS", "600"))
+    EXPLANATION_SWEEP_SECONDS = float(os.getenv("EXPLANATION_SWEEP_SECONDS", "60"))
+    # Explainer of the numeric strategy: "native" (XGBoost pred_contribs on a float32 row)
+    # or "shap" (shap.TreeExplainer on a one-row DataFrame)
+    NUMERIC_EXPLAINER = os.getenv("NUMERIC_EXPLAINER", "native")
+    # Cohort scoring: patients scored per prediction call (and per bulk insert), maximum patients
+    # per request, and contributions used for the drivers of unsaved scores (persist=false):
+    # "approx" (per-path attribution, fast) or "exact" (TreeSHAP); saved reports are always exact
+    COHORT_CHUNK_SIZE = int(os.getenv("COHORT_CHUNK_SIZE", "10000"))
+    COHORT_MAX_ROWS = int(os.getenv("COHORT_MAX_ROWS", "100000"))
+    COHORT_CONTRIBUTIONS = os.getenv("COHORT_CONTRIBUTIONS", "approx")
+    # What-if exploration: maximum variants (combinations of the grid values) per request
+    WHATIF_MAX_VARIANTS = int(os.getenv("WHATIF_MAX_VARIANTS", "10000"))
+    # Directory of the local artifact store (heatmaps are stored there, not in the reports table)
+    ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "artifacts")
+    # Comma-separated list of models to load at worker startup (e.g. "chexnet,xgboost_heart");
+    # any other model is loaded lazily by the model registry on its first request
+    PRELOAD_MODELS = [m.strip() for m in os.getenv("PRELOAD_MODELS", "").split(",") if m.strip()]
+
+    # Micro-batching of image inference: maximum images per forward pass and
+    # how long (milliseconds) the first queued image waits for others to join its batch
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+    BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", "5"))
+
+    # Inference executors per model family: (worker threads, max queued calls).
+    # Image inference uses a single worker because GradCAM hooks into the shared models.
+    INFERENCE_EXECUTORS = {
+        "image": (int(os.getenv("IMAGE_INFERENCE_WORKERS", "1")), int(os.getenv("IMAGE_INFERENCE_QUEUE", "16"))),
+        "numeric": (int(os.getenv("NUMERIC_INFERENCE_WORKERS", "2")), int(os.getenv("NUMERIC_INFERENCE_QUEUE", "64"))),
+        "text": (int(os.getenv("TEXT_INFERENCE_WORKERS", "2")), int(os.getenv("TEXT_INFERENCE_QUEUE", "16"))),
+        "signal": (int(os.getenv("SIGNAL_INFERENCE_WORKERS", "1")), int(os.getenv("SIGNAL_INFERENCE_QUEUE", "16"))),
+    }
+    # Seconds suggested to clients in the Retry-After header when an executor is saturated
+    RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "1"))
 
     # Determine absolute paths to locate the 'ai_models' directory dynamically
     CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
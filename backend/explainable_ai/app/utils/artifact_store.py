@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+
+# Media types of the stored artifacts and the file extension used for each
+MEDIA_TYPES = {
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/png": "png",
+    "application/json": "json",
+    "text/plain": "txt",
+}
+EXTENSIONS = {extension: media_type for media_type, extension in MEDIA_TYPES.items()}
+
+# Artifact keys: sha256 of the content plus the extension of its media type
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.(" + "|".join(EXTENSIONS) + r")$")
+
+
+class IArtifactStore(ABC):
+    """
+    Interface for the storage of binary explanation artifacts (e.g. Grad-CAM heatmaps).
+    Artifacts are immutable and addressed by a key derived from their content,
+    so the key doubles as a strong ETag and identical artifacts are stored once.
+    """
+
+    @abstractmethod
+    async def put(self, data: bytes, media_type: str) -> str:
+        """
+        Stores the artifact and returns its key.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Returns the content of the artifact, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """
+        Removes the artifact (no-op if it does not exist).
+        """
+        pass
+
+
+def artifact_key(data: bytes, media_type: str) -> str:
+    """
+    Returns the content-addressed key of an artifact.
+    """
+    extension = MEDIA_TYPES.get(media_type)
+    if extension is None:
+        raise ValueError(f"Unsupported artifact media type '{media_type}'")
+    return f"{hashlib.sha256(data).hexdigest()}.{extension}"
+
+
+def artifact_media_type(key: str) -> str:
+    """
+    Returns the media type of an artifact from its key.
+    """
+    return EXTENSIONS[key.rsplit(".", 1)[-1]]
+
+
+def artifact_etag(key: str) -> str:
+    """
+    Returns the (strong) ETag of an artifact: the content hash.
+    """
+    return f'"{key.split(".", 1)[0]}"'
+
+
+class LocalArtifactStore(IArtifactStore):
+    """
+    Artifact store on the local filesystem.
+    Files are laid out as '<root>/<aa>/<bb>/<sha256>.<ext>' to keep directories small,
+    and written to a temporary file first, so readers never see a partial artifact.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        """
+        Returns the file path of an artifact, rejecting malformed keys (e.g. path traversal).
+        """
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid artifact key '{key}'")
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _write(self, path: str, data: bytes):
+        if os.path.exists(path):
+            # Same content already stored
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{id(data)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    async def put(self, data: bytes, media_type: str) -> str:
+        key = artifact_key(data, media_type)
+        # File I/O runs in a thread, off the event loop
+        await asyncio.to_thread(self._write, self._path(key), data)
+        return key
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, self._path(key))
+
+    async def delete(self, key: str):
+        try:
+            await asyncio.to_thread(os.remove, self._path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler.
+    Concurrent callers submit single items; pending items are collected for at most
+    'max_wait_ms' (or until 'max_batch_size' items are queued) and evaluated with a
+    single call of 'forward_fn', whose i-th result is handed back to the i-th caller.
+    When an executor is given, 'forward_fn' runs on it instead of the event loop.
+    """
+
+    def __init__(self, name: str, forward_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 8, max_wait_ms: float = 5.0, executor=None):
+        self.name = name
+        self.forward_fn = forward_fn
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._batch_sizes: Counter = Counter()
+        self._forward_seconds = 0.0
+
+    def _ensure_worker(self):
+        """
+        Starts the batching loop on the running event loop (lazily, on first use), and restarts
+        it if it stopped. The queue is kept: items already queued are served by the new loop.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queues an item for the next batch and waits for its own result.
+        """
+        self._ensure_worker()
+        if self.executor is not None:
+            # Queued items count towards the executor backlog
+            self.executor.check_capacity(self._queue.qsize())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """
+        Waits for the first pending item, then gathers more until the batch is full
+        or the batching window expires.
+        If the loop is stopped meanwhile, the gathered items are queued again for its successor.
+        """
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        try:
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    # Window expired: still take whatever is already waiting
+                    while len(batch) < self.max_batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            for entry in batch:
+                self._queue.put_nowait(entry)
+            raise
+        return batch
+
+    async def _forward(self, items: List[Any]) -> Sequence[Any]:
+        """
+        Evaluates one batch.
+        """
+        if self.executor is not None:
+            return await self.executor.run(self.forward_fn, items)
+        return self.forward_fn(items)
+
+    async def _run(self):
+        """
+        Batching loop: collect, evaluate, and dispatch results to the callers.
+        """
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            start = time.perf_counter()
+            try:
+                results = await self._forward(items)
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch of {len(batch)} item(s) got {len(results)} result(s)")
+            except asyncio.CancelledError:
+                # The loop is stopped during the evaluation: its callers must not wait forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError(f"Batcher '{self.name}' stopped during the evaluation"))
+                raise
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._forward_seconds += time.perf_counter() - start
+
+            self._batches += 1
+            self._items += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns queue-depth and batch-size metrics.
+        """
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 3) if self._batches else 0.0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+            "forward_seconds_total": round(self._forward_seconds, 4),
+        }
+
+
+# Batchers created by the strategies, keyed by name (one per model)
+batchers: Dict[str, MicroBatcher] = {}
+
+
+def get_batcher(name: str, forward_fn: Callable[[List[Any]], Sequence[Any]],
+                max_batch_size: int, max_wait_ms: float, executor=None) -> MicroBatcher:
+    """
+    Returns the batcher registered under the given name, creating it on first use.
+    """
+    if name not in batchers:
+        batchers[name] = MicroBatcher(name, forward_fn, max_batch_size, max_wait_ms, executor)
+    return batchers[name]
+
+
+def batcher_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the metrics of every batcher.
+    """
+    return {name: batcher.stats() for name, batcher in batchers.items()}
@@ -0,0 +1,47 @@
+from typing import Callable, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+
+def forward_with_features(model: torch.nn.Module, feature_module: torch.nn.Module, batch: torch.Tensor,
+                          activation: Callable[[torch.Tensor], torch.Tensor] | None = None
+                          ) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Runs the model once and captures the output of 'feature_module' with a forward hook.
+    Returns the logits and the (N, C, h, w) feature maps; 'activation' is applied to the
+    captured maps when the model applies it functionally before pooling (e.g. DenseNet's ReLU).
+    """
+    captured = {}
+
+    def hook(module, inputs, output):
+        captured["features"] = output
+
+    handle = feature_module.register_forward_hook(hook)
+    try:
+        logits = model(batch)
+    finally:
+        handle.remove()
+
+    features = captured["features"]
+    if activation is not None:
+        features = activation(features)
+    return logits, features
+
+
+def class_activation_map(features: torch.Tensor, head: torch.nn.Linear, class_idx: int,
+                         size: Tuple[int, int]) -> np.ndarray:
+    """
+    Classic CAM (Zhou et al., 2016) for models ending with global average pooling and a linear head:
+    the class map is the sum of the (C, h, w) feature maps weighted by the class row of the head.
+    The map is rectified, upsampled to 'size' and scaled to [0, 1], like pytorch_grad_cam's maps.
+    No extra forward pass and no backward pass are needed.
+    """
+    with torch.no_grad():
+        weights = head.weight[class_idx].to(features.dtype)
+        cam = torch.einsum("c,chw->hw", weights, features).clamp(min=0)
+        cam = F.interpolate(cam[None, None], size=size, mode="bilinear", align_corners=False)[0, 0]
+        cam = cam - cam.min()
+        cam = cam / (cam.max() + 1e-7)
+    return cam.cpu().numpy().astype(np.float32)
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from typing import List, Tuple
+
+import numpy as np
+
+# Supported content types of a cohort matrix
+JSON_CONTENT_TYPE = "application/json"
+CSV_CONTENT_TYPE = "text/csv"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Column identifying the patient of each row
+PATIENT_COLUMN = "patient_hashed_cf"
+
+
+class UnsupportedCohortFormat(Exception):
+    """
+    Raised for a cohort body whose content type is not JSON, CSV or Arrow.
+    """
+    pass
+
+
+class CohortTooLargeError(ValueError):
+    """
+    Raised for a cohort with more patients than a single request may score.
+    """
+    pass
+
+
+def _parse_json(body: bytes, features: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    JSON body: {"patient_hashed_cf": [...], "features": [[...], ...]},
+    with one row of feature values per patient, in the order of 'features'.
+    """
+    data = json.loads(body)
+    patients = [str(p) for p in data[PATIENT_COLUMN]]
+    rows = data["features"]
+    if not patients and not rows:
+        return patients, np.empty((0, len(features)), dtype=np.float32)
+    try:
+        matrix = np.asarray(rows, dtype=np.float32)
+    except ValueError:
+        # Ragged rows (or non-numeric values) do not form a matrix
+        raise ValueError(f"Every feature row must hold {len(features)} numeric values")
+    # The matrix must match the patients row by row: never re-split the values across patients
+    if matrix.ndim != 2 or matrix.shape != (len(patients), len(features)):
+        raise ValueError(
+            f"Expected a {len(patients)} x {len(features)} feature matrix "
+            f"(one row per patient), got shape {matrix.shape}"
+        )
+    return patients, matrix
+
+
+def _parse_csv(body: bytes, features: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    CSV body: a header with the patient column and the feature columns (in any order).
+    """
+    reader = csv.reader(io.StringIO(body.decode("utf-8")))
+    header = next(reader)
+    missing = [c for c in [PATIENT_COLUMN, *features] if c not in header]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+
+    rows = [row for row in reader if row]
+    if any(len(row) != len(header) for row in rows):
+        raise ValueError(f"Every CSV row must hold {len(header)} values, like the header")
+    table = np.array(rows, dtype=str).reshape(-1, len(header))
+    patients = table[:, header.index(PATIENT_COLUMN)].tolist()
+    matrix = table[:, [header.index(f) for f in features]].astype(np.float32)
+    return patients, matrix
+
+
+def _parse_arrow(body: bytes, features: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Arrow IPC stream body: a table with the patient column and the feature columns.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise UnsupportedCohortFormat("Arrow input requires the pyarrow package")
+
+    table = pa.ipc.open_stream(body).read_all()
+    missing = [c for c in [PATIENT_COLUMN, *features] if c not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing Arrow column(s): {', '.join(missing)}")
+
+    patients = [str(p) for p in table.column(PATIENT_COLUMN).to_pylist()]
+    matrix = np.column_stack(
+        [table.column(f).to_numpy(zero_copy_only=False) for f in features]
+    ).astype(np.float32)
+    return patients, matrix
+
+
+PARSERS = {
+    JSON_CONTENT_TYPE: _parse_json,
+    CSV_CONTENT_TYPE: _parse_csv,
+    ARROW_CONTENT_TYPE: _parse_arrow,
+}
+
+
+def parse_cohort(body: bytes, content_type: str, features: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Parses a cohort matrix into the patient identifiers and a float32 (patients, features) matrix.
+    """
+    parser = PARSERS.get((content_type or JSON_CONTENT_TYPE).split(";")[0].strip().lower())
+    if parser is None:
+        raise UnsupportedCohortFormat(
+            f"Unsupported cohort content type '{content_type}' (use {', '.join(PARSERS)})"
+        )
+    patients, matrix = parser(body, features)
+    if not patients:
+        raise ValueError("Empty cohort")
+    # NaN values are kept: XGBoost treats them as missing features
+    return patients, matrix
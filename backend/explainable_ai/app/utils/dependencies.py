@@ -4,9 +4,12 @@ from fastapi import Depends
 # Import SQLAlchemy AsyncSession
 from sqlalchemy.ext.asyncio import AsyncSession
 # Import internal utilities and services
-from ..utils.db_connection import get_session
+from ..utils.db_connection import get_session, async_session
 from ..utils.http_client import HttpClient
 from ..utils.logging.audit_client import AuditClient
+from ..utils.artifact_store import LocalArtifactStore
+from ..utils.explanation_worker import ExplanationWorker
+from ..utils.ai_models_config import Config
 from ..repositories.report_repository import ReportRepository
 from ..repositories.I_report_repository import IReportRepository
 from ..services.xai_service import XAiService
@@ -16,8 +19,22 @@ audit_url = os.getenv("AUDIT_URL", "http://audit_service:8000/audit")
 
 # Initialize the HTTP client for inter-service communication
 http_client = HttpClient()
-# Initialize the AuditClient (Observer) to send logs to the Audit Service
-audit_client = AuditClient(audit_url=audit_url, http_client=http_client)
+# Initialize the AuditClient (Observer) to send logs to the Audit Service in background batches
+audit_client = AuditClient(
+    audit_url=audit_url,
+    http_client=http_client,
+    max_queue=int(os.getenv("AUDIT_MAX_QUEUE", "10000")),
+    batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "100")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5")),
+    overflow_policy=os.getenv("AUDIT_OVERFLOW_POLICY", "drop_oldest")
+)
+
+# Content-addressed store of the binary explanations (heatmaps) on the local filesystem
+artifact_store = LocalArtifactStore(root=Config.ARTIFACTS_DIR)
+# Background worker of the deferred explanations, with its own database sessions
+explanation_worker = ExplanationWorker(
+    session_factory=async_session, max_pending=Config.EXPLANATION_MAX_PENDING, observers=[audit_client]
+)
 
 async def get_xai_service(session: AsyncSession = Depends(get_session)) -> XAiService:
     """
@@ -27,8 +44,11 @@ async def get_xai_service(session: AsyncSession = Depends(get_session)) -> XAiSe
     # Create the repository implementation using the current database session
     report_repository: IReportRepository = ReportRepository(session=session)
 
-    # Instantiate the service with the repository and http client
-    xai_service = XAiService(reports_repository=report_repository, http_client=http_client)
+    # Instantiate the service with the repository, http client, artifact store and explanation worker
+    xai_service = XAiService(
+        reports_repository=report_repository, http_client=http_client,
+        artifact_store=artifact_store, explanation_worker=explanation_worker
+    )
 
     # Attach the audit client as an observer to log service events (e.g., analysis completed)
     xai_service.attach(audit_client)
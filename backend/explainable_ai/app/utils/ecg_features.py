@@ -0,0 +1,183 @@
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from scipy import signal as sps
+
+# QRS enhancement band (Hz) and windows (seconds) of the R-peak detector (Pan-Tompkins)
+QRS_BAND = (5.0, 15.0)
+INTEGRATION_WINDOW = 0.15
+REFRACTORY_PERIOD = 0.25
+SEARCH_WINDOW = 0.075
+# QRS width measurement: low-pass cut-off (Hz), half window around the R peak (seconds) and
+# fraction of the steepest slope that delimits the complex
+QRS_LOWPASS = 40.0
+QRS_MAX_HALF_WIDTH = 0.12
+QRS_SLOPE_RATIO = 0.15
+# Minimum recording length (seconds) for the spectral HRV indices (LF/HF)
+HRV_SPECTRAL_MIN_SECONDS = 60.0
+
+# Thresholds of the rule-based interpretation
+BRADYCARDIA_BPM = 50
+TACHYCARDIA_BPM = 100
+IRREGULAR_RR_CV = 0.15
+WIDE_QRS_MS = 120
+NOISY_POWER_RATIO = 0.3
+
+
+def _band_power(freqs: np.ndarray, psd: np.ndarray, low: float, high: float) -> float:
+    """
+    Integrated power of a PSD between 'low' and 'high' Hz.
+    """
+    mask = (freqs >= low) & (freqs < high)
+    return float(np.trapezoid(psd[mask], freqs[mask])) if mask.sum() > 1 else 0.0
+
+
+def detect_r_peaks(ecg: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Detects the R peaks of an ECG (sample indices) with a vectorized Pan-Tompkins pipeline:
+    band-pass 5-15 Hz, derivative, squaring, moving-window integration and peak picking with a
+    refractory period. Each detection is moved to the largest deflection of the band-passed
+    signal nearby, so the polarity of the lead does not matter.
+    Returns the R-peak indices and the band-passed signal.
+    """
+    sos = sps.butter(2, QRS_BAND, btype="bandpass", fs=fs, output="sos")
+    filtered = sps.sosfiltfilt(sos, ecg)
+    energy = np.square(np.gradient(filtered))
+    window = max(1, int(INTEGRATION_WINDOW * fs))
+    integrated = np.convolve(energy, np.ones(window) / window, mode="same")
+
+    # Beats stand well above the integrated baseline: threshold relative to the strongest beats
+    threshold = 0.3 * np.percentile(integrated, 99)
+    candidates, _ = sps.find_peaks(integrated, height=threshold, distance=max(1, int(REFRACTORY_PERIOD * fs)))
+    if candidates.size == 0:
+        return candidates, filtered
+
+    # Refinement: largest absolute deflection within the search window of every candidate (one gather)
+    half = int(SEARCH_WINDOW * fs)
+    offsets = np.arange(-half, half + 1)
+    windows = np.clip(candidates[:, None] + offsets[None, :], 0, ecg.size - 1)
+    peaks = windows[np.arange(candidates.size), np.argmax(np.abs(filtered[windows]), axis=1)]
+    return np.unique(peaks), filtered
+
+
+def qrs_widths(ecg: np.ndarray, peaks: np.ndarray, fs: float) -> np.ndarray:
+    """
+    QRS duration of every beat (seconds): span around the R peak where the slope of the ECG
+    (low-passed at 40 Hz) exceeds 15% of the steepest slope of that beat, i.e. from the QRS
+    onset to its offset. All beats are measured at once on a (beats x window) matrix.
+    """
+    if peaks.size == 0:
+        return np.empty(0)
+    sos = sps.butter(2, QRS_LOWPASS, btype="lowpass", fs=fs, output="sos")
+    slope = np.abs(np.gradient(sps.sosfiltfilt(sos, ecg)))
+    half = int(QRS_MAX_HALF_WIDTH * fs)
+    windows = np.clip(peaks[:, None] + np.arange(-half, half + 1)[None, :], 0, ecg.size - 1)
+    steep = slope[windows] > QRS_SLOPE_RATIO * slope[windows].max(axis=1, keepdims=True)
+    onset = np.argmax(steep, axis=1)
+    offset = steep.shape[1] - 1 - np.argmax(steep[:, ::-1], axis=1)
+    return (offset - onset) / fs
+
+
+def _spectral_hrv(peaks: np.ndarray, rr: np.ndarray, fs: float) -> Dict[str, float | None]:
+    """
+    LF (0.04-0.15 Hz) and HF (0.15-0.4 Hz) power of the RR series, resampled at 4 Hz.
+    """
+    times = peaks[1:] / fs
+    grid = np.arange(times[0], times[-1], 0.25)
+    if grid.size < 16:
+        return {"lf_power_ms2": None, "hf_power_ms2": None, "lf_hf_ratio": None}
+    resampled = np.interp(grid, times, rr * 1000)
+    freqs, psd = sps.welch(resampled - resampled.mean(), fs=4.0, nperseg=min(256, grid.size))
+    lf, hf = _band_power(freqs, psd, 0.04, 0.15), _band_power(freqs, psd, 0.15, 0.4)
+    return {
+        "lf_power_ms2": round(lf, 2),
+        "hf_power_ms2": round(hf, 2),
+        "lf_hf_ratio": round(lf / hf, 3) if hf > 0 else None,
+    }
+
+
+def extract_ecg_features(samples: np.ndarray, fs: float) -> Dict[str, Any]:
+    """
+    Computes a compact summary of an ECG recording: heart rate, RR intervals and HRV statistics,
+    QRS width and the spectral power distribution (signal quality). The cost grows linearly with
+    the recording length (filters, FFT), while the summary has a fixed size.
+    """
+    ecg = np.asarray(samples, dtype=np.float64)
+    duration = ecg.size / fs
+    features: Dict[str, Any] = {"duration_s": round(duration, 2), "sampling_rate_hz": fs, "beats": 0}
+    # The band-pass filter needs a few periods of its lowest frequency; a flat line has no beats
+    if ecg.size < int(fs) or np.ptp(ecg) < 1e-6:
+        return features
+
+    # Spectral power distribution: baseline wander, ECG band and high-frequency noise
+    freqs, psd = sps.welch(ecg - ecg.mean(), fs=fs, nperseg=min(ecg.size, int(4 * fs)))
+    total = _band_power(freqs, psd, 0.0, fs / 2) or 1.0
+    features.update({
+        "baseline_power_ratio": round(_band_power(freqs, psd, 0.0, 0.5) / total, 4),
+        "qrs_band_power_ratio": round(_band_power(freqs, psd, *QRS_BAND) / total, 4),
+        "noise_power_ratio": round(_band_power(freqs, psd, 40.0, fs / 2) / total, 4),
+        "dominant_frequency_hz": round(float(freqs[np.argmax(psd[1:]) + 1]), 2),
+    })
+
+    peaks, _ = detect_r_peaks(ecg, fs)
+    features["beats"] = int(peaks.size)
+    if peaks.size < 2:
+        return features
+
+    rr = np.diff(peaks) / fs
+    successive = np.abs(np.diff(rr)) * 1000
+    widths = qrs_widths(ecg, peaks, fs) * 1000
+    features.update({
+        "heart_rate_bpm": round(60.0 / float(rr.mean()), 1),
+        "rr_mean_ms": round(float(rr.mean()) * 1000, 1),
+        "rr_min_ms": round(float(rr.min()) * 1000, 1),
+        "rr_max_ms": round(float(rr.max()) * 1000, 1),
+        "rr_cv": round(float(rr.std() / rr.mean()), 4),
+        "sdnn_ms": round(float(rr.std()) * 1000, 1),
+        "rmssd_ms": round(float(np.sqrt(np.mean(successive ** 2))), 1) if successive.size else 0.0,
+        "pnn50_pct": round(float(np.mean(successive > 50)) * 100, 1) if successive.size else 0.0,
+        "qrs_width_ms": round(float(np.median(widths)), 1),
+    })
+    if duration >= HRV_SPECTRAL_MIN_SECONDS:
+        features.update(_spectral_hrv(peaks, rr, fs))
+    return features
+
+
+def rule_based_diagnosis(features: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Local interpretation of the ECG features with standard clinical thresholds, used when no LLM
+    is available (or configured). Returns the diagnosis, a confidence and the explanation.
+    """
+    if features.get("beats", 0) < 2:
+        return {
+            "diagnosis": "Undetermined",
+            "confidence": 0.0,
+            "explanation": "Rule-based analysis: fewer than two heartbeats were detected, "
+                           "the recording is too short or too noisy to be interpreted."
+        }
+
+    rate, cv, qrs = features["heart_rate_bpm"], features["rr_cv"], features["qrs_width_ms"]
+    findings, reasons = [], []
+    if cv > IRREGULAR_RR_CV:
+        findings.append("Irregular rhythm (possible atrial fibrillation)")
+        reasons.append(f"RR intervals vary by {cv:.0%} (RMSSD {features['rmssd_ms']:.0f} ms)")
+    if rate < BRADYCARDIA_BPM:
+        findings.append("Bradycardia")
+        reasons.append(f"heart rate of {rate:.0f} bpm is below {BRADYCARDIA_BPM}")
+    elif rate > TACHYCARDIA_BPM:
+        findings.append("Tachycardia")
+        reasons.append(f"heart rate of {rate:.0f} bpm is above {TACHYCARDIA_BPM}")
+    if qrs > WIDE_QRS_MS:
+        findings.append("Wide QRS complex (possible bundle branch block)")
+        reasons.append(f"QRS width of {qrs:.0f} ms exceeds {WIDE_QRS_MS} ms")
+    if not findings:
+        findings.append("Normal sinus rhythm")
+        reasons.append(f"regular rhythm at {rate:.0f} bpm with a QRS width of {qrs:.0f} ms")
+
+    # Less confidence on noisy recordings and on few beats
+    noise = features.get("noise_power_ratio", 0.0)
+    confidence = 0.85 * min(1.0, features["beats"] / 10) * (0.5 if noise > NOISY_POWER_RATIO else 1.0)
+    explanation = "Rule-based analysis: " + "; ".join(reasons) + "."
+    if noise > NOISY_POWER_RATIO:
+        explanation += f" The recording is noisy ({noise:.0%} of its power above 40 Hz)."
+    return {"diagnosis": ", ".join(findings), "confidence": round(confidence, 2), "explanation": explanation}
@@ -0,0 +1,228 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+from .inference_executor import ExecutorSaturatedError
+from .logging.I_observer import IObserver
+from ..repositories.report_repository import ReportRepository
+
+# Status of the explanation of a report
+EXPLANATION_READY = "ready"
+EXPLANATION_PENDING = "pending"
+EXPLANATION_FAILED = "failed"
+
+# A job computes the explanation of a report and returns the report columns to update
+ExplanationJob = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class ExplanationWorker:
+    """
+    Background computation of deferred explanations (e.g. GradCAM heatmaps).
+    Reports are saved with a 'pending' explanation and returned to the client right away;
+    the worker runs their jobs in submission order, updates the reports with their own
+    database session and wakes up the clients long-polling for them.
+    """
+
+    def __init__(self, session_factory, max_pending: int = 64, concurrency: int = 1,
+                 observers: List[IObserver] | None = None):
+        self.session_factory = session_factory
+        self.max_pending = max(1, max_pending)
+        self.concurrency = max(1, concurrency)
+        # Observers notified when an explanation is ready (e.g. the audit client)
+        self.observers = observers or []
+        self._queue: asyncio.Queue | None = None
+        self._workers: List[asyncio.Task] = []
+        # report_id -> event set once its explanation is ready (or failed)
+        self._events: Dict[int, asyncio.Event] = {}
+        # Reports whose job is running and whose explanation is not saved yet
+        self._processing: Set[int] = set()
+        # Periodic task marking the stale pending explanations as failed
+        self._sweeper: asyncio.Task | None = None
+        # Metrics
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+
+    def _ensure_workers(self):
+        """
+        Starts the worker tasks on the running event loop (lazily, on first job).
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._run()))
+
+    def has_capacity(self) -> bool:
+        """
+        Whether a new job can be queued (otherwise the explanation is computed inline).
+        Queued jobs hold their input tensors in memory, so the backlog is bounded.
+        """
+        return len(self._events) < self.max_pending
+
+    def submit(self, report_id: int, job: ExplanationJob):
+        """
+        Queues the explanation job of a saved report.
+        """
+        self._ensure_workers()
+        self._events[report_id] = asyncio.Event()
+        self._queue.put_nowait((report_id, job, time.perf_counter()))
+        self._submitted += 1
+
+    async def wait(self, report_id: int, timeout: float, poll_interval: float = 1.0):
+        """
+        Waits until the explanation of a report is completed, at most 'timeout' seconds.
+        Jobs queued by another worker process are not visible here: the caller re-reads
+        the report after at most 'poll_interval' seconds.
+        """
+        event = self._events.get(report_id)
+        try:
+            if event is None:
+                await asyncio.sleep(min(timeout, poll_interval))
+            else:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def fail_stale(self, older_than: float) -> int:
+        """
+        Marks as failed the explanations left pending for more than 'older_than' seconds.
+        Queued jobs only live in memory: the jobs of a worker process that stopped without
+        completing them (crash, kill) can no longer run, and their clients would wait forever.
+        Recent jobs may belong to another worker process, so 'older_than' must exceed the
+        time a job can legitimately stay queued.
+        """
+        try:
+            async with self.session_factory() as session:
+                failed = await ReportRepository(session).fail_stale_explanations(older_than)
+        except Exception as e:
+            print(f"Failed to mark the stale explanations as failed: {e}")
+            return 0
+        if failed:
+            print(f"Marked {failed} stale pending explanation(s) as failed")
+        return failed
+
+    def start_sweeper(self, older_than: float, interval: float):
+        """
+        Runs fail_stale every 'interval' seconds, starting now, until the worker is closed:
+        jobs lost by a process that stopped while this one keeps running are also failed.
+        """
+        async def sweep():
+            while True:
+                await self.fail_stale(older_than)
+                await asyncio.sleep(interval)
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(sweep())
+
+    async def _run(self):
+        """
+        Worker loop: runs the queued jobs one at a time.
+        """
+        while True:
+            report_id, job, submitted = await self._queue.get()
+            try:
+                await self._process(report_id, job)
+            finally:
+                delay = time.perf_counter() - submitted
+                self._delay_total += delay
+                self._delay_max = max(self._delay_max, delay)
+                self._queue.task_done()
+                event = self._events.pop(report_id, None)
+                if event is not None:
+                    event.set()
+
+    async def _process(self, report_id: int, job: ExplanationJob):
+        """
+        Computes the explanation and stores it in the report.
+        """
+        self._processing.add(report_id)
+        while True:
+            try:
+                fields = await job()
+                break
+            except ExecutorSaturatedError as e:
+                # The inference executor is busy with interactive requests: try again later
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                print(f"Explanation of report {report_id} failed: {e}")
+                fields = {"explanation": "Explanation not available", "explanation_status": EXPLANATION_FAILED}
+                break
+
+        try:
+            async with self.session_factory() as session:
+                await ReportRepository(session).update_explanation(report_id, **fields)
+        except Exception as e:
+            print(f"Failed to save the explanation of report {report_id}: {e}")
+            fields["explanation_status"] = EXPLANATION_FAILED
+        self._processing.discard(report_id)
+
+        if fields.get("explanation_status") == EXPLANATION_FAILED:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+        for observer in self.observers:
+            await observer.update({
+                "service": "explainable_ai",
+                "event": f"explanation_{fields.get('explanation_status', EXPLANATION_READY)}",
+                "description": "Deferred explanation saved in the database",
+                "report_id": report_id
+            })
+
+    async def close(self, timeout: float = 30.0):
+        """
+        Completes the queued jobs (waiting at most 'timeout' seconds) and stops the workers.
+        Jobs not completed by then are marked as failed: their inputs only live in memory.
+        Called on application shutdown.
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Explanation queue not drained on shutdown: {self._queue.qsize()} job(s) lost")
+
+        # The running jobs drop their events when cancelled: remember them first
+        unfinished = set(self._events) | self._processing
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._processing.clear()
+
+        # Queued and interrupted jobs
+        for report_id in sorted(unfinished):
+            try:
+                async with self.session_factory() as session:
+                    await ReportRepository(session).update_explanation(
+                        report_id, explanation="Explanation not available", explanation_status=EXPLANATION_FAILED
+                    )
+            except Exception as e:
+                print(f"Failed to mark the explanation of report {report_id} as failed: {e}")
+            event = self._events.pop(report_id, None)
+            if event is not None:
+                event.set()
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns backlog, completion and submission-to-completion delay metrics.
+        """
+        done = (self._completed + self._failed) or 1
+        return {
+            "pending": len(self._events),
+            "max_pending": self.max_pending,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "delay_avg_ms": round(self._delay_total / done * 1000, 3),
+            "delay_max_ms": round(self._delay_max * 1000, 3),
+        }
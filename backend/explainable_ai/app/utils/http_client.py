@@ -13,13 +13,27 @@ class HttpClient:
         """
         Executes an asynchronous HTTP request.
         """
+        resp = await self._send(method, url, json=json)
+        # Return the JSON response body
+        return resp.json()
+
+    async def request_bytes(self, method: str, url: str, headers: dict | None = None) -> bytes:
+        """
+        Executes an asynchronous HTTP request and returns the raw response body.
+        """
+        resp = await self._send(method, url, headers=headers)
+        return resp.content
+
+    async def _send(self, method: str, url: str, json: dict | None = None, headers: dict | None = None) -> httpx.Response:
+        """
+        Performs the request and converts HTTP errors into exceptions.
+        """
         try:
             # Perform the request
-            resp = await self.client.request(method, url, json=json)
+            resp = await self.client.request(method, url, json=json, headers=headers)
             # Raise an exception for 4xx/5xx status codes
             resp.raise_for_status()
-            # Return the JSON response body
-            return resp.json()
+            return resp
         except httpx.HTTPStatusError as e:
             # Handle specific HTTP error responses
             try:
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .ai_models_config import Config
+
+
+class ExecutorSaturatedError(Exception):
+    """
+    Raised when an inference executor has no free worker and its queue is full.
+    Mapped to a 503 Service Unavailable response with a Retry-After header.
+    """
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"Inference executor '{name}' is saturated, retry later")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool running blocking model inference off the asyncio event loop.
+    At most 'max_workers' calls run concurrently and at most 'max_queue' more may wait;
+    further calls are rejected immediately instead of letting latency grow without limit.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int = 1):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        # Threads share the models of the registry (PyTorch/XGBoost release the GIL during compute)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"inference-{name}")
+        self._pending = 0
+        # Metrics
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._exec_total = 0.0
+        self._exec_max = 0.0
+
+    def check_capacity(self, waiting: int = 0):
+        """
+        Raises ExecutorSaturatedError if the executor cannot accept more work.
+        'waiting' counts calls held elsewhere (e.g. in a batching queue) on their way here.
+        """
+        if self._pending + waiting >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise ExecutorSaturatedError(self.name, self.retry_after)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs fn(*args) on the pool and returns its result.
+        Raises ExecutorSaturatedError if the executor is full.
+        """
+        self.check_capacity()
+        submitted = time.perf_counter()
+
+        def timed_call():
+            started = time.perf_counter()
+            try:
+                return fn(*args), started
+            finally:
+                elapsed = time.perf_counter() - started
+                self._exec_total += elapsed
+                self._exec_max = max(self._exec_max, elapsed)
+
+        self._pending += 1
+        try:
+            result, started = await asyncio.get_running_loop().run_in_executor(self._pool, timed_call)
+        finally:
+            self._pending -= 1
+
+        wait = started - submitted
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self._completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns occupancy, queue-wait and execution-time metrics.
+        """
+        completed = self._completed or 1
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "queued": max(self._pending - self.max_workers, 0),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "queue_wait_avg_ms": round(self._wait_total / completed * 1000, 3),
+            "queue_wait_max_ms": round(self._wait_max * 1000, 3),
+            "execution_avg_ms": round(self._exec_total / completed * 1000, 3),
+            "execution_max_ms": round(self._exec_max * 1000, 3),
+        }
+
+
+# One executor per model family, created on first use
+executors: Dict[str, InferenceExecutor] = {}
+
+
+def get_executor(family: str) -> InferenceExecutor:
+    """
+    Returns the inference executor of a model family ('image', 'numeric', 'text', 'signal').
+    """
+    if family not in executors:
+        max_workers, max_queue = Config.INFERENCE_EXECUTORS[family]
+        executors[family] = InferenceExecutor(family, max_workers, max_queue, Config.RETRY_AFTER_SECONDS)
+    return executors[family]
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the metrics of every inference executor.
+    """
+    return {name: executor.stats() for name, executor in executors.items()}
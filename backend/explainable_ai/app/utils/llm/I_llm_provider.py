@@ -0,0 +1,37 @@
+# Import Abstract Base Class module
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class LLMTransientError(Exception):
+    """
+    Raised by a provider for failures worth retrying (rate limits, overloaded or unreachable backend).
+    """
+    pass
+
+
+class LLMUnavailableError(Exception):
+    """
+    Raised when a generation failed for good: non-retryable error, retries exhausted or deadline reached.
+    """
+    pass
+
+
+class ILLMProvider(ABC):
+    """
+    Interface defining a large language model backend used by the analysis strategies.
+    Implementations must not block the event loop.
+    """
+    # Name of the provider, reported in the metrics
+    name: str = "llm"
+    # Model answering the prompts (part of the response cache keys)
+    model_name: str = "llm"
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> Dict[str, Any]:
+        """
+        Asynchronously generates a completion of the prompt.
+        Returns {"text", "prompt_tokens", "completion_tokens"}.
+        Raises LLMTransientError for failures that may succeed if retried.
+        """
+        pass
@@ -0,0 +1,48 @@
+from typing import Any, Dict
+# Import the provider interface
+from .I_llm_provider import ILLMProvider, LLMTransientError, LLMUnavailableError
+
+
+class GeminiProvider(ILLMProvider):
+    """
+    Google Gemini backend, called through the asynchronous client of google.generativeai
+    (generate_content_async): the event loop keeps serving other requests while Gemini answers.
+    """
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash-lite", request_timeout: float = 30.0):
+        # Imported here: the package is only needed when Gemini is the configured provider
+        import google.generativeai as genai
+        from google.api_core import exceptions
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        self.model_name = model_name
+        self.request_timeout = request_timeout
+        # Errors of the Google API worth retrying
+        self._transient = (
+            exceptions.ResourceExhausted, exceptions.TooManyRequests, exceptions.ServiceUnavailable,
+            exceptions.InternalServerError, exceptions.DeadlineExceeded
+        )
+        self._api_error = exceptions.GoogleAPICallError
+
+    async def generate(self, prompt: str) -> Dict[str, Any]:
+        """
+        Generates a completion and reads the token counts from the usage metadata.
+        """
+        try:
+            response = await self.model.generate_content_async(
+                prompt, request_options={"timeout": self.request_timeout}
+            )
+        except self._transient as e:
+            raise LLMTransientError(str(e)) from e
+        except self._api_error as e:
+            # Invalid request, authentication, blocked content...: retrying does not help
+            raise LLMUnavailableError(str(e)) from e
+
+        usage = getattr(response, "usage_metadata", None)
+        return {
+            "text": response.text,
+            "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+            "completion_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+        }
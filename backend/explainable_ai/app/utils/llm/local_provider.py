@@ -0,0 +1,50 @@
+import asyncio
+import hashlib
+import json
+import random
+from typing import Any, Dict
+# Import the provider interface
+from .I_llm_provider import ILLMProvider, LLMTransientError
+
+# Canned findings of the local stand-in, picked by prompt hash
+LOCAL_FINDINGS = [
+    ("Normal findings", "No relevant anomaly is detected in the provided data."),
+    ("Borderline findings", "Some values are slightly outside the reference range and deserve a follow-up."),
+    ("Abnormal findings", "Several values are outside the reference range and are consistent with the classification."),
+]
+
+
+class LocalProvider(ILLMProvider):
+    """
+    Local deterministic stand-in for a real LLM, used offline (tests, benchmarks, development).
+    The same prompt always produces the same JSON answer, with every key the strategies ask for
+    ("specific_diagnosis", "diagnosis", "confidence", "explanation"). Latency and transient
+    failures can be simulated to exercise timeouts and retries; failures follow a seeded sequence.
+    """
+    name = "local"
+    model_name = "local-v1"
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str) -> Dict[str, Any]:
+        """
+        Waits the simulated latency (without blocking the event loop) and answers from the prompt hash.
+        """
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            raise LLMTransientError("Simulated transient failure of the local LLM")
+
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        diagnosis, explanation = LOCAL_FINDINGS[digest[0] % len(LOCAL_FINDINGS)]
+        text = json.dumps({
+            "specific_diagnosis": diagnosis,
+            "diagnosis": diagnosis,
+            "confidence": round(0.5 + digest[1] / 510, 4),
+            "explanation": explanation,
+        })
+        # Whitespace-separated words as a rough token count
+        return {"text": text, "prompt_tokens": len(prompt.split()), "completion_tokens": len(text.split())}
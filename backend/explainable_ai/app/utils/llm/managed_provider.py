@@ -0,0 +1,193 @@
+import asyncio
+import json
+import random
+from typing import Any, Callable, Dict
+# Import the provider interface and the response cache
+from .I_llm_provider import ILLMProvider, LLMTransientError, LLMUnavailableError
+from .response_cache import LLMResponseCache
+
+
+class ManagedLLMProvider(ILLMProvider):
+    """
+    Wraps a provider with the policies of the service:
+    - at most 'max_concurrency' generations in flight (further calls wait for a slot);
+    - a deadline of 'timeout' seconds per call, waiting for a slot and retries included;
+    - up to 'max_retries' retries of transient failures and timeouts, with exponential
+      backoff and full jitter, so that clients rejected together do not retry together;
+    - token and latency accounting, exposed by the metrics endpoint;
+    - an optional response cache: answers requested with a cache key are stored, and a hit
+      skips the provider entirely (concurrent requests of the same key share one generation).
+    """
+
+    def __init__(self, provider: ILLMProvider, max_concurrency: int = 4, timeout: float = 30.0,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 cache: LLMResponseCache | None = None):
+        self.provider = provider
+        self.name = provider.name
+        self.model_name = provider.model_name
+        self.cache = cache
+        # Cache key -> generation in progress, awaited by identical concurrent requests
+        self._generating: Dict[str, asyncio.Future] = {}
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore: asyncio.Semaphore | None = None
+        self._in_flight = 0
+        self._waiting = 0
+        # Metrics
+        self._calls = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._retries = 0
+        self._timeouts = 0
+        self._prompt_tokens = 0
+        self._completion_tokens = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Delay before retry number 'attempt' (0-based): full jitter over an exponential ceiling.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def generate(self, prompt: str, cache_key: str | None = None,
+                       validate: Callable[[str], Any] | None = None) -> Dict[str, Any]:
+        """
+        Generates a completion within the deadline, retrying transient failures.
+        With a 'cache_key' (see llm_cache_key), a cached answer is returned without calling the
+        provider ("cached": True); new answers are cached once 'validate' (e.g. the JSON parser
+        of the caller) accepts their text, so malformed answers are never replayed.
+        Raises LLMUnavailableError when no completion could be obtained.
+        """
+        if cache_key is None or self.cache is None:
+            return await self._generate(prompt)
+
+        try:
+            cached = await self.cache.get(cache_key)
+        except Exception as e:
+            # The cache is an optimization: a broken cache file must not fail the analysis
+            print(f"LLM cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        generating = self._generating.get(cache_key)
+        if generating is not None:
+            return await asyncio.shield(generating)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved even if no identical request is waiting for it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._generating[cache_key] = future
+        try:
+            result = await self._generate(prompt)
+            if validate is not None:
+                validate(result["text"])
+            try:
+                await self.cache.put(cache_key, result)
+            except Exception as e:
+                print(f"LLM cache store failed: {e}")
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else LLMUnavailableError("Generation cancelled"))
+            raise
+        finally:
+            self._generating.pop(cache_key, None)
+
+    async def _generate(self, prompt: str) -> Dict[str, Any]:
+        """
+        Calls the provider within the deadline, retrying transient failures.
+        """
+        if self._semaphore is None:
+            # Created lazily on the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout
+        self._calls += 1
+
+        attempt = 0
+        while True:
+            try:
+                result = await self._attempt(prompt, deadline - loop.time())
+                break
+            except (LLMTransientError, asyncio.TimeoutError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._timeouts += 1
+                delay = self._backoff(attempt)
+                if attempt >= self.max_retries or loop.time() + delay >= deadline:
+                    self._failed += 1
+                    raise LLMUnavailableError(
+                        f"LLM provider '{self.name}' unavailable after {attempt + 1} attempt(s): "
+                        f"{str(e) or 'deadline exceeded'}"
+                    ) from e
+                self._retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception:
+                self._failed += 1
+                raise
+
+        latency = loop.time() - started
+        self._succeeded += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
+        self._prompt_tokens += result.get("prompt_tokens", 0)
+        self._completion_tokens += result.get("completion_tokens", 0)
+        return result
+
+    async def _attempt(self, prompt: str, remaining: float) -> Dict[str, Any]:
+        """
+        One attempt: waits for a concurrency slot and calls the provider, within 'remaining' seconds.
+        """
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+
+        async def call():
+            self._waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+            try:
+                return await self.provider.generate(prompt)
+            finally:
+                self._in_flight -= 1
+                self._semaphore.release()
+
+        return await asyncio.wait_for(call(), timeout=remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns concurrency, outcome, token and latency metrics.
+        """
+        succeeded = self._succeeded or 1
+        return {
+            "provider": self.name,
+            "model": self.model_name,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "calls": self._calls,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "retries": self._retries,
+            "timeouts": self._timeouts,
+            "prompt_tokens": self._prompt_tokens,
+            "completion_tokens": self._completion_tokens,
+            "latency_avg_ms": round(self._latency_total / succeeded * 1000, 3),
+            "latency_max_ms": round(self._latency_max * 1000, 3),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+def parse_json_response(text: str) -> Dict[str, Any]:
+    """
+    Parses a JSON answer, removing the Markdown code fences LLMs often wrap it in.
+    """
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
@@ -0,0 +1,61 @@
+from typing import Any, Dict
+
+from ..ai_models_config import Config
+from .I_llm_provider import ILLMProvider
+from .managed_provider import ManagedLLMProvider
+from .response_cache import LLMResponseCache
+
+# Process-wide managed provider, created on first use (None when no LLM is configured)
+_llm: ManagedLLMProvider | None = None
+_configured = False
+
+
+def _build_provider() -> ILLMProvider | None:
+    """
+    Instantiates the configured backend: "gemini" (needs GOOGLE_API_KEY) or "local".
+    """
+    if Config.LLM_PROVIDER == "local":
+        from .local_provider import LocalProvider
+        return LocalProvider(latency=Config.LLM_LOCAL_LATENCY)
+    if Config.LLM_PROVIDER == "gemini" and Config.GOOGLE_API_KEY:
+        from .gemini_provider import GeminiProvider
+        return GeminiProvider(Config.GOOGLE_API_KEY, Config.LLM_MODEL, Config.LLM_TIMEOUT_SECONDS)
+    return None
+
+
+def get_llm() -> ManagedLLMProvider | None:
+    """
+    Returns the LLM provider shared by the strategies, or None if no LLM is available.
+    """
+    global _llm, _configured
+    if not _configured:
+        provider = _build_provider()
+        if provider is not None:
+            # Persistent cache of the answers (disabled with an empty LLM_CACHE_PATH)
+            cache = None
+            if Config.LLM_CACHE_PATH:
+                cache = LLMResponseCache(
+                    Config.LLM_CACHE_PATH, ttl_seconds=Config.LLM_CACHE_TTL_SECONDS,
+                    max_bytes=Config.LLM_CACHE_MAX_BYTES
+                )
+            _llm = ManagedLLMProvider(
+                provider, max_concurrency=Config.LLM_MAX_CONCURRENCY, timeout=Config.LLM_TIMEOUT_SECONDS,
+                max_retries=Config.LLM_MAX_RETRIES, cache=cache
+            )
+        _configured = True
+    return _llm
+
+
+def llm_stats() -> Dict[str, Any] | None:
+    """
+    Returns the metrics of the LLM provider, or None if it has not been used.
+    """
+    return _llm.stats() if _llm is not None else None
+
+
+def close_llm():
+    """
+    Releases the resources of the LLM provider (the cache database). Called on application shutdown.
+    """
+    if _llm is not None and _llm.cache is not None:
+        _llm.cache.close()
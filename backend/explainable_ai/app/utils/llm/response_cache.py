@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict
+
+
+def normalize_input(value: Any) -> str:
+    """
+    Canonical text of a prompt input: Unicode NFC with collapsed whitespace for strings,
+    sorted-key JSON for anything else, so equivalent inputs produce the same cache key.
+    """
+    if isinstance(value, str):
+        return " ".join(unicodedata.normalize("NFC", value).split())
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def llm_cache_key(model_name: str, template_version: str, *inputs: Any) -> str:
+    """
+    Cache key of an LLM answer: model name, prompt template version and the hash of the
+    normalized inputs the template is filled with. Raw inputs (e.g. clinical notes) are not stored.
+    """
+    input_hash = hashlib.sha256("\0".join(normalize_input(v) for v in inputs).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{model_name}\0{template_version}\0{input_hash}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Disk-backed cache of LLM answers (a SQLite file), shared by the worker processes of a host.
+    Entries expire 'ttl_seconds' after being stored; when the file holds more than 'max_bytes' of
+    answers, the least recently used ones are evicted. SQLite calls run in a worker thread, so the
+    event loop never waits on the disk.
+    The inputs of the prompts are only stored hashed (in the keys), but the answers are stored in
+    plaintext, and they are clinical content (generated diagnoses and explanations). The file is
+    created readable by its owner only; keep it on a volume protected like the reports database.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        # Entries and size of the file as of the last access of this process (kept in memory,
+        # so that reading the metrics never waits on the database)
+        self.entries = 0
+        self.size_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database (lazily) and creates its table.
+        """
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Create the file readable by its owner only (SQLite gives its WAL files the same mode)
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            # WAL: readers of other worker processes are not blocked by writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_used ON llm_responses (used_at)")
+            connection.commit()
+            self.entries, self.size_bytes = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT response, stored_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if now - row[1] > self.ttl_seconds:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                connection.commit()
+                self.expired += 1
+                self.entries -= 1
+                self.size_bytes -= len(row[0])
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            connection.execute("UPDATE llm_responses SET used_at = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def _put(self, key: str, response: Dict[str, Any]):
+        data = json.dumps(response)
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, size, stored_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?)", (key, data, len(data), now, now)
+            )
+            self.stores += 1
+
+            # Drop expired answers, then the least recently used ones beyond the size limit
+            connection.execute("DELETE FROM llm_responses WHERE stored_at < ?", (now - self.ttl_seconds,))
+            entries, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            evicted = 0
+            if size > self.max_bytes:
+                for old_key, old_size in connection.execute(
+                    "SELECT key, size FROM llm_responses ORDER BY used_at"
+                ).fetchall():
+                    if size <= self.max_bytes:
+                        break
+                    connection.execute("DELETE FROM llm_responses WHERE key = ?", (old_key,))
+                    size -= old_size
+                    evicted += 1
+                self.evictions += evicted
+            connection.commit()
+            self.entries, self.size_bytes = entries - evicted, size
+
+    async def get(self, key: str) -> Dict[str, Any] | None:
+        """
+        Returns the cached answer of a key, or None if missing or expired.
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, response: Dict[str, Any]):
+        """
+        Stores an answer, evicting expired and least recently used answers as needed.
+        """
+        await asyncio.to_thread(self._put, key, response)
+
+    def close(self):
+        """
+        Closes the database. Called on application shutdown.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns size and hit/miss counters (of this worker process), from memory.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
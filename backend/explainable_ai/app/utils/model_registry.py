@@ -0,0 +1,101 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+
+def _rss_bytes() -> int:
+    """
+    Returns the current resident set size of the process in bytes (0 if unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _parameter_bytes(model: Any) -> int | None:
+    """
+    Returns the size of the weights of a PyTorch module (or of the module wrapped
+    by a Hugging Face pipeline), or None for non-PyTorch models.
+    """
+    module = getattr(model, "model", model)
+    if not hasattr(module, "parameters") or not hasattr(module, "buffers"):
+        return None
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of the AI models used by the analysis strategies.
+    Models are loaded lazily on first use, exactly once per worker process,
+    and then shared by every request and strategy instance.
+    """
+
+    def __init__(self):
+        # Loader callables, loaded models and per-model load statistics, keyed by model name
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        # One lock per model so that slow loads do not block unrelated models
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """
+        Registers the loader used to build a model the first time it is requested.
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the model registered under the given name, loading it if needed.
+        """
+        if name in self._models:
+            return self._models[name]
+
+        if name not in self._loaders:
+            raise Exception(f"Model '{name}' is not registered")
+
+        with self._locks[name]:
+            # Another request may have completed the load while we were waiting
+            if name in self._models:
+                return self._models[name]
+
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = self._loaders[name]()
+            load_seconds = time.perf_counter() - start
+
+            self._stats[name] = {
+                "loaded": model is not None,
+                "load_seconds": round(load_seconds, 4),
+                "rss_delta_bytes": max(_rss_bytes() - rss_before, 0),
+                "parameter_bytes": _parameter_bytes(model) if model is not None else None,
+            }
+            self._models[name] = model
+            return model
+
+    def preload(self, names: Iterable[str]):
+        """
+        Eagerly loads the given models (e.g. at worker startup).
+        """
+        for name in names:
+            self.get(name)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the load statistics of every registered model.
+        """
+        return {
+            name: self._stats.get(name, {"loaded": False})
+            for name in self._loaders
+        }
+
+
+# Single registry shared by the whole worker process
+model_registry = ModelRegistry()
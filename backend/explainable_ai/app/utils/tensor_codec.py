@@ -0,0 +1,23 @@
+import io
+import numpy as np
+
+
+def decode_tensor(raw: bytes) -> np.ndarray:
+    """
+    Parses a binary .npy payload without copying the array data.
+    The returned array is a read-only view over 'raw'. Object arrays (which
+    would require pickle) are rejected.
+    """
+    buffer = io.BytesIO(raw)
+    version = np.lib.format.read_magic(buffer)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(buffer)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(buffer)
+
+    if dtype.hasobject:
+        raise Exception("Object arrays are not supported")
+
+    count = int(np.prod(shape)) if shape else 1
+    array = np.frombuffer(raw, dtype=dtype, count=count, offset=buffer.tell())
+    return array.reshape(shape, order="F" if fortran_order else "C")
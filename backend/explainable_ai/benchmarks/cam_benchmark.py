@@ -0,0 +1,149 @@
+"""
+Benchmark of the image heatmap explainers: GradCAM versus single-pass CAM.
+
+For CheXNet (DenseNet121) and SkinNet (EfficientNet-B0), measures per image:
+  - inference: the plain forward pass used for the diagnosis;
+  - gradcam:   inference + pytorch_grad_cam.GradCAM (second forward pass + backward pass);
+  - cam:       inference with a forward hook + class activation map from the linear head.
+Quality of CAM is reported against GradCAM on the same images and target classes:
+Pearson correlation of the maps, IoU of their top-20% regions, and distance of their peaks.
+
+Usage (from backend/explainable_ai):
+    python -m benchmarks.cam_benchmark [--images N] [--repeat N]
+
+The trained weights are used when they can be loaded (ai_models/*.pth), otherwise the
+architectures are randomly initialized (timings are unaffected, maps are less meaningful).
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torchvision import models
+from pytorch_grad_cam import GradCAM
+from pytorch_grad_cam.utils.model_targets import ClassifierOutputTarget
+
+from app.utils.ai_models_config import Config
+from app.utils.class_activation_map import forward_with_features, class_activation_map
+from app.services.strategies.image_strategy import _load_chexnet, _load_skinnet, NORM_SCALE, NORM_SHIFT, device
+
+
+def load(name: str):
+    """
+    Returns the model with its CAM settings (feature module, activation, linear head)
+    and whether the trained weights were loaded.
+    """
+    loader, labels = (_load_chexnet, Config.XRAY_LABELS) if name == "chexnet" else (_load_skinnet, Config.SKIN_LABELS)
+    try:
+        model, trained = loader(), True
+    except Exception:
+        model, trained = None, False
+    if model is None:
+        if name == "chexnet":
+            model = models.densenet121(weights=None)
+            model.classifier = torch.nn.Linear(model.classifier.in_features, len(labels))
+        else:
+            model = models.efficientnet_b0(weights=None)
+            model.classifier[1] = torch.nn.Linear(model.classifier[1].in_features, len(labels))
+        model, trained = model.to(device).eval(), False
+
+    if name == "chexnet":
+        return model, (model.features, F.relu, model.classifier), trained
+    return model, (model.features, None, model.classifier[1]), trained
+
+
+def synthetic_images(count: int, seed: int = 0) -> list:
+    """
+    Normalized 224x224 images with smooth structures (so that the maps have some spatial content).
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:224, 0:224].astype(np.float32)
+    images = []
+    for _ in range(count):
+        cx, cy, r = rng.uniform(50, 174), rng.uniform(50, 174), rng.uniform(15, 45)
+        blob = 200 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * r ** 2))
+        gray = np.clip(40 + blob + rng.normal(0, 10, (224, 224)), 0, 255).astype(np.uint8)
+        pixels = torch.from_numpy(np.repeat(gray[None, None], 3, axis=1)).to(device)
+        images.append(torch.addcmul(NORM_SHIFT, pixels.float(), NORM_SCALE))
+    return images
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def run_inference(model, tensor):
+    with torch.no_grad():
+        return model(tensor)
+
+
+def run_gradcam(model, tensor):
+    idx = int(run_inference(model, tensor).argmax())
+    cam = GradCAM(model=model, target_layers=[model.features[-1]])
+    return cam(input_tensor=tensor, targets=[ClassifierOutputTarget(idx)])[0], idx
+
+
+def run_cam(model, settings, tensor):
+    feature_module, activation, head = settings
+    with torch.no_grad():
+        logits, features = forward_with_features(model, feature_module, tensor, activation)
+    idx = int(logits.argmax())
+    return class_activation_map(features[0], head, idx, (224, 224)), idx
+
+
+def compare(cam_map: np.ndarray, gradcam_map: np.ndarray) -> tuple[float, float, float]:
+    """
+    Returns the Pearson correlation, the IoU of the top-20% pixels, and the peak distance (pixels).
+    """
+    a, b = cam_map.ravel(), gradcam_map.ravel()
+    correlation = float(np.corrcoef(a, b)[0, 1]) if a.std() > 0 and b.std() > 0 else float("nan")
+    top_a, top_b = a >= np.quantile(a, 0.8), b >= np.quantile(b, 0.8)
+    iou = float((top_a & top_b).sum() / max((top_a | top_b).sum(), 1))
+    peak_a = np.array(np.unravel_index(cam_map.argmax(), cam_map.shape))
+    peak_b = np.array(np.unravel_index(gradcam_map.argmax(), gradcam_map.shape))
+    return correlation, iou, float(np.linalg.norm(peak_a - peak_b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=8, help="Synthetic images per model")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per image (median reported)")
+    args = parser.parse_args()
+
+    images = synthetic_images(args.images)
+    print(f"device={device}, torch threads={torch.get_num_threads()}, images={args.images}")
+
+    for name in ("chexnet", "skinnet"):
+        model, settings, trained = load(name)
+        # Warm-up
+        run_gradcam(model, images[0])
+        run_cam(model, settings, images[0])
+
+        timings = {"inference": [], "gradcam": [], "cam": []}
+        quality = []
+        for tensor in images:
+            timings["inference"].append(median_ms(lambda: run_inference(model, tensor), args.repeat))
+            timings["gradcam"].append(median_ms(lambda: run_gradcam(model, tensor), args.repeat))
+            timings["cam"].append(median_ms(lambda: run_cam(model, settings, tensor), args.repeat))
+            cam_map, cam_idx = run_cam(model, settings, tensor)
+            gradcam_map, gradcam_idx = run_gradcam(model, tensor)
+            assert cam_idx == gradcam_idx
+            quality.append(compare(cam_map, gradcam_map))
+
+        inference = np.median(timings["inference"])
+        print(f"\n{name} ({'trained' if trained else 'random'} weights)")
+        for explainer in ("inference", "gradcam", "cam"):
+            ms = np.median(timings[explainer])
+            print(f"  {explainer:<10} {ms:8.1f} ms/image  (x{ms / inference:.2f} of inference)")
+        correlation, iou, distance = np.nanmean(np.array(quality), axis=0)
+        print(f"  CAM vs GradCAM: correlation {correlation:.3f}, top-20% IoU {iou:.3f}, peak distance {distance:.1f} px")
+
+
+if __name__ == "__main__":
+    main()
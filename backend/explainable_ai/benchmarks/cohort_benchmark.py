@@ -0,0 +1,157 @@
+"""
+Benchmark of cohort scoring (POST /explainable_ai/cohort/{doctor_id}) on the heart disease model.
+
+Measures the throughput, in patients per second, of each stage of the endpoint:
+  - parse:   JSON, CSV and Arrow bodies into a float32 (patients, features) matrix;
+  - score:   one vectorized prediction with contributions and the top-k drivers per chunk,
+             with "approx" (per-path) and "exact" (TreeSHAP) contributions;
+  - format:  the NDJSON lines streamed back;
+  - persist: the bulk insert of the reports (only with --persist, needs the database
+             configured through the POSTGRES_* variables; the rows are deleted afterwards).
+Agreement of the approximate top-k drivers with the exact ones is reported as well.
+
+Usage (from backend/explainable_ai):
+    python -m benchmarks.cohort_benchmark [--patients N] [--top-k K] [--persist]
+
+The trained model is used when it can be loaded, otherwise a synthetic one (see
+numeric_explainer_benchmark).
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+
+import numpy as np
+
+from app.utils.ai_models_config import Config
+from app.utils.cohort_parser import parse_cohort, JSON_CONTENT_TYPE, CSV_CONTENT_TYPE, ARROW_CONTENT_TYPE
+from app.services.strategies.numeric_strategy import (
+    NumericAnalysisStrategy, native_contributions, top_drivers, cohort_ndjson
+)
+from benchmarks.numeric_explainer_benchmark import load_model
+
+# Doctor ID of the benchmark reports (deleted at the end of the run)
+BENCHMARK_DOCTOR_ID = -1
+
+
+def bodies(patients: list, matrix: np.ndarray) -> dict:
+    """
+    Encodes the cohort in the three supported formats.
+    """
+    features = Config.HEART_FEATURES
+    csv_lines = [",".join(["patient_hashed_cf", *features])]
+    csv_lines += [f"{p}," + ",".join(map(repr, row)) for p, row in zip(patients, matrix.tolist())]
+    encoded = {
+        JSON_CONTENT_TYPE: json.dumps({"patient_hashed_cf": patients, "features": matrix.tolist()}).encode(),
+        CSV_CONTENT_TYPE: "\n".join(csv_lines).encode(),
+    }
+    try:
+        import pyarrow as pa
+        table = pa.table({"patient_hashed_cf": patients, **{f: matrix[:, i] for i, f in enumerate(features)}})
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        encoded[ARROW_CONTENT_TYPE] = sink.getvalue()
+    except ImportError:
+        pass
+    return encoded
+
+
+def rate(n: int, fn, repeat: int = 3) -> tuple[float, object]:
+    """
+    Best-of-'repeat' throughput (patients/s) of fn() and its last result.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return n / best, result
+
+
+async def persist_rate(patients: list, results: list) -> float:
+    """
+    Throughput of the bulk insert, chunk by chunk like the endpoint.
+    """
+    from sqlalchemy import delete
+    from app.models.report_model import Report
+    from app.repositories.report_repository import ReportRepository
+    from app.utils.db_connection import async_session, engine
+
+    engine.echo = False
+    chunk_size = Config.COHORT_CHUNK_SIZE
+    async with async_session() as session:
+        repository = ReportRepository(session)
+        start = time.perf_counter()
+        for i in range(0, len(patients), chunk_size):
+            await repository.save_many([
+                (BENCHMARK_DOCTOR_ID, patient, None, "numeric", diagnosis, risk, drivers)
+                for patient, (diagnosis, risk, drivers) in zip(patients[i:i + chunk_size], results[i:i + chunk_size])
+            ])
+        elapsed = time.perf_counter() - start
+        await session.execute(delete(Report).where(Report.doctor_id == BENCHMARK_DOCTOR_ID))
+        await session.commit()
+    await engine.dispose()
+    return len(patients) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--persist", action="store_true", help="also measure the bulk insert")
+    args = parser.parse_args()
+
+    model, trained = load_model()
+    strategy = NumericAnalysisStrategy.__new__(NumericAnalysisStrategy)
+    strategy.model, strategy.explainer = model, None
+    booster = model.get_booster()
+
+    rng = np.random.default_rng(1)
+    n = args.patients
+    patients = [f"{i:064x}" for i in range(n)]
+    matrix = rng.normal(size=(n, len(Config.HEART_FEATURES))).round(3)
+    print(f"model: {'trained' if trained else 'synthetic'}, {n} patients, top-{args.top_k}, "
+          f"chunks of {Config.COHORT_CHUNK_SIZE}")
+
+    print("\nparse")
+    for content_type, body in bodies(patients, matrix).items():
+        patients_per_s, (_, parsed) = rate(n, lambda: parse_cohort(body, content_type, Config.HEART_FEATURES))
+        print(f"  {content_type:38s} {len(body) / n:6.0f} B/patient {patients_per_s:>12,.0f} patients/s")
+    matrix = parsed
+
+    chunks = [matrix[i:i + Config.COHORT_CHUNK_SIZE] for i in range(0, n, Config.COHORT_CHUNK_SIZE)]
+    print("\nscore (prediction, contributions, top-k drivers as JSON)")
+    results = None
+    for mode in ("approx", "exact"):
+        approximate = mode == "approx"
+        patients_per_s, scored = rate(
+            n, lambda: [r for chunk in chunks for r in strategy.score_cohort(chunk, args.top_k, approximate)],
+            repeat=1
+        )
+        results = results or scored
+        print(f"  {mode:38s} {patients_per_s:>26,.0f} patients/s")
+
+    # Agreement of the approximate drivers with the exact TreeSHAP ones
+    sample = matrix[:5000]
+    exact = top_drivers(native_contributions(booster, sample)[1], args.top_k)
+    approx = top_drivers(native_contributions(booster, sample, approximate=True)[1], args.top_k)
+    same_set = np.mean([len(set(a) & set(e)) / args.top_k for a, e in zip(approx.tolist(), exact.tolist())])
+    print(f"  top-{args.top_k} drivers shared by approx and exact: {same_set:.1%}, "
+          f"same top-1: {np.mean(approx[:, 0] == exact[:, 0]):.1%}")
+
+    print("\nformat")
+    patients_per_s, _ = rate(n, lambda: [
+        cohort_ndjson(patients[i:i + len(c)], [None] * len(c), results[i:i + len(c)])
+        for i, c in zip(range(0, n, Config.COHORT_CHUNK_SIZE), chunks)
+    ])
+    print(f"  {'ndjson':38s} {patients_per_s:>26,.0f} patients/s")
+
+    if args.persist:
+        print("\npersist")
+        print(f"  {'COPY':38s} {asyncio.run(persist_rate(patients, results)):>26,.0f} patients/s")
+
+
+if __name__ == "__main__":
+    main()
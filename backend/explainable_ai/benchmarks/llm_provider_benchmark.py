@@ -0,0 +1,146 @@
+"""
+Benchmark of the LLM provider layer, run offline with the local stand-in provider.
+
+Concurrent analyses each make one LLM call of a fixed simulated latency while a probe task
+measures how late the event loop wakes it up (what every other request of the worker feels):
+  - blocking: the previous behaviour, a synchronous call (time.sleep) inside the coroutine;
+  - managed:  ManagedLLMProvider around the asynchronous local provider, at several
+              concurrency caps.
+A second run injects transient failures to show the retries (with jittered backoff) and the
+resulting success rate. A last run replays analyses (a share of them repeated) through the
+persistent response cache, reporting its hit rate and the latency of hits and misses.
+
+Usage (from backend/explainable_ai):
+    python -m benchmarks.llm_provider_benchmark [--calls N] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from app.utils.llm.I_llm_provider import LLMUnavailableError
+from app.utils.llm.local_provider import LocalProvider
+from app.utils.llm.managed_provider import ManagedLLMProvider, parse_json_response
+from app.utils.llm.response_cache import LLMResponseCache, llm_cache_key
+
+# Interval of the event loop probe (seconds)
+PROBE_INTERVAL = 0.01
+
+
+async def probe(lags: list, stop: asyncio.Event):
+    """
+    Sleeps PROBE_INTERVAL in a loop and records how late each wake-up is.
+    """
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(loop.time() - expected)
+
+
+async def run(calls: int, generate) -> tuple[float, float, int]:
+    """
+    Runs 'calls' concurrent generations. Returns the wall time, the maximum event loop lag
+    and the number of failed generations.
+    """
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(generate(f"prompt {i}") for i in range(calls)), return_exceptions=True)
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    failed = sum(isinstance(r, Exception) for r in results)
+    return wall, max(lags, default=0.0), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated LLM latency (seconds)")
+    args = parser.parse_args()
+
+    local = LocalProvider()
+
+    async def blocking(prompt: str):
+        # Synchronous client inside 'async def': the event loop is stuck for the whole call
+        time.sleep(args.latency)
+        return await local.generate(prompt)
+
+    print(f"{args.calls} concurrent generations, {args.latency * 1000:.0f} ms each\n")
+    print(f"{'mode':24s} {'wall (s)':>9s} {'max loop lag (ms)':>18s} {'failed':>7s}")
+    wall, lag, failed = asyncio.run(run(args.calls, blocking))
+    print(f"{'blocking':24s} {wall:9.2f} {lag * 1000:18.1f} {failed:7d}")
+    for concurrency in (4, 16, args.calls):
+        managed = ManagedLLMProvider(LocalProvider(latency=args.latency), max_concurrency=concurrency, timeout=60)
+        wall, lag, failed = asyncio.run(run(args.calls, managed.generate))
+        print(f"{f'managed, {concurrency} in flight':24s} {wall:9.2f} {lag * 1000:18.1f} {failed:7d}")
+
+    print("\ntransient failures (30% of the attempts), 16 in flight")
+    for retries in (0, 3):
+        managed = ManagedLLMProvider(
+            LocalProvider(latency=args.latency, failure_rate=0.3, seed=1), max_concurrency=16, timeout=10,
+            max_retries=retries, backoff_base=0.05
+        )
+        wall, lag, failed = asyncio.run(run(args.calls, managed.generate))
+        stats = managed.stats()
+        print(f"  {retries} retries: {args.calls - failed}/{args.calls} succeeded in {wall:.2f} s, "
+              f"{stats['retries']} retries, latency avg {stats['latency_avg_ms']:.0f} ms "
+              f"max {stats['latency_max_ms']:.0f} ms, {stats['prompt_tokens']} prompt tokens")
+
+    # Deadline: a provider slower than the timeout fails fast instead of hanging the request
+    managed = ManagedLLMProvider(LocalProvider(latency=5), timeout=0.3, max_retries=2)
+    start = time.perf_counter()
+    try:
+        asyncio.run(managed.generate("slow"))
+    except LLMUnavailableError as e:
+        print(f"\ndeadline 0.3 s on a 5 s provider: failed after {time.perf_counter() - start:.2f} s ({e})")
+
+    cache_benchmark(args.latency)
+
+
+async def cached_run(managed: ManagedLLMProvider, notes: list) -> tuple[list, list]:
+    """
+    Analyses the notes one after the other through the cache; returns hit and miss latencies.
+    """
+    hits, misses = [], []
+    for note in notes:
+        start = time.perf_counter()
+        result = await managed.generate(
+            f"Explain: {note}", cache_key=llm_cache_key(managed.model_name, "benchmark-v1", note),
+            validate=parse_json_response
+        )
+        (hits if result.get("cached") else misses).append(time.perf_counter() - start)
+    return hits, misses
+
+
+def cache_benchmark(latency: float):
+    """
+    200 analyses of 100 distinct notes (with extra whitespace on some repeats), in random order.
+    """
+    rng = random.Random(0)
+    notes = [f"patient note {i}" for i in range(100)]
+    notes += [f"  patient   note {rng.randrange(100)} " for _ in range(100)]
+    rng.shuffle(notes)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LLMResponseCache(os.path.join(directory, "responses.sqlite3"))
+        managed = ManagedLLMProvider(LocalProvider(latency=latency), cache=cache)
+        start = time.perf_counter()
+        hits, misses = asyncio.run(cached_run(managed, notes))
+        wall = time.perf_counter() - start
+        stats = managed.stats()
+        cache.close()
+    print(f"\nresponse cache, {len(notes)} sequential analyses of 100 distinct notes")
+    print(f"  provider calls {stats['calls']}, cache hit rate {stats['cache']['hit_rate']:.0%}, "
+          f"wall {wall:.2f} s (uncached: {len(notes) * latency:.2f} s)")
+    print(f"  hit  latency median {sorted(hits)[len(hits) // 2] * 1000:.2f} ms" if hits else "  no hit")
+    print(f"  miss latency median {sorted(misses)[len(misses) // 2] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
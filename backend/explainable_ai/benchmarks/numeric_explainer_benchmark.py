@@ -0,0 +1,102 @@
+"""
+Benchmark of the numeric (heart disease) explanation paths.
+
+Compares, per single-row request:
+  - shap:   one-row pandas DataFrame, predict_proba and shap.TreeExplainer.shap_values;
+  - native: float32 NumPy row, one XGBoost prediction with pred_contribs.
+Parity is checked on random rows: maximum absolute difference of the probabilities and of
+the per-feature contributions, and agreement of the resulting feature ranking.
+The one-off import cost of shap and pandas is measured in a fresh interpreter.
+
+Usage (from backend/explainable_ai):
+    python -m benchmarks.numeric_explainer_benchmark [--rows N] [--repeat N]
+
+The trained model is used when it can be loaded (ai_models/xgboost_heart.joblib), otherwise
+an XGBClassifier with the same 18 features is trained on synthetic data.
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import shap
+from xgboost import XGBClassifier
+
+from app.utils.ai_models_config import Config
+from app.services.strategies.numeric_strategy import _load_heart_model, native_contributions, ranked_explanation
+
+
+def load_model():
+    """
+    Returns the heart model and whether it is the trained one.
+    """
+    model = _load_heart_model()
+    if model is not None:
+        return model, True
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(2000, len(Config.HEART_FEATURES))), columns=Config.HEART_FEATURES)
+    y = (X["age"] + X["chol"] - X["thalch"] + rng.normal(0, 0.5, len(X)) > 0).astype(int)
+    return XGBClassifier(n_estimators=100, max_depth=4).fit(X, y), False
+
+
+def shap_path(model, explainer, row):
+    input_df = pd.DataFrame([row], columns=Config.HEART_FEATURES)
+    prob = float(model.predict_proba(input_df)[0][1])
+    values = explainer.shap_values(input_df)
+    return prob, (values[1][0] if isinstance(values, list) else values[0])
+
+
+def median_us(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return float(np.median(timings))
+
+
+def import_ms(statement: str) -> float:
+    code = f"import time; s = time.perf_counter(); {statement}; print((time.perf_counter() - s) * 1000)"
+    return float(subprocess.check_output([sys.executable, "-c", code], text=True).strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200, help="Random rows checked for parity")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per path (median reported)")
+    args = parser.parse_args()
+
+    model, trained = load_model()
+    booster = model.get_booster()
+    explainer = shap.TreeExplainer(model)
+    rows = np.random.default_rng(1).normal(size=(args.rows, len(Config.HEART_FEATURES))).astype(np.float32)
+    print(f"{'trained' if trained else 'synthetic'} model, {booster.num_boosted_rounds()} trees")
+
+    # Parity
+    prob_diff, contrib_diff, same_ranking = 0.0, 0.0, 0
+    for row in rows:
+        shap_prob, shap_values = shap_path(model, explainer, row)
+        native_probs, native_contribs = native_contributions(booster, row[None, :])
+        native_prob, native_values = float(native_probs[0]), native_contribs[0]
+        prob_diff = max(prob_diff, abs(shap_prob - native_prob))
+        contrib_diff = max(contrib_diff, float(np.max(np.abs(shap_values - native_values))))
+        ranking = [item["Feature"] for item in ranked_explanation(row, native_values)[:5]]
+        same_ranking += ranking == [item["Feature"] for item in ranked_explanation(row, shap_values)[:5]]
+    print(f"parity on {args.rows} rows: max |dprob| {prob_diff:.2e}, max |dcontribution| {contrib_diff:.2e}, "
+          f"same top-5 ranking {same_ranking}/{args.rows}")
+
+    # Latency (one row per request)
+    row = rows[0]
+    shap_us = median_us(lambda: shap_path(model, explainer, row), args.repeat)
+    native_us = median_us(lambda: native_contributions(booster, row[None, :]), args.repeat)
+    print(f"shap path   {shap_us:9.1f} us/request")
+    print(f"native path {native_us:9.1f} us/request  (x{shap_us / native_us:.1f} faster)")
+
+    print(f"import shap + pandas: {import_ms('import pandas, shap'):.0f} ms, import xgboost: {import_ms('import xgboost'):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
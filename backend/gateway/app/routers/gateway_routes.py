@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Header, Response, Request
+from fastapi.responses import StreamingResponse
 # Import schemas for request and response models related to authentication and XAI analysis
-from ..schemas.auth_schema import RegisterResponse, RegisterRequest, LoginResponse, LoginRequest
-from ..schemas.xai_schema import AnalyseResponse, AnalyseRequest, GetReportsResponse
+from ..schemas.auth_schema import RegisterResponse, RegisterRequest, LoginResponse, LoginRequest, LogoutResponse
+from ..schemas.metrics_schema import MetricsResponse
+from ..schemas.xai_schema import AnalyseResponse, AnalyseRequest, GetReportsResponse, GetReportResponse, \
+    WhatIfRequest, WhatIfResponse
 
 # Import utility functions for dependency injection (service retrieval and JWT handling)
 from ..utils.dependencies import get_gateway_service, get_jwt
+from ..utils.http_client import UpstreamHTTPError
 
 # Import the Gateway service class
 from ..services.gateway_service import Gateway
@@ -42,17 +46,133 @@ async def analyse(
     try:
         # Call the analyse method of the gateway service, passing the JWT and the analysis request data
         return await gateway_service.analyse(jwt=jwt, analyse_request=analyse_body)
+    except HTTPException:
+        raise
+    except UpstreamHTTPError as e:
+        # Relay the status of the downstream services (e.g. 503 and Retry-After when the models are saturated)
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers or None)
     except Exception as e:
         # Raise an HTTP 400 exception if an error occurs during the analysis process
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/whatif", response_model=WhatIfResponse)
+async def what_if(
+    what_if_body: WhatIfRequest, jwt: str = Depends(get_jwt), gateway_service: Gateway = Depends(get_gateway_service)) -> WhatIfResponse:
+    # Endpoint to explore how the heart disease risk changes when some features vary.
+    # Requires a valid JWT token. Nothing is saved: meant for interactive exploration (e.g. sliders).
+    try:
+        return await gateway_service.what_if(jwt=jwt, what_if_request=what_if_body)
+    except HTTPException:
+        raise
+    except UpstreamHTTPError as e:
+        # Relay the status of the downstream services (e.g. 503 and Retry-After when the models are saturated)
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers or None)
+    except Exception as e:
+        # Raise an HTTP 400 exception if the exploration fails (e.g., unknown feature)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/cohort")
+async def score_cohort(
+    request: Request, top_k: int = Query(5, ge=1, le=18), persist: bool = Query(True),
+    jwt: str = Depends(get_jwt), gateway_service: Gateway = Depends(get_gateway_service)) -> StreamingResponse:
+    # Endpoint to score a cohort of patients with the heart disease model.
+    # Requires a valid JWT token. The body is a matrix of heart features (JSON, CSV or Arrow);
+    # the response streams one NDJSON line per patient (risk and top-k drivers).
+    try:
+        stream = await gateway_service.score_cohort(
+            jwt=jwt, body=await request.body(), content_type=request.headers.get("content-type"),
+            top_k=top_k, persist=persist
+        )
+    except HTTPException:
+        raise
+    except UpstreamHTTPError as e:
+        # Relay the status of the XAI service (400 malformed, 413 too large, 415 format, 503 saturated)
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers or None)
+    except Exception as e:
+        # Raise an HTTP 400 exception if the cohort is rejected
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
 @router.get("/reports", response_model=GetReportsResponse)
-async def get_reports(jwt: str = Depends(get_jwt), patient_hashed_cf: str | None = Query(None), gateway_service: Gateway = Depends(get_gateway_service)) -> GetReportsResponse:
-    # Endpoint to retrieve reports.
-    # Requires a valid JWT token. Optionally filters by patient's hashed tax code (CF).
+async def get_reports(
+    jwt: str = Depends(get_jwt), patient_hashed_cf: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=1000), offset: int = Query(0, ge=0),
+    gateway_service: Gateway = Depends(get_gateway_service)) -> GetReportsResponse:
+    # Endpoint to retrieve reports, most recent first.
+    # Requires a valid JWT token. Optionally filters by patient's hashed tax code (CF)
+    # and pages the results with limit/offset.
     try:
-        # Call the get_reports method of the gateway service with the JWT and optional patient identifier
-        return await gateway_service.get_reports(jwt=jwt, patient_hashed_cf=patient_hashed_cf)
+        # Call the get_reports method of the gateway service with the JWT, optional patient identifier and page
+        return await gateway_service.get_reports(jwt=jwt, patient_hashed_cf=patient_hashed_cf, limit=limit, offset=offset)
+    except HTTPException:
+        # e.g. 401 for a rejected token
+        raise
     except Exception as e:
         # Raise an HTTP 400 exception if an error occurs while retrieving reports
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{report_id}", response_model=GetReportResponse)
+async def get_report(report_id: int = Path(...), jwt: str = Depends(get_jwt), gateway_service: Gateway = Depends(get_gateway_service)) -> GetReportResponse:
+    # Endpoint to retrieve a single report, including its explanation (e.g. heatmap).
+    # Requires a valid JWT token: only the reports of the authenticated doctor are accessible.
+    try:
+        return await gateway_service.get_report(jwt=jwt, report_id=report_id)
+    except HTTPException:
+        # e.g. 401 for a rejected token
+        raise
+    except Exception as e:
+        # Raise an HTTP 400 exception if an error occurs while retrieving the report
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{report_id}/explanation", response_model=GetReportResponse)
+async def wait_explanation(
+    report_id: int = Path(...), wait: float = Query(0, ge=0, le=25), jwt: str = Depends(get_jwt),
+    gateway_service: Gateway = Depends(get_gateway_service)) -> GetReportResponse:
+    # Endpoint to retrieve a report once its deferred explanation is ready (long polling).
+    # Answers as soon as explanation_status is no longer 'pending', or after 'wait' seconds.
+    try:
+        return await gateway_service.wait_explanation(jwt=jwt, report_id=report_id, wait=wait)
+    except HTTPException:
+        # e.g. 401 for a rejected token
+        raise
+    except Exception as e:
+        # Raise an HTTP 400 exception if an error occurs while retrieving the report
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/{report_id}/artifact")
+async def get_report_artifact(
+    report_id: int = Path(...), if_none_match: str | None = Header(None), jwt: str = Depends(get_jwt),
+    gateway_service: Gateway = Depends(get_gateway_service)) -> Response:
+    # Endpoint to retrieve the binary explanation of a report (e.g. its heatmap image).
+    # Requires a valid JWT token. Artifacts are immutable: the ETag lets the browser
+    # revalidate its cached copy with If-None-Match and receive 304 Not Modified.
+    try:
+        etag, media_type, content = await gateway_service.get_report_artifact(
+            jwt=jwt, report_id=report_id, if_none_match=if_none_match
+        )
+    except HTTPException:
+        # e.g. 401 for a rejected token
+        raise
+    except UpstreamHTTPError as e:
+        # Relay the status of the XAI service (404 when the report or its artifact is not available)
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers or None)
+    except Exception as e:
+        # Raise an HTTP 502 exception if the downstream services cannot be reached
+        raise HTTPException(status_code=502, detail=str(e))
+
+    # Private: the artifacts contain patient data and must not be stored by shared caches
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if content is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+@router.post("/logout", response_model=LogoutResponse)
+async def logout(jwt: str = Depends(get_jwt), gateway_service: Gateway = Depends(get_gateway_service)) -> LogoutResponse:
+    # Endpoint to log out a user.
+    # Revokes the JWT token until it expires (subsequent requests with it get a 401).
+    return gateway_service.logout(jwt)
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def metrics(gateway_service: Gateway = Depends(get_gateway_service)) -> MetricsResponse:
+    # Endpoint to retrieve the gateway metrics (token validation cache hits/misses).
+    return gateway_service.metrics()
@@ -35,4 +35,10 @@ class LoginResponse(BaseModel):
     Contains the JWT token for authentication.
     """
     message: str
-    jwt_token: str
\ No newline at end of file
+    jwt_token: str
+
+class LogoutResponse(BaseModel):
+    """
+    Schema for the response returned after a logout.
+    """
+    message: str
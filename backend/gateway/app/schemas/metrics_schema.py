@@ -0,0 +1,9 @@
+from typing import Any, Dict
+from pydantic import BaseModel
+
+class MetricsResponse(BaseModel):
+    """
+    Schema for the response returned by the metrics endpoint.
+    """
+    message: str = "Metrics retrieved successfully"
+    metrics: Dict[str, Any]
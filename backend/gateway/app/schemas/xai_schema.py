@@ -1,7 +1,7 @@
 # Import Pydantic models and standard types
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List
+from typing import List, Dict
 
 class ReportItem(BaseModel):
     """
@@ -10,12 +10,33 @@ class ReportItem(BaseModel):
     id: int
     doctor_id: int
     patient_hashed_cf: str
-    processed_data_id: int
+    # None for reports of a scored cohort
+    processed_data_id: int | None = None
     created_at: datetime
     strategy: str
     diagnosis: str
     confidence: float
     explanation: str
+    # Key of the binary explanation (heatmap), served by /reports/{report_id}/artifact
+    explanation_artifact: str | None = None
+    # 'ready', or 'pending'/'failed' for explanations computed in background
+    explanation_status: str = "ready"
+
+class ReportSummary(BaseModel):
+    """
+    Schema representing a report item without its explanation (used in listings).
+    """
+    id: int
+    doctor_id: int
+    patient_hashed_cf: str
+    # None for reports of a scored cohort
+    processed_data_id: int | None = None
+    created_at: datetime
+    strategy: str
+    diagnosis: str
+    confidence: float
+    explanation_artifact: str | None = None
+    explanation_status: str = "ready"
 
 class AnalyseRequest(BaseModel):
     """
@@ -24,6 +45,8 @@ class AnalyseRequest(BaseModel):
     patient_hashed_cf: str
     strategy: str
     raw_data: str
+    # Return the report before its (expensive) explanation is computed, e.g. the GradCAM heatmap
+    defer_explanation: bool | None = None
 
 class AnalyseResponse(BaseModel):
     """
@@ -38,5 +61,32 @@ class GetReportsResponse(BaseModel):
     Schema for the response when retrieving a list of reports.
     """
     message: str
-    # List of ReportItem objects
-    reports: List[ReportItem]
\ No newline at end of file
+    # List of report summaries (the explanation is retrieved per report)
+    reports: List[ReportSummary]
+
+class GetReportResponse(BaseModel):
+    """
+    Schema for the response when retrieving a single report with its explanation.
+    """
+    message: str
+    report: ReportItem
+
+class WhatIfRequest(BaseModel):
+    """
+    Schema for the request body of a what-if exploration of the heart disease risk.
+    """
+    # Base feature vector (the 18 heart features, in the order of the numeric analysis)
+    features: List[float]
+    # Values to try per feature (e.g. {"chol": [180, 200, 220]}); all combinations are evaluated
+    grid: Dict[str, List[float]] = Field(min_length=1, max_length=3)
+
+class WhatIfResponse(BaseModel):
+    """
+    Schema for the response of a what-if exploration (nothing is saved).
+    """
+    message: str
+    base_risk: float
+    features: List[str]
+    axes: List[List[float]]
+    # Risk of each variant, nested like the axes
+    risk: list
@@ -1,25 +1,111 @@
 # Import the os module to access environment variables (e.g., service URLs)
 import os
+from urllib.parse import urlencode
 
 # Import FastAPI components for handling HTTP headers and raising exceptions
 from fastapi import Header, HTTPException
 
 # Import Pydantic schemas for authentication-related requests and responses
-from app.schemas.auth_schema import RegisterRequest, RegisterResponse, LoginRequest, LoginResponse
+from app.schemas.auth_schema import RegisterRequest, RegisterResponse, LoginRequest, LoginResponse, LogoutResponse
+
+# Import the error raised for the error statuses of the downstream services
+from app.utils.http_client import UpstreamHTTPError
+
+# Import the Pydantic schema for service metrics
+from app.schemas.metrics_schema import MetricsResponse
 
 # Import Pydantic schemas for XAI (Explainable AI) analysis requests and responses
-from app.schemas.xai_schema import AnalyseRequest, AnalyseResponse, GetReportsResponse
+from app.schemas.xai_schema import AnalyseRequest, AnalyseResponse, GetReportsResponse, GetReportResponse, \
+    WhatIfRequest, WhatIfResponse
 
 class Gateway:
     # Service class responsible for orchestrating requests between the client
     # and the internal microservices (Authentication, Data Processing, Explainable AI).
-    def __init__(self, http_client):
+    def __init__(self, http_client, token_cache=None, jwt_verifier=None, artifact_cache=None, deny_list=None):
         # Retrieve microservice URLs from environment variables
         self.auth_url = os.getenv("AUTHENTICATION_URL")
         self.xai_url = os.getenv("EXPLAINABLE_AI_URL")
         self.data_url = os.getenv("DATA_PROCESSING_URL")
         # Injected HTTP client for making asynchronous requests
         self.http = http_client
+        # Optional cache of validated tokens (skips the /validate round trip on repeats)
+        self.token_cache = token_cache
+        # Optional local verifier of asymmetrically signed tokens (public keys from /jwks)
+        self.jwt_verifier = jwt_verifier
+        # Optional list of logged out tokens, refused until they expire
+        self.deny_list = deny_list
+        # Optional cache of report artifacts (heatmaps), revalidated against the XAI service
+        self.artifact_cache = artifact_cache
+
+    async def _validate_jwt(self, jwt: str) -> int:
+        """
+        Returns the doctor_id of a valid JWT.
+        Tokens signed with an asymmetric key are verified locally, the others by the
+        Authentication service. Successful validations are cached, so repeated calls with
+        the same token (e.g. the frontend polling /reports) skip both.
+        Logged out tokens are refused before either, since a valid signature alone
+        does not tell that the doctor has logged out.
+        """
+        if self.deny_list is not None and self.deny_list.contains(jwt):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
+
+        if self.token_cache is not None:
+            doctor_id = self.token_cache.get(jwt)
+            if doctor_id is not None:
+                return doctor_id
+
+        if self.jwt_verifier is not None and self.jwt_verifier.can_verify(jwt):
+            # Verify signature and expiration locally with the cached public keys
+            try:
+                payload = await self.jwt_verifier.verify(jwt)
+                doctor_id = int(payload["sub"])
+            except HTTPException:
+                raise
+            except Exception as e:
+                # Expired, forged or signed with an unknown key
+                raise HTTPException(status_code=401, detail=str(e))
+        else:
+            # Validate the JWT token with the Authentication service
+            try:
+                jwt_valid_res = await self.http.request(
+                    "POST",
+                    f"{self.auth_url}/validate",
+                    json={"token": jwt}
+                )
+            except UpstreamHTTPError as e:
+                if e.status_code != 401:
+                    raise
+                raise HTTPException(status_code=401, detail=str(e))
+
+            # Extract doctor_id from validation response
+            doctor_id = jwt_valid_res.get("doctor_id")
+
+        if doctor_id is None:
+            # Raise 401 if the token is invalid or doctor_id is missing
+            raise HTTPException(status_code=401, detail="Invalid authorization header")
+
+        if self.token_cache is not None:
+            self.token_cache.put(jwt, doctor_id)
+        return doctor_id
+
+    def logout(self, jwt: str) -> LogoutResponse:
+        """
+        Revokes the token until it expires and drops it from the validation cache.
+        """
+        if self.deny_list is not None:
+            self.deny_list.add(jwt)
+        if self.token_cache is not None:
+            self.token_cache.invalidate(jwt)
+        return LogoutResponse(message="Logout successful")
+
+    def metrics(self) -> MetricsResponse:
+        """
+        Returns the token validation cache, deny-list and artifact cache metrics.
+        """
+        token_cache = self.token_cache.stats() if self.token_cache is not None else None
+        deny_list = self.deny_list.stats() if self.deny_list is not None else None
+        artifact_cache = self.artifact_cache.stats() if self.artifact_cache is not None else None
+        return MetricsResponse(metrics={"token_cache": token_cache, "deny_list": deny_list, "artifact_cache": artifact_cache})
 
     async def register(self, register_request: RegisterRequest) -> RegisterResponse:
         # Forwards the registration request to the Authentication service.
@@ -48,22 +134,12 @@ class Gateway:
     async def analyse(self, jwt: str, analyse_request: AnalyseRequest) -> AnalyseResponse:
         """
         Orchestrates the analysis workflow:
-        1. Validates the JWT with the Auth service.
+        1. Validates the JWT (cached, or with the Auth service).
         2. Sends raw data to the Data Processing service.
         3. Sends processed data ID to the XAI service for analysis.
         """
-        # Step 1: Validate the JWT token with the Authentication service
-        jwt_valid_res = await self.http.request(
-            "POST",
-            f"{self.auth_url}/validate",
-            json={"token": jwt}
-        )
-
-        # Extract doctor_id from validation response
-        doctor_id = jwt_valid_res.get("doctor_id")
-        if doctor_id is None:
-            # Raise 401 if the token is invalid or doctor_id is missing
-            raise HTTPException(status_code=401, detail="Invalid authorization header")
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
 
         # Step 2: Prepare payload for Data Processing service
         body = {
@@ -91,6 +167,8 @@ class Gateway:
             "strategy": analyse_request.strategy,
             "processed_data_id": data_id
         }
+        if analyse_request.defer_explanation is not None:
+            body["defer_explanation"] = analyse_request.defer_explanation
 
         # Request analysis from the XAI service
         xai_res = await self.http.request(
@@ -102,30 +180,112 @@ class Gateway:
         # Return the final analysis response
         return AnalyseResponse(**xai_res)
 
-    async def get_reports(self, jwt: str, patient_hashed_cf: str | None = None) -> GetReportsResponse:
-        # Retrieves reports from the XAI service for a specific doctor.
-        # Optionally filters by patient hashed CF.
-        # Step 1: Validate the JWT token with the Authentication service
-        jwt_valid_res = await self.http.request(
-            "POST",
-            f"{self.auth_url}/validate",
-            json={"token": jwt}
-        )
-
-        # Extract doctor_id
-        doctor_id = jwt_valid_res.get("doctor_id")
-        if doctor_id is None:
-            raise HTTPException(status_code=401, detail="Invalid authorization header")
+    async def get_reports(
+        self, jwt: str, patient_hashed_cf: str | None = None, limit: int | None = None, offset: int = 0
+    ) -> GetReportsResponse:
+        # Retrieves reports from the XAI service for a specific doctor, most recent first.
+        # Optionally filters by patient hashed CF and pages with limit/offset.
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
 
         # Construct the URL for fetching reports based on doctor_id
         url = f"{self.xai_url}/reports/{doctor_id}"
 
-        # Append query parameter if patient_hashed_cf is provided
-        if patient_hashed_cf is not None:
-            url += f"?patient_hashed_cf={patient_hashed_cf}"
+        # Append the query parameters that are provided
+        params = {"patient_hashed_cf": patient_hashed_cf, "limit": limit, "offset": offset or None}
+        query = urlencode({k: v for k, v in params.items() if v is not None})
+        if query:
+            url += f"?{query}"
 
         # Step 2: Fetch reports from XAI service
         reports = await self.http.request("GET", url)
 
         # Return the reports mapped to the response schema
-        return GetReportsResponse(**reports)
\ No newline at end of file
+        return GetReportsResponse(**reports)
+
+    async def get_report(self, jwt: str, report_id: int) -> GetReportResponse:
+        # Retrieves a single report of the doctor from the XAI service, including its explanation.
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
+
+        # Step 2: Fetch the report from XAI service
+        report = await self.http.request("GET", f"{self.xai_url}/reports/{doctor_id}/{report_id}")
+
+        # Return the report mapped to the response schema
+        return GetReportResponse(**report)
+
+
+    async def wait_explanation(self, jwt: str, report_id: int, wait: float = 0) -> GetReportResponse:
+        # Retrieves a report once its deferred explanation is ready (long polling, at most 'wait' seconds).
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
+
+        # Step 2: Wait for the explanation on the XAI service
+        report = await self.http.request(
+            "GET", f"{self.xai_url}/reports/{doctor_id}/{report_id}/explanation?wait={wait}"
+        )
+
+        # Return the report mapped to the response schema
+        return GetReportResponse(**report)
+
+    async def what_if(self, jwt: str, what_if_request: WhatIfRequest) -> WhatIfResponse:
+        # Computes the heart disease risk surface of a what-if exploration with the XAI service.
+        # Nothing goes through Data Processing and no report is created.
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        await self._validate_jwt(jwt)
+
+        # Step 2: Evaluate the variants on the XAI service
+        res = await self.http.request("POST", f"{self.xai_url}/whatif", json=what_if_request.model_dump())
+
+        # Return the risk surface mapped to the response schema
+        return WhatIfResponse(**res)
+
+    async def score_cohort(self, jwt: str, body: bytes, content_type: str | None,
+                           top_k: int = 5, persist: bool = True):
+        """
+        Scores a cohort of patients (a JSON, CSV or Arrow matrix of heart features) with the XAI service.
+        Returns an iterator over the NDJSON lines streamed back by the XAI service, one per patient:
+        the body is forwarded as is in both directions, without being parsed by the gateway.
+        """
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
+
+        # Step 2: Forward the matrix to the XAI service and relay its stream
+        query = urlencode({"top_k": top_k, "persist": str(persist).lower()})
+        return await self.http.stream(
+            "POST", f"{self.xai_url}/cohort/{doctor_id}?{query}", content=body,
+            headers={"Content-Type": content_type or "application/json"}
+        )
+
+    async def get_report_artifact(self, jwt: str, report_id: int, if_none_match: str | None = None):
+        """
+        Retrieves the binary explanation of a report (e.g. its heatmap) from the XAI service.
+        Returns (etag, media_type, content); the content is None when the client's
+        If-None-Match already matches, so the route can answer 304 Not Modified.
+        Cached artifacts are revalidated with a conditional request: the XAI service still
+        checks ownership, but the bytes are not transferred again.
+        """
+        # Step 1: Validate the JWT token (cached, or with the Authentication service)
+        doctor_id = await self._validate_jwt(jwt)
+
+        # Step 2: Conditional request with the client's and the cached ETags
+        cached = self.artifact_cache.get(doctor_id, report_id) if self.artifact_cache is not None else None
+        etags = [tag for tag in (if_none_match, cached[0] if cached else None) if tag]
+        headers = {"If-None-Match": ", ".join(etags)} if etags else None
+        resp = await self.http.request_raw(
+            "GET", f"{self.xai_url}/reports/{doctor_id}/{report_id}/artifact", headers=headers
+        )
+
+        etag = resp.headers.get("etag")
+        client_etags = [tag.strip() for tag in if_none_match.split(",")] if if_none_match else []
+        if etag in client_etags:
+            # The client already has this artifact
+            return etag, None, None
+        if resp.status_code == 304:
+            # Not modified since it was cached by the gateway
+            return cached
+
+        media_type = resp.headers.get("content-type", "application/octet-stream")
+        if self.artifact_cache is not None:
+            self.artifact_cache.put(doctor_id, report_id, etag, media_type, resp.content)
+        return etag, media_type, resp.content
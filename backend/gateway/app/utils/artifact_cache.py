@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Any, Dict
+
+
+class ArtifactCache:
+    """
+    In-memory LRU cache of report artifacts (e.g. heatmap images), bounded in total bytes.
+    Entries are keyed by (doctor_id, report_id) and store the ETag returned by the XAI service:
+    the gateway revalidates them with If-None-Match, so ownership is still checked by the XAI
+    service on every request while the artifact bytes are transferred only once.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # (doctor_id, report_id) -> (etag, media_type, content), least to most recently used
+        self._entries: "OrderedDict[tuple[int, int], tuple[str, str, bytes]]" = OrderedDict()
+        self._size = 0
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, doctor_id: int, report_id: int) -> tuple[str, str, bytes] | None:
+        """
+        Returns the cached (etag, media_type, content) of a report artifact, or None.
+        """
+        entry = self._entries.get((doctor_id, report_id))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end((doctor_id, report_id))
+        self.hits += 1
+        return entry
+
+    def put(self, doctor_id: int, report_id: int, etag: str, media_type: str, content: bytes):
+        """
+        Caches a report artifact, evicting the least recently used ones beyond 'max_bytes'.
+        """
+        if len(content) > self.max_bytes:
+            return
+
+        key = (doctor_id, report_id)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous[2])
+        self._entries[key] = (etag, media_type, content)
+        self._size += len(content)
+
+        while self._size > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns size and hit/miss counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -1,13 +1,37 @@
+import os
 # Import FastAPI components for handling headers and HTTP exceptions
 from fastapi import Header, HTTPException
 # Import the Gateway service and the custom HttpClient utility
 from ..services.gateway_service import Gateway
 from ..utils.http_client import HttpClient
+from ..utils.token_cache import TokenValidationCache, TokenDenyList
+from ..utils.jwt_verifier import JwtVerifier
+from ..utils.artifact_cache import ArtifactCache
 
 # Initialize a single instance of HttpClient to be reused
 http_client = HttpClient()
-# Initialize the Gateway service, injecting the http_client dependency
-gateway = Gateway(http_client=http_client)
+# Cache of validated JWTs, bounded in size and in lifetime of each entry
+token_cache = TokenValidationCache(
+    max_entries=int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000")),
+    max_ttl_seconds=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+)
+# Logged out tokens, refused until their expiration
+deny_list = TokenDenyList()
+# Local verifier of asymmetrically signed tokens, using the keys published by the Authentication service
+jwt_verifier = None
+if os.getenv("JWT_LOCAL_VERIFICATION", "1") == "1":
+    jwt_verifier = JwtVerifier(
+        jwks_url=os.getenv("JWKS_URL", f"{os.getenv('AUTHENTICATION_URL')}/jwks"),
+        http_client=http_client,
+        cache_seconds=float(os.getenv("JWKS_CACHE_SECONDS", "300"))
+    )
+# Cache of report artifacts (heatmaps), bounded in total size
+artifact_cache = ArtifactCache(max_bytes=int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+# Initialize the Gateway service, injecting the http_client, caches, deny-list and jwt_verifier dependencies
+gateway = Gateway(
+    http_client=http_client, token_cache=token_cache, jwt_verifier=jwt_verifier,
+    artifact_cache=artifact_cache, deny_list=deny_list
+)
 
 async def get_gateway_service() -> Gateway:
     """
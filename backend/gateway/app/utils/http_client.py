@@ -1,5 +1,18 @@
+from typing import AsyncIterator
+
 import httpx
 
+class UpstreamHTTPError(Exception):
+    """
+    Error answered by a downstream service, with its status code and headers, so that
+    routes relaying a response can pass the status through (e.g. 413, 415 or 503).
+    """
+    def __init__(self, status_code: int, detail: str, headers: dict | None = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
 class HttpClient:
     """
     A wrapper class for the asynchronous HTTP client (httpx).
@@ -13,25 +26,77 @@ class HttpClient:
         """
         Performs an asynchronous HTTP request using the specified method and URL.
         """
+        resp = await self._send(method, url, json=json)
+        # Return the JSON response body
+        return resp.json()
+
+    async def request_raw(self, method: str, url: str, headers: dict | None = None) -> httpx.Response:
+        """
+        Performs an asynchronous HTTP request and returns the response (status, headers and raw body).
+        A 304 Not Modified answer to a conditional request is returned as is.
+        """
+        return await self._send(method, url, headers=headers)
+
+    async def stream(self, method: str, url: str, content: bytes | None = None,
+                     headers: dict | None = None) -> AsyncIterator[bytes]:
+        """
+        Performs an asynchronous HTTP request and returns an iterator over its response body,
+        forwarded as it is received (e.g. NDJSON lines). Errors are raised before the first chunk
+        (UpstreamHTTPError for an error status of the downstream service).
+        """
+        try:
+            resp = await self.client.send(
+                self.client.build_request(method, url, content=content, headers=headers), stream=True
+            )
+        except httpx.HTTPError as e:
+            # Handle general HTTP errors (e.g., connection issues)
+            raise Exception(f"HTTP request failed: {e}") from e
+
+        if resp.is_error:
+            # Read the error body and keep its status, so the relaying route can answer with it
+            await resp.aread()
+            await resp.aclose()
+            raise self._upstream_error(resp)
+
+        async def body():
+            try:
+                async for chunk in resp.aiter_raw():
+                    yield chunk
+            finally:
+                await resp.aclose()
+
+        return body()
+
+    @staticmethod
+    def _upstream_error(resp: httpx.Response) -> UpstreamHTTPError:
+        """
+        Builds the error of a 4xx/5xx response, with the detail of its body and its Retry-After header.
+        """
+        try:
+            error_content = resp.json()
+            detail = error_content.get("detail", str(error_content)) if isinstance(error_content, dict) else str(error_content)
+        except ValueError:
+            # Fallback if the error response is not valid JSON
+            detail = resp.text or f"HTTP {resp.status_code}"
+        headers = {"Retry-After": resp.headers["retry-after"]} if "retry-after" in resp.headers else None
+        return UpstreamHTTPError(resp.status_code, str(detail), headers)
+
+    async def _send(self, method: str, url: str, json: dict | None = None, headers: dict | None = None) -> httpx.Response:
+        """
+        Executes the request and converts HTTP errors into exceptions
+        (UpstreamHTTPError for an error status of the downstream service).
+        """
         try:
             # Execute the request
-            resp = await self.client.request(method, url, json=json)
+            resp = await self.client.request(method, url, json=json, headers=headers)
+            if resp.status_code == 304:
+                return resp
             # Raise an exception for 4xx/5xx status codes
             resp.raise_for_status()
-            # Return the JSON response body
-            return resp.json()
+            return resp
         except httpx.HTTPStatusError as e:
-            # Handle specific HTTP error responses (e.g., 400 Bad Request)
-            try:
-                # Attempt to parse the error details from the response JSON
-                error_content = e.response.json()
-                if "detail" in error_content:
-                    raise Exception(error_content["detail"])
-                else:
-                    raise Exception(str(error_content))
-            except ValueError:
-                # Fallback if the error response is not valid JSON
-                raise Exception(e.response.text or str(e))
+            # Handle specific HTTP error responses (e.g., 400 Bad Request), keeping their status
+            raise self._upstream_error(e.response) from None
         except httpx.HTTPError as e:
             # Handle general HTTP errors (e.g., connection issues)
-            raise Exception(f"HTTP request failed: {e}") from e
\ No newline at end of file
+            raise Exception(f"HTTP request failed: {e}") from e
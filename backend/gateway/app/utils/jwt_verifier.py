@@ -0,0 +1,76 @@
+import time
+from typing import Any, Dict
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
+
+
+class JwtVerifier:
+    """
+    Verifies JWT tokens locally with the public keys published by the Authentication
+    service at its /jwks endpoint.
+    The key set is cached for 'cache_seconds' and refreshed early when a token carries
+    an unknown 'kid' (e.g. after a key rotation), at most once every 'min_refresh_seconds'.
+    """
+
+    def __init__(self, jwks_url: str, http_client, cache_seconds: float = 300, min_refresh_seconds: float = 30):
+        self.jwks_url = jwks_url
+        self.http = http_client
+        self.cache_seconds = cache_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        # kid -> PyJWK (public key and algorithm)
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+
+    async def _refresh(self):
+        """
+        Downloads the key set from the Authentication service.
+        """
+        jwks = await self.http.request("GET", self.jwks_url)
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk)
+            except (KeyError, jwt.PyJWKError):
+                # Skip malformed or unsupported keys
+                continue
+        self._keys = keys
+        self._fetched_at = time.time()
+
+    async def _get_key(self, kid: str) -> jwt.PyJWK | None:
+        """
+        Returns the cached key with the given kid, refreshing the key set if needed.
+        """
+        age = time.time() - self._fetched_at
+        if age >= self.cache_seconds or (kid not in self._keys and age >= self.min_refresh_seconds):
+            await self._refresh()
+        return self._keys.get(kid)
+
+    def can_verify(self, token: str) -> bool:
+        """
+        Returns True if the token is signed with an asymmetric key (has a 'kid' header).
+        HS256 tokens signed with the shared secret must be validated by the Authentication service.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except InvalidTokenError:
+            return False
+        return bool(header.get("kid")) and header.get("alg") != "HS256"
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verifies the token signature and expiration, returning its payload.
+        Raises an exception if the token is expired, forged or signed with an unknown key.
+        """
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = await self._get_key(kid) if kid else None
+            if key is None:
+                raise InvalidTokenError("Unknown signing key")
+            # Only the algorithm of the selected key is accepted (no algorithm confusion)
+            return jwt.decode(token, key.key, algorithms=[key.algorithm_name], options={"require": ["exp", "sub"]})
+
+        except ExpiredSignatureError:
+            raise Exception("Token has expired")
+
+        except InvalidTokenError:
+            raise Exception("Invalid token")
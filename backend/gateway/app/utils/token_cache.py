@@ -0,0 +1,180 @@
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+
+class TokenValidationCache:
+    """
+    In-memory LRU cache of successful JWT validations.
+    Entries are keyed by a SHA-256 hash of the token (raw tokens are never stored) and
+    expire at the token's 'exp' claim or after 'max_ttl_seconds', whichever comes first.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        # token hash -> (expiry timestamp, doctor_id), ordered from least to most recently used
+        self._entries: "OrderedDict[str, tuple[float, int]]" = OrderedDict()
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """
+        Hashes the token to build the cache key.
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _expiration(token: str) -> float | None:
+        """
+        Reads the 'exp' claim from the token payload, without verifying the signature
+        (the token has already been validated by the Authentication service).
+        """
+        try:
+            payload_b64 = token.split(".")[1]
+            payload_b64 += "=" * (-len(payload_b64) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+            return float(payload["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def get(self, token: str) -> int | None:
+        """
+        Returns the cached doctor_id of a token, or None on a miss or expired entry.
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, doctor_id = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return doctor_id
+
+    def put(self, token: str, doctor_id: int):
+        """
+        Caches a successful validation until min(token exp, now + max TTL).
+        """
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        token_exp = self._expiration(token)
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, doctor_id)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries beyond capacity
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> bool:
+        """
+        Removes a token from the cache (logout / revocation hook).
+        Returns True if the token was cached.
+        """
+        removed = self._entries.pop(self._key(token), None) is not None
+        if removed:
+            self.invalidations += 1
+        return removed
+
+    def clear(self):
+        """
+        Drops every cached validation.
+        """
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns size and hit/miss counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_ttl_seconds": self.max_ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class TokenDenyList:
+    """
+    In-memory set of revoked (logged out) JWTs.
+    Entries are keyed by the same SHA-256 hash as the validation cache and kept until the
+    token's 'exp' claim, after which the token is refused anyway; tokens without a readable
+    'exp' are kept for 'fallback_ttl_seconds'. Entries are never evicted early, since that
+    would make a revoked token valid again.
+    """
+
+    def __init__(self, fallback_ttl_seconds: float = 24 * 3600):
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+        # token hash -> expiry timestamp
+        self._entries: Dict[str, float] = {}
+        # Counters
+        self.revocations = 0
+        self.rejections = 0
+
+    def _purge(self, now: float):
+        """
+        Drops the entries of tokens that have expired.
+        """
+        for key in [key for key, expires_at in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+    def add(self, token: str):
+        """
+        Revokes a token until its expiration.
+        """
+        now = time.time()
+        self._purge(now)
+        expires_at = TokenValidationCache._expiration(token)
+        if expires_at is None:
+            expires_at = now + self.fallback_ttl_seconds
+        if expires_at <= now:
+            return
+        self._entries[TokenValidationCache._key(token)] = expires_at
+        self.revocations += 1
+
+    def contains(self, token: str) -> bool:
+        """
+        Returns True if the token has been revoked and has not expired yet.
+        """
+        expires_at = self._entries.get(TokenValidationCache._key(token))
+        if expires_at is None or expires_at <= time.time():
+            return False
+        self.rejections += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns size and revocation counters.
+        """
+        return {
+            "size": len(self._entries),
+            "revocations": self.revocations,
+            "rejections": self.rejections,
+        }
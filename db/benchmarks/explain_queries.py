@@ -0,0 +1,188 @@
+"""
+Query-plan harness for the repository lookups on the reports and logs tables.
+
+Creates a scratch schema with copies of the tables (no indexes), seeds a large synthetic
+dataset, and records EXPLAIN ANALYZE timings and plan shapes of each repository query,
+first without secondary indexes and then after applying migrations/002_lookup_indexes.sql.
+The scratch schema is dropped at the end; the application tables are never touched.
+
+Usage (requires asyncpg; connection from the POSTGRES_* variables):
+    python db/benchmarks/explain_queries.py [--reports N] [--logs N] [--runs N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+from pathlib import Path
+
+import asyncpg
+
+SCHEMA = "explain_bench"
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "002_lookup_indexes.sql"
+
+# Columns of the report listings: the explanation is deferred (never selected)
+REPORT_SUMMARY_COLUMNS = (
+    "reports.id, reports.doctor_id, reports.patient_hashed_cf, reports.processed_data_id, reports.created_at, "
+    "reports.strategy, reports.diagnosis, reports.confidence, reports.explanation_artifact, reports.explanation_status"
+)
+
+# Queries issued by ReportRepository (as compiled by SQLAlchemy for PostgreSQL, with a page of 50
+# reports) and LogRepository (pages fetch limit + 1 rows)
+QUERIES = {
+    "reports.find_by_doctor_id":
+        f"SELECT {REPORT_SUMMARY_COLUMNS} FROM reports WHERE reports.doctor_id = 42 "
+        "ORDER BY reports.created_at DESC, reports.id DESC LIMIT 50 OFFSET 0",
+    "reports.find_by_patient_hashed_cf":
+        "SELECT reports.id, reports.doctor_id, reports.patient_hashed_cf, reports.processed_data_id, "
+        "reports.created_at, reports.strategy, reports.diagnosis, reports.confidence, reports.explanation, "
+        "reports.explanation_artifact, reports.explanation_status "
+        "FROM reports WHERE reports.patient_hashed_cf = md5('patient-1234')",
+    "reports.find_by_doctor_and_patient":
+        f"SELECT {REPORT_SUMMARY_COLUMNS} FROM reports "
+        "WHERE reports.patient_hashed_cf = md5('patient-1234') AND reports.doctor_id = 42 "
+        "ORDER BY reports.created_at DESC, reports.id DESC LIMIT 50 OFFSET 0",
+    "logs.page (no filter)":
+        "SELECT * FROM logs ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page doctor_id":
+        "SELECT * FROM logs WHERE doctor_id = 42 ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page doctor_id (keyset page 2)":
+        "SELECT * FROM logs WHERE doctor_id = 42 AND (created_at, id) < "
+        "(SELECT created_at, id FROM logs WHERE doctor_id = 42 ORDER BY created_at DESC, id DESC OFFSET 100 LIMIT 1) "
+        "ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page patient_hashed_cf":
+        "SELECT * FROM logs WHERE patient_hashed_cf = md5('patient-1234') ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page report_id":
+        "SELECT * FROM logs WHERE report_id = 4242 ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page data_id":
+        "SELECT * FROM logs WHERE data_id = 4242 ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page service/event":
+        "SELECT * FROM logs WHERE service = 'explainable_ai' AND event = 'reports_patient' "
+        "ORDER BY created_at DESC, id DESC LIMIT 101",
+    "logs.page time range":
+        "SELECT * FROM logs WHERE created_at >= now() - interval '1 day' AND created_at < now() "
+        "ORDER BY created_at DESC, id DESC LIMIT 101",
+}
+
+# Synthetic data: 500 doctors, 50k patients, events spread over one year
+SEED_REPORTS = """
+INSERT INTO reports (doctor_id, patient_hashed_cf, processed_data_id, created_at, strategy, diagnosis, confidence, explanation)
+SELECT g % 500 + 1, md5('patient-' || (g % 50000)), g,
+       now() - (random() * interval '365 days'), 'numeric', 'Heart Disease', random(), repeat('x', 200)
+FROM generate_series(1, $1) g
+"""
+SEED_LOGS = """
+INSERT INTO logs (created_at, service, event, description, doctor_id, patient_hashed_cf, report_id, data_id)
+SELECT now() - (random() * interval '365 days'),
+       (ARRAY['authentication', 'data_processing', 'explainable_ai'])[g % 3 + 1],
+       (ARRAY['validate_token_success', 'process_success', 'reports_patient', 'analysis_success'])[g % 4 + 1],
+       'Synthetic event',
+       CASE WHEN g % 3 <> 1 THEN g % 500 + 1 END,
+       CASE WHEN g % 4 = 2 THEN md5('patient-' || (g % 50000)) END,
+       CASE WHEN g % 4 = 3 THEN g / 4 END,
+       CASE WHEN g % 3 = 1 THEN g / 3 END
+FROM generate_series(1, $1) g
+"""
+
+
+def connection_kwargs() -> dict:
+    return {
+        "host": os.getenv("POSTGRES_HOST", "localhost"),
+        "port": int(os.getenv("POSTGRES_PORT", "5432")),
+        "user": os.getenv("POSTGRES_USER", "user"),
+        "password": os.getenv("POSTGRES_PASSWORD", "password"),
+        "database": os.getenv("POSTGRES_DB", "postgres"),
+    }
+
+
+def migration_statements() -> list[str]:
+    """
+    Splits the index migration into statements (CONCURRENTLY must run one at a time).
+    """
+    sql = re.sub(r"--[^\n]*", "", MIGRATION.read_text())
+    return [statement.strip() for statement in sql.split(";") if statement.strip()]
+
+
+def plan_nodes(plan: dict) -> list[str]:
+    """
+    Flattens the plan tree into 'Node Type (index name)' labels of scan nodes.
+    """
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label += f" ({plan['Index Name']})"
+    nodes = [label] if "Scan" in plan["Node Type"] else []
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def explain(connection, query: str, runs: int) -> tuple[float, int, str]:
+    """
+    Returns the median execution time (ms), shared buffers read/hit, and scan nodes of a query.
+    """
+    timings = []
+    for _ in range(runs):
+        raw = await connection.fetchval(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+        result = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        timings.append(result["Execution Time"])
+    plan = result["Plan"]
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    return statistics.median(timings), buffers, ", ".join(dict.fromkeys(plan_nodes(plan)))
+
+
+async def measure(connection, runs: int) -> dict:
+    results = {}
+    for name, query in QUERIES.items():
+        results[name] = await explain(connection, query, runs)
+    return results
+
+
+async def run(reports: int, logs: int, runs: int):
+    connection = await asyncpg.connect(**connection_kwargs())
+    try:
+        await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+        # Copies of the application tables (columns and defaults only, no indexes)
+        for table in ("reports", "logs"):
+            await connection.execute(
+                f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            await connection.execute(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id)")
+        # Unqualified names in the queries and in the migration resolve to the scratch tables
+        await connection.execute(f"SET search_path TO {SCHEMA}")
+
+        print(f"Seeding {reports} reports and {logs} logs...")
+        await connection.execute(SEED_REPORTS, reports)
+        await connection.execute(SEED_LOGS, logs)
+        await connection.execute("ANALYZE reports; ANALYZE logs")
+
+        before = await measure(connection, runs)
+        for statement in migration_statements():
+            await connection.execute(statement)
+        await connection.execute("ANALYZE reports; ANALYZE logs")
+        after = await measure(connection, runs)
+
+        print(f"{'query':<38}{'before ms':>11}{'after ms':>10}{'speedup':>9}{'buffers':>17}  plan after")
+        for name in QUERIES:
+            before_ms, before_buffers, _ = before[name]
+            after_ms, after_buffers, nodes = after[name]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            buffers = f"{before_buffers}->{after_buffers}"
+            print(f"{name:<38}{before_ms:>11.2f}{after_ms:>10.3f}{speedup:>8.0f}x{buffers:>17}  {nodes}")
+    finally:
+        await connection.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=500_000, help="Synthetic reports to seed")
+    parser.add_argument("--logs", type=int, default=2_000_000, help="Synthetic logs to seed")
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN ANALYZE runs per query (median reported)")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.reports, args.logs, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,10 @@ CREATE TABLE IF NOT EXISTS doctors (
 CREATE TABLE IF NOT EXISTS processed_data (
     id SERIAL PRIMARY KEY,
     type VARCHAR(20) NOT NULL,            -- Data category (e.g., numeric, text, image_rx)
-    data TEXT NOT NULL,                   -- Raw or encoded data
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+    data TEXT,                            -- Textual processed data (JSON, normalized text)
+    binary_data BYTEA,                    -- Binary processed data (e.g., .npy image tensors)
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    CHECK (data IS NOT NULL OR binary_data IS NOT NULL)
 );
 
 -- Table storing medical reports produced by doctors
@@ -20,12 +22,14 @@ CREATE TABLE IF NOT EXISTS reports (
     id SERIAL PRIMARY KEY,
     doctor_id INTEGER NOT NULL,           -- Reference to the doctor who generated the report
     patient_hashed_cf VARCHAR(255) NOT NULL, -- Hashed patient identifier
-    processed_data_id INTEGER NOT NULL,   -- ID of the processed data used in the report
+    processed_data_id INTEGER,            -- ID of the processed data used in the report (NULL for cohort scoring)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
     strategy VARCHAR(255) NOT NULL,       -- AI or analysis method used
     diagnosis VARCHAR(255) NOT NULL,      -- Resulting diagnosis
     confidence FLOAT NOT NULL,            -- Confidence score
-    explanation TEXT NOT NULL            -- Explainability details
+    explanation TEXT NOT NULL,           -- Explainability details
+    explanation_artifact VARCHAR(255),   -- Key of the binary explanation (heatmap) in the artifact store
+    explanation_status VARCHAR(20) DEFAULT 'ready' NOT NULL -- 'pending' while computed in background
 );
 
 -- Table storing logs of system events and analyses
@@ -39,4 +43,15 @@ CREATE TABLE IF NOT EXISTS logs (
     patient_hashed_cf VARCHAR(255),      -- Optional patient hash involved in the log
     data_id INTEGER,                     -- Optional processed data ID
     report_id INTEGER                   -- Optional associated report
-);
\ No newline at end of file
+);
+
+-- Secondary indexes for the hot lookup paths (see migrations/002_lookup_indexes.sql)
+CREATE INDEX IF NOT EXISTS idx_reports_doctor_created ON reports (doctor_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reports_patient_doctor ON reports (patient_hashed_cf, doctor_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reports_pending ON reports (created_at) WHERE explanation_status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_logs_created ON logs (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_logs_doctor_created ON logs (doctor_id, created_at DESC, id DESC) WHERE doctor_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_logs_patient_created ON logs (patient_hashed_cf, created_at DESC, id DESC) WHERE patient_hashed_cf IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_logs_report ON logs (report_id) WHERE report_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_logs_data ON logs (data_id) WHERE data_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_logs_service_event_created ON logs (service, event, created_at DESC, id DESC);
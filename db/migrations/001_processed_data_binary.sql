@@ -0,0 +1,6 @@
+-- Migration for databases created before binary tensor storage.
+-- Image tensors are stored as raw .npy bytes in 'binary_data' instead of base64 text in 'data'.
+ALTER TABLE processed_data ADD COLUMN IF NOT EXISTS binary_data BYTEA;
+ALTER TABLE processed_data ALTER COLUMN data DROP NOT NULL;
+ALTER TABLE processed_data DROP CONSTRAINT IF EXISTS processed_data_check;
+ALTER TABLE processed_data ADD CONSTRAINT processed_data_check CHECK (data IS NOT NULL OR binary_data IS NOT NULL);
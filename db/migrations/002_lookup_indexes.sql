@@ -0,0 +1,28 @@
+-- Migration adding secondary indexes for the hot lookup paths.
+-- CONCURRENTLY avoids blocking writes on existing tables: run this file with psql
+-- (autocommit), not inside a transaction block.
+
+-- Reports of a doctor, most recent first (ReportRepository.find_by_doctor_id)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_doctor_created
+    ON reports (doctor_id, created_at DESC);
+-- Reports of a patient, optionally restricted to a doctor (ReportRepository.find_by_patient_hashed_cf)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_patient_doctor
+    ON reports (patient_hashed_cf, doctor_id, created_at DESC);
+
+-- Audit log pages are ordered by (created_at DESC, id DESC) (LogRepository.find_with_filters)
+-- Unfiltered pages and time-range queries
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_created
+    ON logs (created_at DESC, id DESC);
+-- Per-doctor and per-patient compliance queries (partial: most logs carry neither)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_doctor_created
+    ON logs (doctor_id, created_at DESC, id DESC) WHERE doctor_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_patient_created
+    ON logs (patient_hashed_cf, created_at DESC, id DESC) WHERE patient_hashed_cf IS NOT NULL;
+-- Logs of a report or of a processed data item (partial: few logs reference them)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_report
+    ON logs (report_id) WHERE report_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_data
+    ON logs (data_id) WHERE data_id IS NOT NULL;
+-- Logs of a service, optionally of one event type
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logs_service_event_created
+    ON logs (service, event, created_at DESC, id DESC);
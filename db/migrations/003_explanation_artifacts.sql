@@ -0,0 +1,4 @@
+-- Migration for databases created before the artifact store.
+-- Binary explanations (Grad-CAM heatmaps) are stored in the artifact store (ARTIFACTS_DIR):
+-- the report keeps the content-addressed key of the artifact instead of a base64 image in 'explanation'.
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS explanation_artifact VARCHAR(255);
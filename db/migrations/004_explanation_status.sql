@@ -0,0 +1,4 @@
+-- Migration for databases created before deferred explanations.
+-- GradCAM heatmaps may be computed after the report is saved: 'explanation_status' is
+-- 'pending' until the background worker stores them, then 'ready' (or 'failed').
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS explanation_status VARCHAR(20) NOT NULL DEFAULT 'ready';
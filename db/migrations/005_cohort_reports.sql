@@ -0,0 +1,4 @@
+-- Migration for databases created before cohort scoring.
+-- Reports of a scored cohort are computed from features sent with the request,
+-- not from processed data: they have no 'processed_data_id'.
+ALTER TABLE reports ALTER COLUMN processed_data_id DROP NOT NULL;
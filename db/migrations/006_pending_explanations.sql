@@ -0,0 +1,5 @@
+-- Migration for databases created before the recovery of stale explanations.
+-- On startup, the XAI service marks as failed the explanations still 'pending' long after
+-- their report was created (their job was lost with the process that queued it):
+-- this partial index keeps that lookup small.
+CREATE INDEX IF NOT EXISTS idx_reports_pending ON reports (created_at) WHERE explanation_status = 'pending';
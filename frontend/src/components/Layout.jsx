@@ -4,6 +4,9 @@ import { Outlet, useNavigate, useLocation } from "react-router-dom";
 // Import icons used in the layout from lucide-react
 import { Activity, FileText, LogOut, User } from "lucide-react";
 
+// Import authentication API calls
+import { authAPI } from "../services/api";
+
 // Main layout component for the dashboard
 const Layout = () => {
   // Hook used to programmatically navigate between routes
@@ -12,8 +15,10 @@ const Layout = () => {
   // Hook used to get the current route location
   const location = useLocation();
 
-  // Handles user logout by clearing stored data and redirecting to login page
-  const handleLogout = () => {
+  // Handles user logout by invalidating the token on the gateway,
+  // clearing stored data and redirecting to login page
+  const handleLogout = async () => {
+    await authAPI.logout();
     localStorage.removeItem("jwt_token");
     localStorage.removeItem("doctor_info");
     navigate("/");
@@ -1,5 +1,5 @@
-import { useState } from "react";
-import { aiAPI } from "../services/api";
+import { useState, useEffect } from "react";
+import { aiAPI, reportsAPI } from "../services/api";
 import { Activity, FileText, Image, Upload, Brain, ArrowRight, CheckCircle, BarChart2, Scan, User } from "lucide-react";
 
 // List of features used for the heart disease model
@@ -27,6 +27,19 @@ const CARDIO_LABELS = {
   thal: "Thalassemia"
 };
 
+// Continuous heart features explorable with the what-if slider: [min, max] of the grid
+const WHATIF_RANGES = {
+  age: [20, 90],
+  trestbps: [80, 200],
+  chol: [100, 400],
+  thalch: [60, 210],
+  oldpeak: [0, 6]
+};
+// Number of values of the what-if grid (all evaluated with a single request)
+const WHATIF_STEPS = 61;
+// Maximum time spent waiting for a deferred explanation (the report keeps it once computed)
+const EXPLANATION_MAX_WAIT_MS = 3 * 60 * 1000;
+
 const Analysis = () => {
   // State for the currently active tab
   const [activeTab, setActiveTab] = useState("text");
@@ -34,6 +47,10 @@ const Analysis = () => {
   const [loading, setLoading] = useState(false);
   // Holds the analysis result from the API
   const [result, setResult] = useState(null);
+  // Object URL of the heatmap of the result (stored in the artifact store)
+  const [heatmapUrl, setHeatmapUrl] = useState(null);
+  // Feature vector of the last numeric analysis (base of the what-if exploration)
+  const [whatIfBase, setWhatIfBase] = useState(null);
 
   // Input states for different types of analysis
   const [textInput, setTextInput] = useState(""); // clinical notes
@@ -150,6 +167,8 @@ const Analysis = () => {
   const handleAnalyse = async () => {
     setLoading(true);
     setResult(null);
+    setHeatmapUrl(null);
+    setWhatIfBase(null);
 
     try {
       let rawDataString = "";
@@ -170,6 +189,7 @@ const Analysis = () => {
         const vector = buildHeartFeatureVector(cardioData);
         rawDataString = JSON.stringify(vector);
         strategy = "numeric";
+        setWhatIfBase(vector);
       } else if (activeTab === "signal") {
         if (!signalInput) throw new Error("Please enter signal data.");
         const arr = signalInput.split(",")
@@ -183,7 +203,9 @@ const Analysis = () => {
       const payload = {
         patient_hashed_cf: patientCf, // hashed fiscal code
         strategy,
-        raw_data: rawDataString
+        raw_data: rawDataString,
+        // Show the diagnosis right away: the Grad-CAM heatmap is computed in background
+        defer_explanation: strategy.startsWith("img")
       };
 
       console.log("Sending to gateway:", payload);
@@ -191,7 +213,27 @@ const Analysis = () => {
       setPatientCf("");
 
       const response = await aiAPI.analyse(payload); // call AI API
-      setResult(response.data.report);
+      let report = response.data.report;
+      setResult(report);
+      setLoading(false);
+
+      // Deferred explanation: long-poll until the heatmap is ready, for at most EXPLANATION_MAX_WAIT_MS
+      const deadline = Date.now() + EXPLANATION_MAX_WAIT_MS;
+      while (report.explanation_status === "pending" && Date.now() < deadline) {
+        const wait = Math.max(1, Math.min(20, Math.ceil((deadline - Date.now()) / 1000)));
+        report = (await reportsAPI.waitExplanation(report.id, wait)).data.report;
+      }
+      if (report.explanation_status === "pending") {
+        // Stop waiting: the heatmap can still be opened later from the report
+        report = { ...report, explanation: "The heatmap is still being computed: open the report later to see it." };
+      }
+      setResult(report);
+
+      // Heatmaps are binary artifacts fetched separately from the report
+      if (report.explanation_artifact) {
+        const artifact = await reportsAPI.getArtifact(report.id);
+        setHeatmapUrl(URL.createObjectURL(artifact.data));
+      }
 
     } catch (error) {
       console.error(error);
@@ -484,11 +526,15 @@ const Analysis = () => {
                         // Image-based explanation (Grad-CAM heatmap)
                         <div className="space-y-2">
                           <span className="text-xs font-bold text-teal-600 uppercase">Heatmap (Grad-CAM)</span>
-                          <img
-                            src={`data:image/jpeg;base64,${result.explanation}`}
-                            alt="Heatmap"
-                            className="rounded-lg border border-orange-200 w-full"
-                          />
+                          {heatmapUrl ? (
+                            <img
+                              src={heatmapUrl}
+                              alt="Heatmap"
+                              className="rounded-lg border border-orange-200 w-full"
+                            />
+                          ) : (
+                            <p className="text-sm text-gray-500 italic">{result.explanation}</p>
+                          )}
                         </div>
                       ) : result.strategy === "numeric" ? (
                         // Numeric explanation (table)
@@ -517,6 +563,7 @@ const Analysis = () => {
                             </table>
 
                           </div>
+                          {whatIfBase && <WhatIfPanel base={whatIfBase} />}
                         </div>
                       ) : (
                         // Textual explanation
@@ -543,6 +590,61 @@ const Analysis = () => {
   )
 };
 
+// What-if exploration of a numeric result: the risk curve of the selected feature is
+// fetched once (one batched request, nothing saved), then the slider only reads it
+const WhatIfPanel = ({ base }) => {
+  const [feature, setFeature] = useState("chol");
+  const [curve, setCurve] = useState(null);
+  const [index, setIndex] = useState(0);
+
+  useEffect(() => {
+    const [min, max] = WHATIF_RANGES[feature];
+    const values = Array.from({ length: WHATIF_STEPS }, (_, i) => min + (i * (max - min)) / (WHATIF_STEPS - 1));
+    const current = base[HEART_FEATURES.indexOf(feature)];
+    setCurve(null);
+    aiAPI.whatIf(base, { [feature]: values })
+      .then(res => {
+        setCurve({ values, risk: res.data.risk });
+        // Start from the grid value closest to the patient's own value
+        const closest = values.reduce((best, v, i) => Math.abs(v - current) < Math.abs(values[best] - current) ? i : best, 0);
+        setIndex(closest);
+      })
+      .catch(error => console.error("What-if exploration failed:", error));
+  }, [base, feature]);
+
+  return (
+    <div className="space-y-2 pt-2">
+      <span className="text-xs font-bold text-teal-600 uppercase">What-if</span>
+      <select
+        className="w-full p-2 border border-gray-300 rounded-lg text-sm"
+        value={feature}
+        onChange={e => setFeature(e.target.value)}
+      >
+        {Object.keys(WHATIF_RANGES).map(f => (
+          <option key={f} value={f}>{CARDIO_LABELS[f]}</option>
+        ))}
+      </select>
+      {curve ? (
+        <div>
+          <input
+            type="range"
+            className="w-full accent-teal-600"
+            min={0}
+            max={curve.values.length - 1}
+            value={index}
+            onChange={e => setIndex(Number(e.target.value))}
+          />
+          <p className="text-sm text-gray-700">
+            {CARDIO_LABELS[feature]}: <b>{curve.values[index].toFixed(1)}</b> → risk <b>{(curve.risk[index] * 100).toFixed(1)}%</b>
+          </p>
+        </div>
+      ) : (
+        <p className="text-sm text-gray-400 italic">Computing risk curve...</p>
+      )}
+    </div>
+  );
+};
+
 // Component for numeric inputs
 const InputGroup = ({ label, type = "text", val, setter, step }) => (
   <div>
@@ -24,6 +24,9 @@ const Reports = () => {
   // State to control modal visibility
   const [showModal, setShowModal] = useState(false);
 
+  // Object URL of the heatmap of the selected report (stored in the artifact store)
+  const [heatmapUrl, setHeatmapUrl] = useState(null);
+
   // Fetch all reports on component mount
   useEffect(() => {
     const fetchReports = async () => {
@@ -45,13 +48,28 @@ const Reports = () => {
     : reports;
 
   // Open modal for a selected report
-  const openModal = (report) => {
+  // The list only contains summaries: the explanation is fetched on demand
+  const openModal = async (report) => {
     setSelectedReport(report);
     setShowModal(true);
+    try {
+      const response = await reportsAPI.getById(report.id);
+      setSelectedReport(response.data.report);
+
+      // Heatmaps are binary artifacts fetched separately (older reports embed them in base64)
+      if (response.data.report.explanation_artifact) {
+        const artifact = await reportsAPI.getArtifact(report.id);
+        setHeatmapUrl(URL.createObjectURL(artifact.data));
+      }
+    } catch (error) {
+      console.error("Error fetching report:", error);
+    }
   };
 
   // Close modal
   const closeModal = () => {
+    if (heatmapUrl) URL.revokeObjectURL(heatmapUrl);
+    setHeatmapUrl(null);
     setSelectedReport(null);
     setShowModal(false);
   };
@@ -85,6 +103,15 @@ const Reports = () => {
     return URL.createObjectURL(blob);
   };
 
+  // Heatmap embedded in base64 by older reports (null if the explanation is plain text)
+  const legacyHeatmapUrl = (explanation) => {
+    try {
+      return base64ToUrl(explanation);
+    } catch {
+      return null;
+    }
+  };
+
   // Map strategy codes to human-readable labels
   const getStrategyLabel = (strategy) => {
     switch (strategy) {
@@ -259,11 +286,24 @@ const Reports = () => {
                   selectedReport.strategy.startsWith("img") ? (
                     <div className="space-y-2 w-[350px]">
                       <span className="text-xs font-bold text-teal-600 uppercase">Heatmap (Grad-CAM)</span>
-                      <img
-                        src={base64ToUrl(selectedReport.explanation)}
-                        alt="Heatmap"
-                        className="rounded-lg object-cover w-full h-full"
-                      />
+                      {(() => {
+                        // Heatmaps are artifacts; older reports embed them in base64
+                        const src = selectedReport.explanation_artifact
+                          ? heatmapUrl
+                          : legacyHeatmapUrl(selectedReport.explanation);
+
+                        // Pending (computed in background) or unavailable heatmap
+                        if (!src) {
+                          return <p className="text-sm text-gray-500 italic">{selectedReport.explanation}</p>;
+                        }
+                        return (
+                          <img
+                            src={src}
+                            alt="Heatmap"
+                            className="rounded-lg object-cover w-full h-full"
+                          />
+                        );
+                      })()}
                     </div>
                   ) : (
                     <div className="space-y-2">
@@ -62,6 +62,10 @@ export const authAPI = {
 
   // Register a new user
   register: (data) => api.post("/register", data),
+
+  // Invalidate the cached validation of the JWT on the gateway
+  // Errors are ignored: the local session is cleared anyway
+  logout: () => api.post("/logout").catch(() => {}),
 };
 
 // AI-related API calls
@@ -73,6 +77,9 @@ export const aiAPI = {
 
     return api.post("/analyse", payload);
   },
+
+  // Risk surface of a heart feature vector when the features of 'grid' vary (nothing is saved)
+  whatIf: (features, grid) => api.post("/whatif", { features, grid }),
 };
 
 // Reports-related API calls
@@ -84,7 +91,16 @@ export const reportsAPI = {
       : {};
 
     return api.get("/reports", { params });
-  }
+  },
+
+  // Retrieve a single report including its explanation (e.g. Grad-CAM heatmap)
+  getById: (reportId) => api.get(`/reports/${reportId}`),
+
+  // Wait (long polling, at most 'wait' seconds) for the deferred explanation of a report
+  waitExplanation: (reportId, wait = 20) => api.get(`/reports/${reportId}/explanation`, { params: { wait } }),
+
+  // Retrieve the binary explanation of a report (heatmap image), cached by the browser via its ETag
+  getArtifact: (reportId) => api.get(`/reports/${reportId}/artifact`, { responseType: "blob" })
 };
 
 // Export the Axios instance for generic API usage
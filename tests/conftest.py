@@ -0,0 +1,35 @@
+import os
+import sys
+import pytest
+
+# Directory of the Explainable AI service, whose utilities are unit tested in-process
+XAI_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend", "explainable_ai"))
+
+
+def _unload_app():
+    """
+    Removes the modules of the service's 'app' package from the import cache.
+    """
+    for name in [name for name in sys.modules if name == "app" or name.startswith("app.")]:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def xai_app(monkeypatch):
+    """
+    Makes the 'app' package of the Explainable AI service importable for the duration of a test,
+    configured with the offline local LLM provider and no response cache.
+    Afterwards the process-wide LLM provider is reset and the modules are unloaded, so that
+    neither the environment nor the imports leak into the other tests.
+    """
+    monkeypatch.setenv("LLM_PROVIDER", "local")
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    monkeypatch.syspath_prepend(XAI_DIR)
+    _unload_app()
+    yield
+    providers = sys.modules.get("app.utils.llm.providers")
+    if providers is not None:
+        providers.close_llm()
+        providers._llm = None
+        providers._configured = False
+    _unload_app()
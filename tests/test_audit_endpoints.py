@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 import os
+import json
+import uuid
 
 # Base URL for the Audit microservice.
 # If the environment variable AUDIT_URL is not set, defaults to localhost.
@@ -96,3 +98,87 @@ async def test_get_logs_no_results():
         assert data["message"] == "No logs retrieved"
         assert isinstance(data["logs"], list)
         assert len(data["logs"]) == 0
+
+# Test 3: Create several log entries in one request
+@pytest.mark.anyio
+async def test_create_logs_batch():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        payload = {
+            "logs": [
+                {"service": "data_processing", "event": "process_success", "description": f"Batch log {i}", "data_id": i + 1}
+                for i in range(5)
+            ]
+        }
+
+        # Send POST request to create the log entries
+        response = await client.post("/logs/batch", json=payload)
+        assert response.status_code == 200, f"Body: {response.text}"
+
+        # One ID per log, in the order of the request
+        log_ids = response.json()["log_ids"]
+        assert len(log_ids) == 5
+        assert log_ids == sorted(log_ids)
+
+# Test 3b: An invalid item does not reject the valid items of its batch
+@pytest.mark.anyio
+async def test_create_logs_batch_partial():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        logs = [{"service": "authentication", "event": "register", "description": f"Batch log {i}"} for i in range(4)]
+        # Description over the 100-character limit
+        logs.insert(2, {"service": "authentication", "event": "register_failed", "description": "x" * 150})
+
+        response = await client.post("/logs/batch", json={"logs": logs})
+        assert response.status_code == 200, f"Body: {response.text}"
+
+        body = response.json()
+        assert len(body["log_ids"]) == 4
+        assert [item["index"] for item in body["rejected"]] == [2]
+        assert "description" in body["rejected"][0]["detail"]
+
+# Test 4: Paginate logs with a cursor
+@pytest.mark.anyio
+async def test_get_logs_pagination():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        # Create 5 logs for a dedicated service
+        service = f"pagination_{uuid.uuid4().hex[:8]}"
+        payload = {"logs": [{"service": service, "event": "test", "description": f"Log {i}"} for i in range(5)]}
+        response = await client.post("/logs/batch", json=payload)
+        assert response.status_code == 200
+
+        # Walk the pages of 2 logs
+        seen = []
+        params = {"service": service, "limit": 2}
+        while True:
+            response = await client.get("/logs", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(log["id"] for log in data["logs"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        # All logs retrieved once, most recent first
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == 5
+
+# Test 5: Export logs as NDJSON and CSV
+@pytest.mark.anyio
+async def test_export_logs():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        service = f"export_{uuid.uuid4().hex[:8]}"
+        payload = {"logs": [{"service": service, "event": "test", "description": f"Log {i}"} for i in range(3)]}
+        response = await client.post("/logs/batch", json=payload)
+        assert response.status_code == 200
+
+        # NDJSON: one JSON object per line
+        response = await client.get("/logs/export", params={"service": service})
+        assert response.status_code == 200
+        lines = response.text.strip().split("\n")
+        assert len(lines) == 3
+        assert all(json.loads(line)["service"] == service for line in lines)
+
+        # CSV: header plus one row per log
+        response = await client.get("/logs/export", params={"service": service, "format": "csv"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert len(response.text.strip().splitlines()) == 4
@@ -1,4 +1,5 @@
 import pytest
+import jwt
 from httpx import AsyncClient
 import os
 import uuid
@@ -60,3 +61,22 @@ async def test_register_duplicate_email():
         assert response.status_code == 400
         # Ensure response contains error message about duplicate email
         assert "Email already registered" in response.text
+
+
+# Test 3: Tokens are signed with a published asymmetric key
+@pytest.mark.anyio
+async def test_login_token_verifiable_with_jwks():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/login", json={"email": EMAIL, "password": "password123"})
+        assert response.status_code == 200, f"Response body: {response.text}"
+        token = response.json()["jwt_token"]
+
+        # Retrieve the public key set
+        response = await client.get("/jwks")
+        assert response.status_code == 200
+        keys = response.json()["keys"]
+        assert len(keys) > 0
+
+        # The token header references one of the published keys
+        header = jwt.get_unverified_header(token)
+        assert header["kid"] in {key["kid"] for key in keys}
@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 import os
+import json
+import signal
 
 # Base URL for the Data Processing microservice.
 # Defaults to localhost if the environment variable is not set.
@@ -42,3 +44,62 @@ async def test_process_and_retrieve_flow():
         assert retrieved["data"]["id"] == processed_id
         assert retrieved["data"]["type"] == "text"
         assert retrieved["data"]["data"] != ""  # Ensure processed data is not empty
+
+# Smallest valid PNG image (1x1 pixel), base64-encoded
+TINY_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4z8AAAAMBAQDJ/pLvAAAAAElFTkSuQmCC"
+)
+
+# Test: Image tensors are stored and transferred in binary .npy format
+@pytest.mark.anyio
+async def test_process_image_binary_retrieve():
+    async with AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/process", json={"strategy": "img_rx", "raw_data": TINY_PNG_B64})
+        assert response.status_code == 200, f"Process response: {response.text}"
+        processed_id = response.json()["processed_data_id"]
+
+        # JSON retrieval exposes the binary tensor as base64 with its encoding
+        response = await client.get(f"/retrieve/{processed_id}")
+        assert response.status_code == 200, f"Retrieve response: {response.text}"
+        assert response.json()["data"]["encoding"] == "npy+base64"
+
+        # Binary retrieval returns the raw .npy bytes directly
+        response = await client.get(f"/retrieve/{processed_id}", headers={"Accept": "application/octet-stream"})
+        assert response.status_code == 200
+        assert response.headers["X-Data-Type"] == "img_rx"
+        assert response.content.startswith(b"\x93NUMPY")
+
+
+def _is_child_process(pid: int, parent_pid: int) -> bool:
+    """
+    True if 'pid' is a process of this host whose parent is 'parent_pid' (from /proc/<pid>/stat).
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the command name (which may contain spaces): state, ppid, ...
+            return int(f.read().rsplit(")", 1)[1].split()[1]) == parent_pid
+    except (OSError, IndexError, ValueError):
+        return False
+
+# Test: A worker process of the pool dies; the next large payload is still processed
+@pytest.mark.anyio
+async def test_process_pool_worker_crash():
+    # Large enough to be processed in the process pool (INLINE_THRESHOLD_BYTES)
+    signal_payload = {"strategy": "signal", "raw_data": json.dumps([float(i % 100) for i in range(20000)])}
+    async with AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/process", json=signal_payload)
+        assert response.status_code == 200, f"Process response: {response.text}"
+
+        pool = (await client.get("/metrics")).json()["metrics"]["process_pool"]
+        workers = [pid for pid in pool["worker_pids"] if _is_child_process(pid, pool["parent_pid"])]
+        if not workers:
+            # The service runs elsewhere (e.g. in a container): its workers cannot be killed from here
+            pytest.skip("Process pool workers of the service are not visible from the test host")
+
+        # Kill a worker, as the OOM killer would
+        os.kill(workers[0], signal.SIGKILL)
+
+        response = await client.post("/process", json=signal_payload)
+        assert response.status_code == 200, f"Process response: {response.text}"
+        pool = (await client.get("/metrics")).json()["metrics"]["process_pool"]
+        assert pool["restarts"] >= 1
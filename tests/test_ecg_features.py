@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+# The ECG feature engine of the XAI service runs in-process (xai_app fixture), on synthetic recordings
+
+FS = 500.0
+
+
+def synthetic_ecg(seconds: float, rate: float, rr_cv: float, qrs_ms: float, seed: int = 0) -> np.ndarray:
+    """
+    Normalized synthetic ECG: Gaussian P-QRS-T waves at the given heart rate, RR variability and
+    QRS width, with baseline wander and noise.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * FS)
+    t = np.arange(n) / FS
+    rr = np.clip(rng.normal(60 / rate, rr_cv * 60 / rate, size=int(seconds * rate / 60) + 10), 0.3, 2.5)
+    beats = np.cumsum(rr) - rr[0] + 0.3
+    beats = beats[beats < seconds - 0.4]
+
+    # Waves: (offset s, amplitude, width s); the QRS Gaussians span qrs_ms
+    sigma = qrs_ms / 1000 / 6
+    waves = [(-0.18, 0.12, 0.025), (-2 * sigma, -0.15, sigma), (0.0, 1.0, sigma),
+             (2 * sigma, -0.25, sigma), (0.22 + 2 * sigma, 0.3, 0.04)]
+    ecg = np.zeros(n)
+    for offset, amplitude, width in waves:
+        for c in beats + offset:
+            ecg += amplitude * np.exp(-0.5 * ((t - c) / width) ** 2)
+    ecg += 0.1 * np.sin(2 * np.pi * 0.3 * t) + rng.normal(0, 0.02, n)
+    return ((ecg - ecg.min()) / (ecg.max() - ecg.min())).astype(np.float32)
+
+
+# Test 1: Heart rate, beats and QRS width of a normal recording, interpreted as a normal rhythm
+def test_normal_recording(xai_app):
+    from app.utils.ecg_features import extract_ecg_features, rule_based_diagnosis
+
+    features = extract_ecg_features(synthetic_ecg(30, 72, 0.03, 90), FS)
+    assert abs(features["heart_rate_bpm"] - 72) <= 3
+    assert abs(features["beats"] - 36) <= 2
+    assert abs(features["qrs_width_ms"] - 90) <= 20
+    assert features["sdnn_ms"] > 0
+    # Short recordings have no spectral HRV indices
+    assert "lf_hf_ratio" not in features
+
+    result = rule_based_diagnosis(features)
+    assert result["diagnosis"] == "Normal sinus rhythm"
+    assert result["confidence"] == 0.85
+
+# Test 2: Each abnormal rhythm is detected by its rule
+@pytest.mark.parametrize("rate, rr_cv, qrs_ms, finding", [
+    (42, 0.03, 90, "Bradycardia"),
+    (130, 0.02, 80, "Tachycardia"),
+    (95, 0.25, 90, "Irregular rhythm"),
+    (70, 0.03, 150, "Wide QRS complex"),
+])
+def test_abnormal_recordings(xai_app, rate, rr_cv, qrs_ms, finding):
+    from app.utils.ecg_features import extract_ecg_features, rule_based_diagnosis
+
+    result = rule_based_diagnosis(extract_ecg_features(synthetic_ecg(30, rate, rr_cv, qrs_ms), FS))
+    assert finding in result["diagnosis"]
+    assert "Normal sinus rhythm" not in result["diagnosis"]
+
+# Test 3: Flat and too short recordings have no beats and are left undetermined
+def test_recordings_without_beats(xai_app):
+    from app.utils.ecg_features import extract_ecg_features, rule_based_diagnosis
+
+    for samples in (np.full(int(10 * FS), 0.5, dtype=np.float32), synthetic_ecg(10, 72, 0.03, 90)[:100]):
+        features = extract_ecg_features(samples, FS)
+        assert features["beats"] == 0
+        result = rule_based_diagnosis(features)
+        assert result["diagnosis"] == "Undetermined"
+        assert result["confidence"] == 0.0
+
+# Test 4: Noisy recordings and recordings with few beats lower the confidence
+def test_rule_confidence(xai_app):
+    from app.utils.ecg_features import rule_based_diagnosis
+
+    features = {"beats": 20, "heart_rate_bpm": 70.0, "rr_cv": 0.02, "rmssd_ms": 20.0,
+                "qrs_width_ms": 90.0, "noise_power_ratio": 0.05}
+    assert rule_based_diagnosis(features)["confidence"] == 0.85
+
+    noisy = rule_based_diagnosis({**features, "noise_power_ratio": 0.5})
+    assert noisy["confidence"] == 0.42
+    assert "noisy" in noisy["explanation"]
+    assert rule_based_diagnosis({**features, "beats": 5})["confidence"] == 0.42
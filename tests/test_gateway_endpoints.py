@@ -1,16 +1,40 @@
+import anyio
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from httpx import AsyncClient
 import os
+import time
 import uuid
 
 # Base URLs for different microservices
 BASE_AUTH_URL = os.getenv("AUTHENTICATION_URL", "http://localhost:8000/authentication")
 BASE_DATA_URL = os.getenv("DATA_PROCESSING_URL", "http://localhost:8004/data_processing")
 BASE_XAI_URL = os.getenv("EXPLAINABLE_AI_URL", "http://localhost:8003/explainable_ai")
+BASE_GATEWAY_URL = os.getenv("GATEWAY_URL", "http://localhost:8002/gateway")
 
 # Generate a unique email for testing
 EMAIL = f"test_{uuid.uuid4()}@email.com"
 
+# Smallest valid PNG image (1x1 pixel), base64-encoded
+TINY_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4z8AAAAMBAQDJ/pLvAAAAAElFTkSuQmCC"
+)
+
+
+async def gateway_login(gateway_client: AsyncClient) -> dict:
+    """
+    Registers a new doctor through the Gateway and returns the Authorization header of its session.
+    """
+    email = f"test_{uuid.uuid4()}@email.com"
+    response = await gateway_client.post("/register", json={
+        "name": "Alice", "surname": "Smith", "email": email, "password": "password123"
+    })
+    assert response.status_code == 200, f"Response body: {response.text}"
+    response = await gateway_client.post("/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 200, f"Response body: {response.text}"
+    return {"Authorization": f"Bearer {response.json()['jwt_token']}"}
+
 # Test: Full end-to-end flow
 # 1) Register a doctor
 # 2) Login
@@ -76,3 +100,91 @@ async def test_register_login_analyse_flow():
         reports = response.json().get("reports", [])
         # Ensure at least one report corresponds to the processed data
         assert any(r["processed_data_id"] == processed_data_id for r in reports)
+
+
+# Test: The Gateway relays the 503 and Retry-After of a saturated XAI service (instead of a 400)
+# (needs the XAI service started with IMAGE_INFERENCE_QUEUE=0: one X-ray at a time, none waiting)
+@pytest.mark.anyio
+async def test_gateway_relays_saturation():
+    async with AsyncClient(base_url=BASE_GATEWAY_URL, timeout=120) as gateway_client, \
+               AsyncClient(base_url=BASE_XAI_URL) as xai_client:
+        headers = await gateway_login(gateway_client)
+        payload = {"patient_hashed_cf": "HASHED123", "strategy": "img_rx", "raw_data": TINY_PNG_B64,
+                   "defer_explanation": False}
+        # The image executor is created by the first X-ray analysis
+        response = await gateway_client.post("/analyse", json=payload, headers=headers)
+        assert response.status_code in (200, 503), f"Response body: {response.text}"
+        executor = (await xai_client.get("/metrics")).json()["metrics"]["executors"]["image"]
+        if executor["max_queue"] > 0:
+            pytest.skip("the XAI service must be started with IMAGE_INFERENCE_QUEUE=0")
+
+        responses = []
+
+        async def analyse():
+            responses.append(await gateway_client.post("/analyse", json=payload, headers=headers))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(8):
+                tg.start_soon(analyse)
+
+        statuses = [r.status_code for r in responses]
+        assert set(statuses) <= {200, 503}, statuses
+        assert 503 in statuses
+        for r in responses:
+            if r.status_code == 503:
+                assert int(r.headers["Retry-After"]) >= 1
+
+
+# Test: Repeated calls with the same token are answered from the token validation cache
+@pytest.mark.anyio
+async def test_gateway_token_cache_hit():
+    async with AsyncClient(base_url=BASE_GATEWAY_URL) as gateway_client:
+        headers = await gateway_login(gateway_client)
+        response = await gateway_client.get("/reports", headers=headers)
+        assert response.status_code == 200, f"Response body: {response.text}"
+        hits = (await gateway_client.get("/metrics")).json()["metrics"]["token_cache"]["hits"]
+
+        response = await gateway_client.get("/reports", headers=headers)
+        assert response.status_code == 200, f"Response body: {response.text}"
+        assert (await gateway_client.get("/metrics")).json()["metrics"]["token_cache"]["hits"] == hits + 1
+
+# Test: A logged out token is refused, even though its signature is still valid
+@pytest.mark.anyio
+async def test_gateway_logout_rejects_token():
+    async with AsyncClient(base_url=BASE_GATEWAY_URL) as gateway_client:
+        headers = await gateway_login(gateway_client)
+        response = await gateway_client.get("/reports", headers=headers)
+        assert response.status_code == 200, f"Response body: {response.text}"
+
+        response = await gateway_client.post("/logout", headers=headers)
+        assert response.status_code == 200, f"Response body: {response.text}"
+        response = await gateway_client.get("/reports", headers=headers)
+        assert response.status_code == 401, f"Response body: {response.text}"
+
+# Test: Tampered tokens and tokens signed with an unknown key are refused by the Gateway
+# itself, without calling the /validate endpoint of the Authentication service
+@pytest.mark.anyio
+async def test_gateway_refuses_forged_tokens_locally():
+    async with AsyncClient(base_url=BASE_GATEWAY_URL) as gateway_client, \
+               AsyncClient(base_url=BASE_AUTH_URL) as auth_client:
+        headers = await gateway_login(gateway_client)
+        token = headers["Authorization"].split(" ")[1]
+        if not jwt.get_unverified_header(token).get("kid"):
+            pytest.skip("tokens are only verified locally with an asymmetric JWT_ALGORITHM")
+
+        # Tampered signature
+        header, payload, signature = token.split(".")
+        signature = signature[:10] + ("A" if signature[10] != "A" else "B") + signature[11:]
+        tampered = f"{header}.{payload}.{signature}"
+        # Valid signature, but with a key the Authentication service never published
+        unknown_kid = jwt.encode(
+            {"sub": "1", "exp": int(time.time()) + 600}, ed25519.Ed25519PrivateKey.generate(),
+            algorithm="EdDSA", headers={"kid": "unknown-kid"}
+        )
+
+        # Every /validate call is audited by the Authentication service
+        audited = (await auth_client.get("/metrics")).json()["metrics"]["audit"]["enqueued"]
+        for forged in (tampered, unknown_kid):
+            response = await gateway_client.get("/reports", headers={"Authorization": f"Bearer {forged}"})
+            assert response.status_code == 401, f"Response body: {response.text}"
+        assert (await auth_client.get("/metrics")).json()["metrics"]["audit"]["enqueued"] == audited
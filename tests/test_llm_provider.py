@@ -0,0 +1,87 @@
+import asyncio
+import time
+import pytest
+
+# The LLM layer of the XAI service runs in-process (xai_app fixture), against the offline local provider
+
+# The managed provider relies on asyncio primitives (semaphore, wait_for)
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+# Test 1: LLM_PROVIDER=local gives the managed local stand-in, answering valid JSON
+@pytest.mark.anyio
+async def test_local_provider_configured(xai_app):
+    from app.utils.llm.managed_provider import ManagedLLMProvider, parse_json_response
+    from app.utils.llm.providers import get_llm
+
+    llm = get_llm()
+    assert isinstance(llm, ManagedLLMProvider)
+    assert llm.name == "local"
+
+    response = await llm.generate("Respond ONLY in JSON")
+    assert parse_json_response(response["text"])["diagnosis"] != ""
+    # The same prompt always gets the same answer
+    assert (await llm.generate("Respond ONLY in JSON"))["text"] == response["text"]
+
+# Test 2: At most max_concurrency generations are in flight, the others wait for a slot
+@pytest.mark.anyio
+async def test_concurrency_limit(xai_app):
+    from app.utils.llm.local_provider import LocalProvider
+    from app.utils.llm.managed_provider import ManagedLLMProvider
+
+    llm = ManagedLLMProvider(LocalProvider(latency=0.1), max_concurrency=2, timeout=5)
+    peak = 0
+
+    async def sample():
+        nonlocal peak
+        while True:
+            peak = max(peak, llm.stats()["in_flight"])
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(6)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    assert peak == 2
+    # 6 calls of 0.1 s, 2 at a time: 3 rounds
+    assert elapsed >= 0.3
+    assert llm.stats()["succeeded"] == 6
+
+# Test 3: A generation exceeding the deadline fails with LLMUnavailableError, without waiting it out
+@pytest.mark.anyio
+async def test_timeout(xai_app):
+    from app.utils.llm.I_llm_provider import LLMUnavailableError
+    from app.utils.llm.local_provider import LocalProvider
+    from app.utils.llm.managed_provider import ManagedLLMProvider
+
+    llm = ManagedLLMProvider(LocalProvider(latency=1.0), timeout=0.2, max_retries=2, backoff_base=0.01)
+    start = time.perf_counter()
+    with pytest.raises(LLMUnavailableError):
+        await llm.generate("slow prompt")
+
+    assert time.perf_counter() - start < 0.5
+    stats = llm.stats()
+    assert stats["timeouts"] >= 1
+    assert stats["failed"] == 1
+
+# Test 4: Transient failures are retried; persistent ones give up after max_retries
+@pytest.mark.anyio
+async def test_retries(xai_app):
+    from app.utils.llm.I_llm_provider import LLMUnavailableError
+    from app.utils.llm.local_provider import LocalProvider
+    from app.utils.llm.managed_provider import ManagedLLMProvider
+
+    # Seed 1: the first call fails, the second succeeds
+    llm = ManagedLLMProvider(LocalProvider(failure_rate=0.5, seed=1), max_retries=2, backoff_base=0.01)
+    await llm.generate("prompt")
+    assert llm.stats()["retries"] == 1
+    assert llm.stats()["succeeded"] == 1
+
+    llm = ManagedLLMProvider(LocalProvider(failure_rate=1.0), max_retries=2, backoff_base=0.01)
+    with pytest.raises(LLMUnavailableError, match="after 3 attempt"):
+        await llm.generate("prompt")
+    assert llm.stats()["retries"] == 2
+    assert llm.stats()["failed"] == 1
@@ -0,0 +1,80 @@
+import os
+import time
+import pytest
+
+# The LLM response cache of the XAI service runs in-process (xai_app fixture), on a temporary SQLite file
+
+
+# The cache runs its SQLite calls with asyncio.to_thread
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+# Test 1: Answers expire ttl_seconds after being stored
+@pytest.mark.anyio
+async def test_ttl_expiry(xai_app, tmp_path):
+    from app.utils.llm.response_cache import LLMResponseCache
+
+    cache = LLMResponseCache(os.path.join(tmp_path, "responses.sqlite3"), ttl_seconds=0.2)
+    await cache.put("key", {"text": "answer"})
+    assert await cache.get("key") == {"text": "answer"}
+
+    time.sleep(0.3)
+    assert await cache.get("key") is None
+    stats = cache.stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+    cache.close()
+
+# Test 2: Beyond max_bytes, the least recently used answers are evicted
+@pytest.mark.anyio
+async def test_size_lru_eviction(xai_app, tmp_path):
+    from app.utils.llm.response_cache import LLMResponseCache
+
+    # Each answer takes about 110 bytes: two of them fit
+    cache = LLMResponseCache(os.path.join(tmp_path, "responses.sqlite3"), max_bytes=250)
+    await cache.put("a", {"text": "a" * 100})
+    time.sleep(0.01)
+    await cache.put("b", {"text": "b" * 100})
+    time.sleep(0.01)
+    # Reading "a" makes "b" the least recently used answer
+    assert await cache.get("a") is not None
+    time.sleep(0.01)
+    await cache.put("c", {"text": "c" * 100})
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert await cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] <= 250
+    cache.close()
+
+# Test 3: A cached answer is returned without calling the provider
+@pytest.mark.anyio
+async def test_hit_skips_provider(xai_app, tmp_path):
+    from app.utils.llm.local_provider import LocalProvider
+    from app.utils.llm.managed_provider import ManagedLLMProvider, parse_json_response
+    from app.utils.llm.response_cache import LLMResponseCache, llm_cache_key
+
+    class CountingProvider(LocalProvider):
+        calls = 0
+
+        async def generate(self, prompt):
+            CountingProvider.calls += 1
+            return await super().generate(prompt)
+
+    cache = LLMResponseCache(os.path.join(tmp_path, "responses.sqlite3"))
+    llm = ManagedLLMProvider(CountingProvider(), cache=cache)
+    # Equivalent inputs (whitespace, key order) share the same key
+    key = llm_cache_key("local", "v1", "Chest  pain", {"a": 1, "b": 2})
+    assert llm_cache_key("local", "v1", "Chest pain", {"b": 2, "a": 1}) == key
+
+    first = await llm.generate("Respond ONLY in JSON", cache_key=key, validate=parse_json_response)
+    second = await llm.generate("Respond ONLY in JSON", cache_key=key, validate=parse_json_response)
+    assert CountingProvider.calls == 1
+    assert second["cached"] is True
+    assert second["text"] == first["text"]
+    assert cache.stats()["hits"] == 1
+    cache.close()
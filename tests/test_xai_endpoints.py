@@ -1,11 +1,33 @@
+import anyio
 import pytest
 from httpx import AsyncClient
 import os
+import json
 
 # Base URLs for XAI and Data Processing services
 BASE_XAI_URL = os.getenv("EXPLAINABLE_AI_URL", "http://localhost:8003/explainable_ai")
 BASE_DATA_URL = os.getenv("DATA_PROCESSING_URL", "http://localhost:8004/data_processing")
 
+# Smallest valid PNG image (1x1 pixel), base64-encoded
+TINY_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4z8AAAAMBAQDJ/pLvAAAAAElFTkSuQmCC"
+)
+
+
+async def post_concurrently(client: AsyncClient, url: str, payload: dict, count: int) -> list:
+    """
+    Sends 'count' identical POST requests at the same time and returns their responses.
+    """
+    responses = []
+
+    async def post():
+        responses.append(await client.post(url, json=payload))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(count):
+            tg.start_soon(post)
+    return responses
+
 # Test 1: Full analyse → retrieve reports flow
 @pytest.mark.anyio
 async def test_analyse_and_get_reports_flow():
@@ -69,6 +91,29 @@ async def test_analyse_and_get_reports_flow():
         assert "reports" in body
         assert len(body["reports"]) > 0
         assert body["reports"][0]["patient_hashed_cf"] == "HASH123"
+        # Listings are summaries without the explanation
+        assert "explanation" not in body["reports"][0]
+
+    # Step 5: Retrieve the single report with its explanation
+    async with AsyncClient(base_url=BASE_XAI_URL) as xai_client:
+        response = await xai_client.get(f"/reports/1/{generated_report_id}")
+        assert response.status_code == 200
+        assert response.json()["report"]["explanation"] != ""
+
+        # Reports of other doctors are not accessible
+        response = await xai_client.get(f"/reports/2/{generated_report_id}")
+        assert response.status_code == 400
+
+        # Textual reports have no binary artifact (heatmaps are only produced by image strategies)
+        response = await xai_client.get(f"/reports/1/{generated_report_id}")
+        assert response.json()["report"]["explanation_artifact"] is None
+        response = await xai_client.get(f"/reports/1/{generated_report_id}/artifact")
+        assert response.status_code == 404
+
+        # Textual explanations are never deferred: the long poll answers immediately
+        response = await xai_client.get(f"/reports/1/{generated_report_id}/explanation?wait=5")
+        assert response.status_code == 200
+        assert response.json()["report"]["explanation_status"] == "ready"
 
 # Test 2: Analyse with invalid strategy
 @pytest.mark.anyio
@@ -96,3 +141,162 @@ async def test_reports_doctor_no_reports():
         # Check response message and ensure reports list is empty
         assert body["message"] in ("No reports retrieved", "Success")
         assert body["reports"] == []
+
+
+# Test 4: Model registry metrics
+@pytest.mark.anyio
+async def test_metrics_models():
+    async with AsyncClient(base_url=BASE_XAI_URL) as xai_client:
+        response = await xai_client.get("/metrics")
+        assert response.status_code == 200
+
+        models = response.json()["metrics"]["models"]
+        # Every model used by the strategies is registered
+        for name in ("chexnet", "skinnet", "xgboost_heart", "clinicalbert"):
+            assert name in models
+        # Loaded models report their load time
+        for stats in models.values():
+            if stats["loaded"]:
+                assert stats["load_seconds"] >= 0
+
+
+# Test 5: Cohort scoring (NDJSON stream, one line per patient)
+@pytest.mark.anyio
+async def test_score_cohort():
+    async with AsyncClient(base_url=BASE_XAI_URL) as xai_client:
+        payload = {
+            "patient_hashed_cf": ["COHORT1", "COHORT2"],
+            "features": [
+                [55, 140, 250, 150, 1.5, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 1, 1, 0],
+                [40, 120, 200, 170, 0.0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 1, 0]
+            ]
+        }
+        response = await xai_client.post("/cohort/99998?top_k=3&persist=false", json=payload)
+        assert response.status_code == 200, f"Response body: {response.text}"
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # One line per patient, in order, with its top-3 drivers and no saved report
+        assert [line["patient_hashed_cf"] for line in lines] == payload["patient_hashed_cf"]
+        for line in lines:
+            assert line["report_id"] is None
+            assert 0.0 <= line["risk"] <= 1.0
+            assert len(line["drivers"]) == 3
+
+        # Unsupported body format
+        response = await xai_client.post("/cohort/99998", content=b"x", headers={"Content-Type": "text/plain"})
+        assert response.status_code == 415
+
+        # Row count not matching the patients: 2 rows of 27 values are not re-split into 3 patients
+        mismatched = {"patient_hashed_cf": ["COHORT1", "COHORT2", "COHORT3"], "features": [[1.0] * 27, [1.0] * 27]}
+        response = await xai_client.post("/cohort/99998?persist=false", json=mismatched)
+        assert response.status_code == 400
+        # Nor is a single row holding the values of 2 patients
+        mismatched = {"patient_hashed_cf": ["COHORT1", "COHORT2"], "features": [[1.0] * 36]}
+        response = await xai_client.post("/cohort/99998?persist=false", json=mismatched)
+        assert response.status_code == 400
+
+        # Ragged rows
+        ragged = {"patient_hashed_cf": ["COHORT1", "COHORT2"], "features": [payload["features"][0], [1.0] * 17]}
+        response = await xai_client.post("/cohort/99998?persist=false", json=ragged)
+        assert response.status_code == 400
+
+
+# Test 6: What-if risk surface (one risk per combination of the grid values, nothing saved)
+@pytest.mark.anyio
+async def test_what_if_surface():
+    async with AsyncClient(base_url=BASE_XAI_URL) as xai_client:
+        payload = {
+            "features": [55, 140, 250, 150, 1.5, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 1, 1, 0],
+            "grid": {"chol": [180, 220, 260, 300], "trestbps": [120, 160]}
+        }
+        response = await xai_client.post("/whatif", json=payload)
+        assert response.status_code == 200, f"Response body: {response.text}"
+
+        body = response.json()
+        assert body["features"] == ["chol", "trestbps"]
+        # Risk surface shaped like the grid: 4 cholesterol values x 2 blood pressures
+        assert len(body["risk"]) == 4 and all(len(row) == 2 for row in body["risk"])
+        assert 0.0 <= body["base_risk"] <= 1.0
+
+        # Unknown feature
+        payload["grid"] = {"not_a_feature": [1, 2]}
+        response = await xai_client.post("/whatif", json=payload)
+        assert response.status_code == 400
+
+
+# Test 7: A saturated inference executor answers 503 with Retry-After instead of queueing the request
+# (needs the XAI service started with IMAGE_INFERENCE_QUEUE=0: one X-ray at a time, none waiting)
+@pytest.mark.anyio
+async def test_image_executor_saturated():
+    async with AsyncClient(base_url=BASE_DATA_URL) as data_client:
+        response = await data_client.post("/process", json={"strategy": "img_rx", "raw_data": TINY_PNG_B64})
+        assert response.status_code == 200, f"Process response: {response.text}"
+        processed_id = response.json()["processed_data_id"]
+
+    async with AsyncClient(base_url=BASE_XAI_URL, timeout=120) as xai_client:
+        payload = {
+            "doctor_id": 1,
+            "patient_hashed_cf": "HASH123",
+            "processed_data_id": processed_id,
+            "strategy": "img_rx",
+            "defer_explanation": False
+        }
+        # The image executor is created by the first X-ray analysis
+        response = await xai_client.post("/analyse", json=payload)
+        assert response.status_code in (200, 503), f"Analyse response: {response.text}"
+        executor = (await xai_client.get("/metrics")).json()["metrics"]["executors"]["image"]
+        if executor["max_queue"] > 0:
+            pytest.skip("the XAI service must be started with IMAGE_INFERENCE_QUEUE=0")
+
+        responses = await post_concurrently(xai_client, "/analyse", payload, 8)
+        statuses = [r.status_code for r in responses]
+        assert set(statuses) <= {200, 503}, statuses
+        assert 503 in statuses
+        for r in responses:
+            if r.status_code == 503:
+                assert int(r.headers["Retry-After"]) >= 1
+
+
+# Test 8: Deferred explanation: the X-ray report is returned with a pending heatmap,
+# and the long poll answers once the background worker has saved it
+@pytest.mark.anyio
+async def test_deferred_image_explanation():
+    async with AsyncClient(base_url=BASE_DATA_URL) as data_client:
+        response = await data_client.post("/process", json={"strategy": "img_rx", "raw_data": TINY_PNG_B64})
+        assert response.status_code == 200, f"Process response: {response.text}"
+        processed_id = response.json()["processed_data_id"]
+
+    async with AsyncClient(base_url=BASE_XAI_URL, timeout=60) as xai_client:
+        payload = {
+            "doctor_id": 1,
+            "patient_hashed_cf": "HASH123",
+            "processed_data_id": processed_id,
+            "strategy": "img_rx",
+            "defer_explanation": True
+        }
+        # Retry while the image executor is saturated (e.g. by the previous test)
+        for _ in range(10):
+            response = await xai_client.post("/analyse", json=payload)
+            if response.status_code != 503:
+                break
+            await anyio.sleep(int(response.headers["Retry-After"]))
+        assert response.status_code == 200, f"Analyse response: {response.text}"
+        report = response.json()["report"]
+        assert report["diagnosis"] != "N/A"
+        assert report["explanation_status"] == "pending"
+        assert report["explanation_artifact"] is None
+
+        # Long poll until the heatmap is ready
+        for _ in range(5):
+            response = await xai_client.get(f"/reports/1/{report['id']}/explanation?wait=20")
+            assert response.status_code == 200, f"Explanation response: {response.text}"
+            if response.json()["report"]["explanation_status"] != "pending":
+                break
+        ready = response.json()["report"]
+        assert ready["explanation_status"] == "ready"
+        assert ready["explanation_artifact"] is not None
+
+        response = await xai_client.get(f"/reports/1/{report['id']}/artifact")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("image/")